@@ -13,3 +13,11 @@ python manage.py collectstatic --no-input
 
 # Apply any outstanding database migrations
 python manage.py migrate
+
+
+# Create the shared cache table used when REDIS_URL is not set
+python manage.py createcachetable
+
+
+# Parse every template so syntax errors fail the build
+python manage.py warm_templates
@@ -0,0 +1,64 @@
+"""Gunicorn settings, read from the working directory on start.
+
+GUNICORN_WORKER_CLASS picks how requests are served:
+
+  sync     one request at a time per process, 2 * CPUs + 1 processes
+  gthread  GUNICORN_THREADS threads in each of CPUs + 1 processes (default)
+  uvicorn  task_management.asgi in CPUs processes; pair with TASK_ASYNC_VIEWS
+
+WEB_CONCURRENCY and GUNICORN_THREADS override the computed counts. With a
+connection pool (DB_POOL_MAX_SIZE), size the pool to the threads per worker.
+"""
+
+import multiprocessing
+import os
+
+cpus = multiprocessing.cpu_count()
+
+worker_model = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+if worker_model not in ("sync", "gthread", "uvicorn"):
+    raise ValueError(f"Unknown GUNICORN_WORKER_CLASS: {worker_model!r}")
+
+if worker_model == "uvicorn":
+    wsgi_app = "task_management.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+    default_workers = cpus
+else:
+    wsgi_app = "task_management.wsgi:application"
+    worker_class = worker_model
+    default_workers = 2 * cpus + 1 if worker_model == "sync" else cpus + 1
+
+workers = int(os.getenv("WEB_CONCURRENCY", default_workers))
+threads = int(os.getenv("GUNICORN_THREADS", 4 if worker_model == "gthread" else 1))
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = 30
+keepalive = 5
+
+# Import Django, the tasks models and (with TASK_WARM_TEMPLATES_ON_BOOT) the
+# parsed templates once in the master, so forked workers share them.
+preload_app = True
+
+# Recycle workers to cap slow memory growth; the jitter keeps them from all
+# restarting at once.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+# Set GUNICORN_ACCESS_LOG to an empty string to turn the access log off.
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None
+
+
+def post_fork(server, worker):
+    # Connections (or a pool) opened while preloading must not be shared
+    # between processes.
+    from django.db import connections
+
+    connections.close_all()
+
+
+def worker_exit(server, worker):
+    # Write the visits this worker counted before it is recycled.
+    from tasks.visits import visit_counter
+
+    visit_counter.flush()
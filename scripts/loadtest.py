@@ -0,0 +1,166 @@
+"""Compare gunicorn worker models on the task board.
+
+Starts gunicorn with gunicorn.conf.py once per mode, logs in, sends board
+requests from concurrent clients for a fixed time and prints throughput and
+latency per mode:
+
+    python scripts/loadtest.py --username task_admin --password superuser
+
+The uvicorn mode also sets TASK_ASYNC_VIEWS=1, so the board is served by
+its async view. Run it against a seeded database (see the benchmark
+command) for numbers that mean something.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.cookiejar import CookieJar
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+MODES = {
+    "sync": {"GUNICORN_WORKER_CLASS": "sync"},
+    "gthread": {"GUNICORN_WORKER_CLASS": "gthread"},
+    "uvicorn": {"GUNICORN_WORKER_CLASS": "uvicorn", "TASK_ASYNC_VIEWS": "1"},
+}
+
+CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+def start_server(mode, port, workers):
+    env = {
+        **os.environ,
+        **MODES[mode],
+        "GUNICORN_BIND": f"127.0.0.1:{port}",
+        "GUNICORN_MAX_REQUESTS": "0",
+        "GUNICORN_ACCESS_LOG": "",
+    }
+    env.setdefault("DJANGO_SETTINGS_MODULE", "task_management.settings.dev")
+    if workers:
+        env["WEB_CONCURRENCY"] = str(workers)
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--log-level", "warning"],
+        cwd=BASE_DIR,
+        env=env,
+    )
+
+
+def wait_until_up(base_url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"{base_url}/accounts/login/", timeout=1)
+            return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start in {timeout}s.")
+
+
+def login(base_url, username, password):
+    """Return the Cookie header of a logged-in session."""
+    jar = CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+    login_url = f"{base_url}/accounts/login/"
+    page = opener.open(login_url).read().decode()
+    data = urllib.parse.urlencode(
+        {
+            "username": username,
+            "password": password,
+            "csrfmiddlewaretoken": CSRF_INPUT.search(page).group(1),
+        }
+    ).encode()
+    opener.open(urllib.request.Request(login_url, data, {"Referer": login_url}))
+    cookies = {cookie.name: cookie.value for cookie in jar}
+    if "sessionid" not in cookies:
+        raise RuntimeError("Login failed; check --username and --password.")
+    return "; ".join(f"{name}={value}" for name, value in cookies.items())
+
+
+def hammer(url, cookie, stop_at, timings, errors):
+    request = urllib.request.Request(url, headers={"Cookie": cookie})
+    while time.monotonic() < stop_at:
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+        except (urllib.error.URLError, ConnectionError):
+            errors.append(1)
+            continue
+        timings.append((time.perf_counter() - start) * 1000)
+
+
+def run_mode(mode, options):
+    base_url = f"http://127.0.0.1:{options.port}"
+    server = start_server(mode, options.port, options.workers)
+    try:
+        wait_until_up(base_url)
+        cookie = login(base_url, options.username, options.password)
+        url = f"{base_url}{options.path}"
+        timings, errors = [], []
+        stop_at = time.monotonic() + options.duration
+        clients = [
+            threading.Thread(
+                target=hammer, args=(url, cookie, stop_at, timings, errors)
+            )
+            for _ in range(options.concurrency)
+        ]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    if len(timings) < 2:
+        return {"requests": len(timings), "errors": len(errors)}
+    cuts = statistics.quantiles(timings, n=100)
+    return {
+        "requests": len(timings),
+        "errors": len(errors),
+        "rps": round(len(timings) / options.duration, 1),
+        "p50_ms": round(cuts[49], 2),
+        "p95_ms": round(cuts[94], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument(
+        "--modes", nargs="+", choices=MODES, default=list(MODES)
+    )
+    parser.add_argument("--path", default="/tasks/")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument(
+        "--workers", type=int, help="Override the computed worker count."
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    options = parser.parse_args()
+
+    print(
+        f"{'mode':<8} {'requests':>8} {'errors':>6} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8}"
+    )
+    for mode in options.modes:
+        result = run_mode(mode, options)
+        print(
+            f"{mode:<8} {result['requests']:>8} {result['errors']:>6} "
+            f"{result.get('rps', '-'):>8} {result.get('p50_ms', '-'):>8} "
+            f"{result.get('p95_ms', '-'):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+document.addEventListener("DOMContentLoaded", function () {
+  const selectedCountEl = document.getElementById("selected-users");
+
+  document
+    .querySelectorAll("select[data-autocomplete-url]")
+    .forEach(initAutocomplete);
+
+  function initAutocomplete(select) {
+    const url = select.dataset.autocompleteUrl;
+    let debounceTimer = null;
+
+    select.style.display = "none";
+
+    const wrapper = document.createElement("div");
+    wrapper.className = "autocomplete";
+
+    const chips = document.createElement("div");
+    chips.className = "selected-users-list";
+
+    const input = document.createElement("input");
+    input.type = "text";
+    input.className = "input white-background";
+    input.placeholder = "Search workers by username or name...";
+    input.autocomplete = "off";
+
+    const results = document.createElement("div");
+    results.className = "status-dropdown autocomplete-results hide";
+
+    wrapper.append(chips, input, results);
+    select.after(wrapper);
+
+    function selectedOptions() {
+      return Array.from(select.options).filter((option) => option.selected);
+    }
+
+    function renderChips() {
+      chips.replaceChildren();
+      selectedOptions().forEach((option) => {
+        const tag = document.createElement("div");
+        tag.className = "selected-user-tag";
+        tag.textContent = option.textContent;
+
+        const remove = document.createElement("button");
+        remove.type = "button";
+        remove.className = "autocomplete-remove";
+        remove.textContent = "×";
+        remove.title = "Remove";
+        remove.addEventListener("click", function () {
+          option.remove();
+          renderChips();
+        });
+
+        tag.append(remove);
+        chips.append(tag);
+      });
+      if (selectedCountEl) {
+        selectedCountEl.textContent = selectedOptions().length;
+      }
+    }
+
+    function addWorker(worker) {
+      const id = String(worker.id);
+      let option = Array.from(select.options).find((o) => o.value === id);
+      if (!option) {
+        option = new Option(worker.text, id);
+        select.add(option);
+      }
+      option.selected = true;
+      input.value = "";
+      results.classList.add("hide");
+      renderChips();
+    }
+
+    function renderResults(workers) {
+      const selectedIds = new Set(selectedOptions().map((o) => o.value));
+      results.replaceChildren();
+
+      workers
+        .filter((worker) => !selectedIds.has(String(worker.id)))
+        .forEach((worker) => {
+          const card = document.createElement("div");
+          card.className = "user-card";
+
+          const name = document.createElement("div");
+          name.className = "user-name";
+          name.textContent = worker.text;
+
+          const id = document.createElement("div");
+          id.className = "user-id";
+          id.textContent = `ID: ${worker.id}`;
+
+          card.append(name, id);
+          card.addEventListener("click", () => addWorker(worker));
+          results.append(card);
+        });
+
+      results.classList.toggle("hide", !results.children.length);
+    }
+
+    function lookup() {
+      const params = new URLSearchParams({ q: input.value.trim() });
+      fetch(`${url}?${params}`, { credentials: "same-origin" })
+        .then((response) => response.json())
+        .then((data) => renderResults(data.results))
+        .catch(() => results.classList.add("hide"));
+    }
+
+    input.addEventListener("input", function () {
+      clearTimeout(debounceTimer);
+      debounceTimer = setTimeout(lookup, 250);
+    });
+    input.addEventListener("focus", lookup);
+
+    document.addEventListener("click", function (e) {
+      if (!wrapper.contains(e.target)) results.classList.add("hide");
+    });
+
+    renderChips();
+  }
+});
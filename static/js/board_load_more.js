@@ -0,0 +1,25 @@
+document.addEventListener("DOMContentLoaded", function () {
+  const board = document.getElementById("board-view");
+  if (!board) return;
+
+  board.addEventListener("click", function (e) {
+    const button = e.target.closest(".load-more-button");
+    if (!button) return;
+
+    const item = button.closest(".load-more-item");
+    button.disabled = true;
+
+    fetch(button.dataset.url, { credentials: "same-origin" })
+      .then((response) => {
+        if (!response.ok) throw new Error(response.statusText);
+        return response.text();
+      })
+      .then((html) => {
+        item.insertAdjacentHTML("afterend", html);
+        item.remove();
+      })
+      .catch(() => {
+        button.disabled = false;
+      });
+  });
+});
@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_management.settings")
 
 application = get_asgi_application()
+
+if settings.TASK_WARM_TEMPLATES_ON_BOOT:
+    from tasks.warmup import warm_templates
+
+    warm_templates()
@@ -41,6 +41,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "tasks.profiling.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -121,3 +122,137 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "tasks.Worker"
 
 LOGIN_REDIRECT_URL = "/"
+
+# Task board
+# Maximum number of cards rendered per status column on the first board load.
+
+TASK_BOARD_COLUMN_SIZE = 20
+
+# Search
+# Backend used by the task, worker, position and task type search forms.
+
+TASK_SEARCH_BACKEND = "tasks.search.SimpleSearchBackend"
+
+# Dashboard counters
+# Seconds the home page totals stay cached before being recounted. Signals
+# keep them current in between; reconcile_counters repairs any drift.
+
+TASK_COUNTERS_TIMEOUT = 60 * 15
+
+# Visit counting
+# Seconds between flushes of the in-process visit counts to the database.
+
+TASK_VISITS_FLUSH_INTERVAL = 10
+
+# Assignee picker
+# Maximum number of workers returned by one worker lookup request.
+
+TASK_WORKER_LOOKUP_LIMIT = 20
+
+# JSON API
+# Page size of the list endpoints, largest batch a bulk request may carry and
+# rows per INSERT/UPDATE statement when a batch is written.
+
+TASK_API_PAGE_SIZE = 100
+TASK_API_MAX_BATCH = 1000
+TASK_API_BATCH_SIZE = 500
+
+# Exports
+# Rows read per query (and per assignee prefetch) while streaming an export.
+
+TASK_EXPORT_CHUNK_SIZE = 2000
+
+# Imports
+# Rows validated and inserted per transaction by import_tasks, and processes
+# used to hash imported worker passwords (None uses every CPU). The import
+# page hashes in the request at about 0.4s a password, so it refuses worker
+# files setting more than TASK_IMPORT_UPLOAD_MAX_PASSWORDS, keeping well
+# inside the gunicorn timeout.
+
+TASK_IMPORT_CHUNK_SIZE = 1000
+TASK_IMPORT_HASH_WORKERS = None
+TASK_IMPORT_UPLOAD_MAX_PASSWORDS = 25
+
+# Profiling
+# Opt-in per-view query count and timing samples. Each process keeps the last
+# TASK_PROFILING_WINDOW requests per URL name and copies them to the cache
+# every TASK_PROFILING_PUBLISH_INTERVAL seconds for profile_report. Up to
+# TASK_PROFILING_MAX_PROCESSES processes are reported; one that publishes
+# nothing for TASK_PROFILING_SNAPSHOT_TIMEOUT seconds drops out.
+
+TASK_PROFILING_ENABLED = os.getenv("TASK_PROFILING_ENABLED", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+TASK_PROFILING_WINDOW = 500
+TASK_PROFILING_PUBLISH_INTERVAL = 10
+TASK_PROFILING_MAX_PROCESSES = 64
+TASK_PROFILING_SNAPSHOT_TIMEOUT = 600
+
+# Template warm-up
+# Parse every project template when a WSGI/ASGI worker boots, so the first
+# request a worker serves does not pay the parse cost.
+
+TASK_WARM_TEMPLATES_ON_BOOT = False
+
+# Database connections
+# Connections are kept open for DB_CONN_MAX_AGE seconds and health-checked
+# before reuse. On PostgreSQL with psycopg 3, a non-zero DB_POOL_MAX_SIZE
+# switches to a connection pool per worker process instead; size it to the
+# threads per worker, keeping workers * DB_POOL_MAX_SIZE under the server's
+# max_connections.
+
+DB_CONN_MAX_AGE = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "0"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+
+# Async views
+# Serve the home page, task board, status lists, task detail and worker list
+# from tasks.async_views. Turn on when running under an ASGI server; under
+# WSGI every async view is run through the sync bridge instead.
+
+TASK_ASYNC_VIEWS = os.getenv("TASK_ASYNC_VIEWS", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Deadline buckets
+# Open tasks due within this many hours are listed as due soon. Bucket
+# sizes are cached per minute.
+
+TASK_DUE_SOON_HOURS = 24
+
+# Caches
+# "default" holds state every worker process has to see the same way: the
+# dashboard and deadline counters and the profiler snapshots. It is Redis
+# when REDIS_URL is set, and otherwise the database cache table, created by
+# `python manage.py createcachetable`. Only Redis increments atomically;
+# with the database cache run reconcile_counters periodically.
+# Rendered task cards get their own "fragments" cache, so a board page
+# cannot push shared state out of "default". Card keys embed the task
+# version, so each worker process can keep its own copy.
+
+REDIS_URL = os.getenv("REDIS_URL", "")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "tasks_cache",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+    "fragments": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "task-fragments",
+        "TIMEOUT": 60 * 60 * 24,
+        "OPTIONS": {"MAX_ENTRIES": 20000},
+    },
+}
+
+if REDIS_URL:
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
@@ -12,5 +12,9 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
     }
-}
\ No newline at end of file
+}
+
+TASK_SEARCH_BACKEND = "tasks.search.SQLiteSearchBackend"
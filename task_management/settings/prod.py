@@ -19,5 +19,38 @@ DATABASES = {
         'PASSWORD': os.environ.get('POSTGRES_PASSWORD'),
         'HOST': os.environ.get('POSTGRES_HOST'),
         'PORT': int(os.environ['POSTGRES_DB_PORT']),
+        "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
     }
-}
\ No newline at end of file
+}
+
+if DB_POOL_MAX_SIZE:
+    # Django requires persistent connections off when pooling.
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": DB_POOL_MIN_SIZE,
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": DB_POOL_TIMEOUT,
+        },
+    }
+
+TASK_SEARCH_BACKEND = "tasks.search.PostgresSearchBackend"
+
+# Templates
+# Explicit cached loaders: each template is read and parsed once per worker
+# process, and warm_templates fills that cache when the worker boots.
+
+TEMPLATES[0]["APP_DIRS"] = False
+TEMPLATES[0]["OPTIONS"]["debug"] = False
+TEMPLATES[0]["OPTIONS"]["loaders"] = [
+    (
+        "django.template.loaders.cached.Loader",
+        [
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ],
+    ),
+]
+
+TASK_WARM_TEMPLATES_ON_BOOT = True
@@ -1,21 +1,96 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
 from django.contrib.auth.admin import UserAdmin
 
+from tasks import bulk
 from tasks.models import Task, TaskType, Position, Worker
 
 admin.site.register(TaskType)
 admin.site.register(Position)
 
 
+class TaskActionForm(ActionForm):
+    status = forms.ChoiceField(
+        choices=[("", "---")] + Task.Status.choices, required=False
+    )
+    priority = forms.ChoiceField(
+        choices=[("", "---")] + Task.Priority.choices, required=False
+    )
+    assignees = forms.CharField(
+        required=False, help_text="Usernames, separated by commas."
+    )
+
+
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     list_display = ("name",
                     "deadline",
                     "priority",
+                    "status",
                     "is_completed",
                     "task_type")
     search_fields = ("name",)
-    list_filter = ("is_completed", "task_type", "deadline")
+    list_filter = ("status", "is_completed", "task_type", "deadline")
+    action_form = TaskActionForm
+    actions = ("set_status", "set_priority", "reassign")
+
+    def selected_ids(self, queryset):
+        return list(queryset.values_list("pk", flat=True))
+
+    @admin.action(description="Set the status of selected tasks")
+    def set_status(self, request, queryset):
+        status = request.POST.get("status")
+        if status not in Task.Status.values:
+            self.message_user(request, "Choose a status.", messages.ERROR)
+            return
+        count = bulk.set_status(self.selected_ids(queryset), status)
+        self.message_user(request, f"Updated {count} tasks.")
+
+    @admin.action(description="Set the priority of selected tasks")
+    def set_priority(self, request, queryset):
+        priority = request.POST.get("priority")
+        if priority not in Task.Priority.values:
+            self.message_user(request, "Choose a priority.", messages.ERROR)
+            return
+        count = bulk.set_priority(self.selected_ids(queryset), priority)
+        self.message_user(request, f"Updated {count} tasks.")
+
+    @admin.action(description="Reassign selected tasks")
+    def reassign(self, request, queryset):
+        usernames = {
+            name.strip()
+            for name in request.POST.get("assignees", "").split(",")
+            if name.strip()
+        }
+        if not usernames:
+            self.message_user(
+                request, "Enter the usernames to assign.", messages.ERROR
+            )
+            return
+        workers = dict(
+            Worker.objects.filter(username__in=usernames).values_list(
+                "username", "pk"
+            )
+        )
+        unknown = usernames - workers.keys()
+        if unknown:
+            self.message_user(
+                request,
+                f"Unknown usernames: {', '.join(sorted(unknown))}.",
+                messages.ERROR,
+            )
+            return
+        added, removed = bulk.reassign(
+            self.selected_ids(queryset), workers.values()
+        )
+        self.message_user(
+            request, f"Added {added} and removed {removed} assignments."
+        )
+
+    def delete_queryset(self, request, queryset):
+        # Used by the "Delete selected" action once it is confirmed.
+        bulk.delete_tasks(self.selected_ids(queryset))
 
 
 @admin.register(Worker)
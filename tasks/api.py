@@ -0,0 +1,565 @@
+import json
+from functools import partial
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.http import HttpResponse, JsonResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.urls import path, reverse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from tasks import counters
+from tasks.assignments import reconcile
+from tasks.models import ApiToken, Position, Task, TaskType, Worker
+
+
+def is_id(value):
+    """JSON ids are integers; ``true`` and ``false`` are not ids."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class Resource:
+    """Validation, serialization and batched writes for one model.
+
+    Related objects are checked with one ``pk__in`` query per relation
+    and uniqueness with one query per batch, so validating a batch costs a
+    fixed number of queries however many items it holds.
+    """
+
+    model = None
+    fields = ()
+    foreign_keys = {}
+    many_to_many = {}
+    unique_field = None
+    versioned = False
+
+    @property
+    def verbose_name(self):
+        return self.model._meta.verbose_name
+
+    def get_queryset(self):
+        return self.model.objects.all()
+
+    def related_ids(self, objects):
+        """Return ``{field: {pk: [related pk, ...]}}`` for the m2m fields."""
+        pks = [obj.pk for obj in objects]
+        related = {}
+        for name in self.many_to_many:
+            field = self.model._meta.get_field(name)
+            source = f"{field.m2m_field_name()}_id"
+            target = f"{field.m2m_reverse_field_name()}_id"
+            related[name] = {pk: [] for pk in pks}
+            rows = field.remote_field.through.objects.filter(
+                **{f"{source}__in": pks}
+            ).values_list(source, target)
+            for pk, related_pk in rows:
+                related[name][pk].append(related_pk)
+        return related
+
+    def serialize(self, obj, related):
+        data = {"id": obj.pk}
+        for name in self.fields:
+            if name in self.foreign_keys:
+                data[name] = getattr(obj, f"{name}_id")
+            elif name in self.many_to_many:
+                data[name] = related[name].get(obj.pk, [])
+            else:
+                data[name] = getattr(obj, name)
+        return data
+
+    def serialize_many(self, objects):
+        related = self.related_ids(objects)
+        return [self.serialize(obj, related) for obj in objects]
+
+    def prepare(self, instance):
+        """Hook for setting values clients never send, before validation."""
+
+    def known_related_ids(self, items):
+        known = {}
+        for name, related_model in {
+            **self.foreign_keys,
+            **self.many_to_many,
+        }.items():
+            requested = set()
+            for item in items:
+                value = item.get(name)
+                if isinstance(value, list):
+                    requested.update(v for v in value if is_id(v))
+                elif is_id(value):
+                    requested.add(value)
+            known[name] = set(
+                related_model.objects.filter(pk__in=requested)
+                .order_by()
+                .values_list("pk", flat=True)
+            )
+        return known
+
+    def clean_item(self, item, instance, known, creating):
+        errors = {}
+        m2m = {}
+
+        if not isinstance(item, dict):
+            return m2m, {"__all__": ["Expected a JSON object."]}
+
+        for name in set(item) - set(self.fields) - {"id"}:
+            errors[name] = ["Unknown field."]
+
+        for name in self.fields:
+            if name not in item:
+                continue
+            value = item[name]
+            if name in self.foreign_keys:
+                field = self.model._meta.get_field(name)
+                if value is None and field.null:
+                    setattr(instance, field.attname, None)
+                elif not is_id(value) or value not in known[name]:
+                    errors[name] = [f"Invalid pk {value!r}."]
+                else:
+                    setattr(instance, field.attname, value)
+            elif name in self.many_to_many:
+                if not isinstance(value, list):
+                    errors[name] = ["Expected a list of ids."]
+                elif unknown := [
+                    v
+                    for v in value
+                    if not is_id(v) or v not in known[name]
+                ]:
+                    errors[name] = [f"Invalid pk {v!r}." for v in unknown]
+                else:
+                    m2m[name] = sorted(set(value))
+            else:
+                setattr(instance, name, value)
+
+        if creating:
+            for name in self.foreign_keys:
+                field = self.model._meta.get_field(name)
+                if name not in item and not field.null:
+                    errors[name] = ["This field is required."]
+
+        self.prepare(instance)
+        try:
+            instance.full_clean(
+                exclude=[*self.foreign_keys, *self.many_to_many, *errors],
+                validate_unique=False,
+                validate_constraints=False,
+            )
+        except ValidationError as error:
+            for name, messages in error.message_dict.items():
+                errors.setdefault(name, []).extend(messages)
+
+        return m2m, errors
+
+    def check_unique(self, instances, errors):
+        name = self.unique_field
+        if name is None:
+            return
+        seen = {}
+        for index, instance in enumerate(instances):
+            if index in errors:
+                continue
+            value = getattr(instance, name)
+            if value in seen:
+                errors[index] = {name: ["Duplicate value in this batch."]}
+            seen[value] = index
+
+        taken = set(
+            self.model.objects.filter(**{f"{name}__in": seen})
+            .order_by()
+            .exclude(pk__in=[i.pk for i in instances if i and i.pk])
+            .values_list(name, flat=True)
+        )
+        for value in taken:
+            errors[seen[value]] = {
+                name: [
+                    f"{self.verbose_name.capitalize()} with this "
+                    f"{name} already exists."
+                ]
+            }
+
+    def clean(self, items, instances, creating):
+        known = self.known_related_ids(items)
+        m2m_values = []
+        errors = {}
+        for index, (item, instance) in enumerate(zip(items, instances)):
+            if instance is None:
+                m2m_values.append({})
+                errors[index] = {
+                    "id": [f"No {self.verbose_name} with id {item.get('id')!r}."]
+                }
+                continue
+            m2m, item_errors = self.clean_item(item, instance, known, creating)
+            m2m_values.append(m2m)
+            if item_errors:
+                errors[index] = item_errors
+        self.check_unique(instances, errors)
+        return m2m_values, [
+            {"index": index, "errors": item_errors}
+            for index, item_errors in sorted(errors.items())
+        ]
+
+    def save_m2m(self, instances, m2m_values, replace):
+        batch_size = settings.TASK_API_BATCH_SIZE
+        for name in self.many_to_many:
+            field = self.model._meta.get_field(name)
+            changed = {
+                instance.pk: values[name]
+                for instance, values in zip(instances, m2m_values)
+                if name in values
+            }
+            if not changed:
+                continue
+            if replace:
+                reconcile(field, changed, batch_size)
+                continue
+            through = field.remote_field.through
+            source = f"{field.m2m_field_name()}_id"
+            target = f"{field.m2m_reverse_field_name()}_id"
+            through.objects.bulk_create(
+                [
+                    through(**{source: pk, target: related_pk})
+                    for pk, related_pks in changed.items()
+                    for related_pk in related_pks
+                ],
+                batch_size=batch_size,
+            )
+
+    def create(self, items):
+        instances = [self.model() for _ in items]
+        m2m_values, errors = self.clean(items, instances, creating=True)
+        if errors:
+            return [], errors
+
+        with transaction.atomic():
+            self.model.objects.bulk_create(
+                instances, batch_size=settings.TASK_API_BATCH_SIZE
+            )
+            self.save_m2m(instances, m2m_values, replace=False)
+            transaction.on_commit(
+                partial(counters.adjust, self.model, len(instances))
+            )
+        return instances, []
+
+    def update(self, items):
+        """Write each item's fields, and only those, to its row.
+
+        The rows are locked while the batch is validated and written, and
+        versions are bumped in the database, so a concurrent edit is
+        neither overwritten with stale values nor loses its version bump.
+        """
+        ids = [item.get("id") if isinstance(item, dict) else None for item in items]
+        with transaction.atomic():
+            existing = (
+                self.get_queryset()
+                .select_for_update()
+                .in_bulk([pk for pk in ids if is_id(pk)])
+            )
+            instances = [existing.get(pk) for pk in ids]
+            m2m_values, errors = self.clean(items, instances, creating=False)
+            if errors:
+                return [], errors
+
+            # Items naming the same fields are written together.
+            batches = {}
+            for item, instance in zip(items, instances):
+                fields = tuple(
+                    sorted(
+                        name
+                        for name in item
+                        if name in self.fields and name not in self.many_to_many
+                    )
+                )
+                if fields:
+                    batches.setdefault(fields, []).append(instance)
+            for fields, batch in batches.items():
+                fields = list(fields)
+                if self.versioned:
+                    for instance in batch:
+                        instance.version = F("version") + 1
+                    fields.append("version")
+                self.model.objects.bulk_update(
+                    batch, fields, batch_size=settings.TASK_API_BATCH_SIZE
+                )
+            if self.versioned and batches:
+                versions = dict(
+                    self.model.objects.filter(pk__in=list(existing))
+                    .order_by()
+                    .values_list("pk", "version")
+                )
+                for instance in instances:
+                    instance.version = versions[instance.pk]
+            self.save_m2m(instances, m2m_values, replace=True)
+        return instances, []
+
+    def delete(self, ids):
+        found = set(
+            self.model.objects.filter(pk__in=ids).values_list("pk", flat=True)
+        )
+        errors = [
+            {
+                "index": index,
+                "errors": {"id": [f"No {self.verbose_name} with id {pk!r}."]},
+            }
+            for index, pk in enumerate(ids)
+            if pk not in found
+        ]
+        if errors:
+            return 0, errors
+
+        with transaction.atomic():
+            self.model.objects.filter(pk__in=ids).delete()
+        return len(found), []
+
+
+class TaskResource(Resource):
+    model = Task
+    fields = (
+        "name",
+        "description",
+        "deadline",
+        "is_completed",
+        "priority",
+        "status",
+        "task_type",
+        "assignees",
+    )
+    foreign_keys = {"task_type": TaskType}
+    many_to_many = {"assignees": Worker}
+    unique_field = "name"
+    versioned = True
+
+
+class WorkerResource(Resource):
+    model = Worker
+    fields = ("username", "first_name", "last_name", "email", "position")
+    foreign_keys = {"position": Position}
+    unique_field = "username"
+
+    def prepare(self, instance):
+        if not instance.password:
+            instance.set_unusable_password()
+
+
+class PositionResource(Resource):
+    model = Position
+    fields = ("position",)
+    unique_field = "position"
+
+
+class TaskTypeResource(Resource):
+    model = TaskType
+    fields = ("name",)
+    # Bulk updates skip TaskType.save(), which re-keys the cached task
+    # cards showing the name.
+    versioned = True
+
+
+def json_error(message, status=400):
+    return JsonResponse({"detail": message}, status=status)
+
+
+CONFLICT_MESSAGE = "The batch conflicts with data saved meanwhile; nothing was written."
+
+
+class CsrfCheck(CsrfViewMiddleware):
+    def _reject(self, request, reason):
+        # Return the reason instead of Django's HTML 403 page.
+        return reason
+
+
+def csrf_failure(request):
+    """Return why ``request`` fails the CSRF check, or None if it passes."""
+    check = CsrfCheck(lambda request: None)
+    check.process_request(request)
+    return check.process_view(request, None, (), {})
+
+
+def token_key(request):
+    scheme, _, key = request.headers.get("Authorization", "").partition(" ")
+    return key.strip() if scheme.lower() == "token" else None
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class ApiView(View):
+    """Base for the API views.
+
+    Clients send ``Authorization: Token <key>`` (see ``create_api_token``)
+    and need no CSRF token. Requests authenticated by the session, as from
+    the site's own pages, are CSRF-checked as usual. Every failure is
+    answered with JSON.
+    """
+
+    resource_class = None
+    url_prefix = None
+
+    def dispatch(self, request, *args, **kwargs):
+        key = token_key(request)
+        if key is not None:
+            worker = ApiToken.authenticate(key)
+            if worker is None:
+                return json_error("Invalid token.", status=401)
+            request.user = worker
+        elif not request.user.is_authenticated:
+            return json_error("Authentication required.", status=401)
+        elif reason := csrf_failure(request):
+            return json_error(f"CSRF check failed: {reason}", status=403)
+        self.resource = self.resource_class()
+        return super().dispatch(request, *args, **kwargs)
+
+    def parse_body(self):
+        try:
+            return json.loads(self.request.body)
+        except ValueError:
+            return None
+
+    def parse_items(self):
+        """Return the list of items in the body, or an error response."""
+        items = self.parse_body()
+        if not isinstance(items, list):
+            return None, json_error("Expected a JSON list.")
+        if len(items) > settings.TASK_API_MAX_BATCH:
+            return None, json_error(
+                f"Batches are limited to {settings.TASK_API_MAX_BATCH} items."
+            )
+        return items, None
+
+    def write(self, method, items, status, many=True):
+        """Run a batch write and render its results or per-item errors.
+
+        With ``many=False`` the single item is rendered unwrapped.
+        """
+        try:
+            instances, errors = method(items)
+        except IntegrityError:
+            return json_error(CONFLICT_MESSAGE, status=409)
+        if errors:
+            if not many:
+                return JsonResponse({"errors": errors[0]["errors"]}, status=400)
+            return JsonResponse({"errors": errors}, status=400)
+        results = self.resource.serialize_many(instances)
+        if not many:
+            return JsonResponse(results[0], status=status)
+        return JsonResponse({"results": results}, status=status)
+
+
+class ResourceListView(ApiView):
+    def get(self, request, *args, **kwargs):
+        try:
+            after = int(request.GET.get("after", 0))
+            limit = int(request.GET.get("limit", settings.TASK_API_PAGE_SIZE))
+        except ValueError:
+            return json_error("after and limit must be integers.")
+        limit = max(1, min(limit, settings.TASK_API_PAGE_SIZE))
+
+        objects = list(
+            self.resource.get_queryset().filter(pk__gt=after).order_by("pk")[
+                :limit
+            ]
+        )
+        next_url = None
+        if objects and len(objects) == limit:
+            next_url = (
+                reverse(f"tasks:api-{self.url_prefix}-list")
+                + f"?after={objects[-1].pk}&limit={limit}"
+            )
+        return JsonResponse(
+            {"results": self.resource.serialize_many(objects), "next": next_url}
+        )
+
+    def post(self, request, *args, **kwargs):
+        item = self.parse_body()
+        if not isinstance(item, dict):
+            return json_error("Expected a JSON object.")
+        return self.write(self.resource.create, [item], status=201, many=False)
+
+
+class ResourceDetailView(ApiView):
+    def get(self, request, pk, *args, **kwargs):
+        obj = self.resource.get_queryset().filter(pk=pk).first()
+        if obj is None:
+            return json_error("Not found.", status=404)
+        return JsonResponse(self.resource.serialize_many([obj])[0])
+
+    def patch(self, request, pk, *args, **kwargs):
+        item = self.parse_body()
+        if not isinstance(item, dict):
+            return json_error("Expected a JSON object.")
+        if not self.resource.get_queryset().filter(pk=pk).exists():
+            return json_error("Not found.", status=404)
+        return self.write(
+            self.resource.update, [{**item, "id": pk}], status=200, many=False
+        )
+
+    def delete(self, request, pk, *args, **kwargs):
+        deleted, errors = self.resource.delete([pk])
+        if errors:
+            return json_error("Not found.", status=404)
+        return HttpResponse(status=204)
+
+
+class ResourceBulkView(ApiView):
+    """Create, update or delete a batch of objects in one transaction.
+
+    A batch is all-or-nothing: if any item is invalid, nothing is written
+    and the response lists the errors by item index.
+    """
+
+    def post(self, request, *args, **kwargs):
+        items, error = self.parse_items()
+        if error:
+            return error
+        return self.write(self.resource.create, items, status=201)
+
+    def patch(self, request, *args, **kwargs):
+        items, error = self.parse_items()
+        if error:
+            return error
+        return self.write(self.resource.update, items, status=200)
+
+    def delete(self, request, *args, **kwargs):
+        body = self.parse_body()
+        ids = body.get("ids") if isinstance(body, dict) else None
+        if not isinstance(ids, list) or not all(
+            is_id(pk) for pk in ids
+        ):
+            return json_error('Expected {"ids": [...]} with integer ids.')
+        if len(ids) > settings.TASK_API_MAX_BATCH:
+            return json_error(
+                f"Batches are limited to {settings.TASK_API_MAX_BATCH} items."
+            )
+        deleted, errors = self.resource.delete(ids)
+        if errors:
+            return JsonResponse({"errors": errors}, status=400)
+        return JsonResponse({"deleted": deleted})
+
+
+def resource_urls(url_prefix, resource_class):
+    options = {"resource_class": resource_class, "url_prefix": url_prefix}
+    return [
+        path(
+            f"api/{url_prefix}/",
+            ResourceListView.as_view(**options),
+            name=f"api-{url_prefix}-list",
+        ),
+        path(
+            f"api/{url_prefix}/bulk/",
+            ResourceBulkView.as_view(**options),
+            name=f"api-{url_prefix}-bulk",
+        ),
+        path(
+            f"api/{url_prefix}/<int:pk>/",
+            ResourceDetailView.as_view(**options),
+            name=f"api-{url_prefix}-detail",
+        ),
+    ]
+
+
+api_urlpatterns = [
+    *resource_urls("tasks", TaskResource),
+    *resource_urls("workers", WorkerResource),
+    *resource_urls("positions", PositionResource),
+    *resource_urls("task-types", TaskTypeResource),
+]
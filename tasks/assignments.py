@@ -0,0 +1,91 @@
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from tasks.models import Task
+
+# One row per (task, worker) pair, backed by a unique index on both columns.
+Assignment = Task.assignees.through
+
+
+def is_assigned(task_id, worker_id):
+    return Assignment.objects.filter(task_id=task_id, worker_id=worker_id).exists()
+
+
+def assigned_to(worker_id):
+    """Return an ``EXISTS`` expression telling whether the worker is
+    assigned to the task of the outer query, for use in ``annotate()``."""
+    return Exists(
+        Assignment.objects.filter(task_id=OuterRef("pk"), worker_id=worker_id)
+    )
+
+
+def reconcile(field, related_ids, batch_size=None):
+    """Make the rows of the many-to-many ``field`` match ``related_ids``.
+
+    ``related_ids`` maps object ids to the ids they should be related to.
+    The current rows are read in one query and only the difference is
+    written: one ``DELETE ... IN`` and one bulk INSERT, however many ids
+    there are. Returns the numbers of rows added and removed.
+
+    A pair added concurrently, e.g. by ``toggle_assignee``, between the
+    read and the INSERT is skipped rather than failing the unique index.
+    """
+    through = field.remote_field.through
+    source = f"{field.m2m_field_name()}_id"
+    target = f"{field.m2m_reverse_field_name()}_id"
+
+    wanted = {
+        (pk, related_pk)
+        for pk, related_pks in related_ids.items()
+        for related_pk in related_pks
+    }
+    with transaction.atomic():
+        current = {
+            (pk, related_pk): row_id
+            for row_id, pk, related_pk in through.objects.filter(
+                **{f"{source}__in": related_ids}
+            ).values_list("pk", source, target)
+        }
+        removed = [
+            row_id for pair, row_id in current.items() if pair not in wanted
+        ]
+        added = [
+            through(**{source: pk, target: related_pk})
+            for pk, related_pk in wanted - current.keys()
+        ]
+        if removed:
+            through.objects.filter(pk__in=removed).delete()
+        if added:
+            through.objects.bulk_create(
+                added, batch_size=batch_size, ignore_conflicts=True
+            )
+    return len(added), len(removed)
+
+
+def reconcile_assignees(assignees, batch_size=None):
+    """``reconcile`` the assignees of tasks from ``{task_id: worker_ids}``."""
+    return reconcile(Task._meta.get_field("assignees"), assignees, batch_size)
+
+
+def toggle_assignee(task_id, worker_id):
+    """Unassign the worker if they are assigned, otherwise assign them.
+
+    Unassigning is a single DELETE. Assigning checks that the task exists
+    and inserts one row, ignoring the conflict if a concurrent request got
+    there first. Returns whether the worker is now assigned.
+
+    Raises ``Task.DoesNotExist`` if there is no such task.
+    """
+    with transaction.atomic():
+        deleted, _ = Assignment.objects.filter(
+            task_id=task_id, worker_id=worker_id
+        ).delete()
+        if deleted:
+            return False
+        if not Task.objects.filter(pk=task_id).exists():
+            raise Task.DoesNotExist(f"No task with id {task_id}.")
+        Assignment.objects.bulk_create(
+            [Assignment(task_id=task_id, worker_id=worker_id)],
+            ignore_conflicts=True,
+        )
+    return True
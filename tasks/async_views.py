@@ -0,0 +1,153 @@
+"""Async versions of the read-heavy views, served when ``TASK_ASYNC_VIEWS``
+is on.
+
+They render the same templates with the same context as their sync
+counterparts in ``tasks.views``. Queries that do not depend on each other
+are awaited together; Django still runs each async ORM call on the
+request's sync thread, so this saves thread hand-offs today and lets the
+queries overlap once the database backend is async.
+"""
+
+import asyncio
+from functools import wraps
+
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.http import Http404
+from django.shortcuts import aget_object_or_404, render
+from django.utils.timezone import now
+
+from tasks import counters, deadlines
+from tasks.assignments import assigned_to
+from tasks.board import abuild_board, alist
+from tasks.forms import TaskBulkActionForm, TaskSearchForm, WorkerSearchForm
+from tasks.models import Task, Worker
+from tasks.search import search
+from tasks.views import TaskStatusListView, WorkerListView
+from tasks.visits import visit_counter
+
+
+def async_login_required(view):
+    @login_required
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        # Templates read request.user, which would otherwise load the user
+        # synchronously while rendering.
+        request.user = await request.auser()
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+async def apaginate(request, queryset, per_page):
+    """Return the ``(paginator, page)`` pair ``ListView`` would build.
+
+    The total and the rows of the requested page are fetched together.
+    Raises ``Http404`` for a page number out of range, like ``ListView``.
+    """
+    paginator = Paginator(queryset, per_page)
+    page_number = request.GET.get("page") or 1
+    if page_number == "last":
+        paginator.count = await queryset.acount()
+        page_number = paginator.num_pages
+    try:
+        number = int(page_number)
+        if number < 1:
+            raise InvalidPage
+        bottom = (number - 1) * per_page
+        top = bottom + per_page
+        paginator.count, objects = await asyncio.gather(
+            queryset.acount(), alist(queryset[bottom:top])
+        )
+        number = paginator.validate_number(number)
+    except (ValueError, InvalidPage) as error:
+        raise Http404(f"Invalid page ({page_number}): {error}")
+    return paginator, Page(objects, number, paginator)
+
+
+def list_context(name, paginator, page):
+    return {
+        "paginator": paginator,
+        "page_obj": page,
+        "is_paginated": page.has_other_pages(),
+        "object_list": page.object_list,
+        name: page.object_list,
+    }
+
+
+@async_login_required
+async def index(request):
+    await visit_counter.arecord(request.user.pk)
+    counts, deadline_counts, num_visits = await asyncio.gather(
+        counters.aget_counts(),
+        deadlines.aget_counts(),
+        visit_counter.aget(request.user.pk),
+    )
+    context = {**counts, "deadlines": deadline_counts, "num_visits": num_visits}
+    return render(request, "tasks/index.html", context=context)
+
+
+@async_login_required
+async def task_list(request, task_type_id=None):
+    name = request.GET.get("name", "")
+    queryset = Task.objects.all()
+    if task_type_id:
+        queryset = queryset.filter(task_type_id=task_type_id)
+    if name:
+        queryset = search(queryset, name, rank=False)
+
+    board = await abuild_board(queryset)
+    context = {f"{status}_tasks": column.tasks for status, column in board.items()}
+    context.update(
+        board=board,
+        board_total=sum(column.total for column in board.values()),
+        task_type_id=task_type_id,
+        search_form=TaskSearchForm(initial={"name": name}),
+        bulk_form=TaskBulkActionForm(),
+    )
+    return render(request, "tasks/task_list.html", context)
+
+
+@async_login_required
+async def task_detail(request, pk):
+    task = await aget_object_or_404(
+        Task.objects.select_related("task_type").annotate(
+            is_assigned=assigned_to(request.user.pk)
+        ),
+        pk=pk,
+    )
+    return render(
+        request, "tasks/task_detail.html", {"task": task, "object": task}
+    )
+
+
+@async_login_required
+async def task_status_list(request, status):
+    queryset = Task.objects.filter(status=status).select_related("task_type")
+    paginator, page = await apaginate(
+        request, queryset, TaskStatusListView.paginate_by
+    )
+    context = list_context("task_list", paginator, page)
+    context.update(
+        now=now(),
+        task_status=TaskStatusListView.STATUS_TITLES.get(status, "Tasks"),
+        bulk_form=TaskBulkActionForm(),
+    )
+    return render(request, "tasks/task_status_list.html", context)
+
+
+@async_login_required
+async def worker_list(request, position_id=None):
+    username = request.GET.get("username", "")
+    queryset = Worker.objects.select_related("position")
+    if username:
+        queryset = search(queryset, username)
+    elif position_id:
+        queryset = queryset.filter(position__id=position_id)
+
+    paginator, page = await apaginate(
+        request, queryset, WorkerListView.paginate_by
+    )
+    context = list_context("worker_list", paginator, page)
+    context["search_form"] = WorkerSearchForm(initial={"username": username})
+    return render(request, "tasks/worker_list.html", context)
@@ -0,0 +1,378 @@
+import json
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.signals import request_finished, request_started
+from django.db import connection, transaction
+from django.db.backends.signals import connection_created
+from django.db.models import Count
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+
+from tasks.imports import insert
+from tasks.models import Position, Task, TaskType, Worker
+from tasks.profiling import percentile
+from tasks.urls import urlpatterns
+from tasks.views import TaskDetailView
+
+STATUS_WEIGHTS = {
+    Task.Status.TODO: 35,
+    Task.Status.IN_PROGRESS: 25,
+    Task.Status.NEEDS_REVIEW: 10,
+    Task.Status.DONE: 30,
+}
+PRIORITY_WEIGHTS = {
+    Task.Priority.LOW: 30,
+    Task.Priority.MEDIUM: 50,
+    Task.Priority.HIGH: 20,
+}
+
+
+@dataclass
+class Volumes:
+    positions: int = 20
+    workers: int = 500
+    task_types: int = 15
+    tasks: int = 10_000
+    max_assignees: int = 5
+
+
+def zipf_weights(count):
+    """Cumulative weights favouring the first items, like real workloads."""
+    return list(accumulate(1 / rank for rank in range(1, count + 1)))
+
+
+def seed(volumes, rng=None, chunk_size=5000, offset=0):
+    """Fill the database with synthetic data using bulk inserts.
+
+    A few workers and task types take most of the tasks, and assignee
+    counts fall off from one or two per task to ``max_assignees``. Names
+    are numbered from ``offset``, so seeding again with a new offset adds
+    to existing data.
+    """
+    rng = rng or random.Random(0)
+    now = timezone.now()
+    password = make_password("benchmark")
+
+    positions = insert(
+        Position,
+        [
+            Position(position=f"Position {i}")
+            for i in range(offset, offset + volumes.positions)
+        ],
+    )
+    workers = insert(
+        Worker,
+        [
+            Worker(
+                username=f"worker{i:06d}",
+                first_name=f"First{i}",
+                last_name=f"Last{i}",
+                email=f"worker{i}@example.com",
+                position=rng.choice(positions) if positions else None,
+                password=password,
+            )
+            for i in range(offset, offset + volumes.workers)
+        ],
+    )
+    task_types = insert(
+        TaskType,
+        [
+            TaskType(name=f"Type {i}")
+            for i in range(offset, offset + volumes.task_types)
+        ],
+    )
+
+    worker_weights = zipf_weights(len(workers))
+    type_weights = zipf_weights(len(task_types))
+    fanout = range(volumes.max_assignees + 1)
+    fanout_weights = list(accumulate([0.5] + [1 / n for n in fanout[1:]]))
+    through = Task.assignees.through
+
+    end = offset + volumes.tasks
+    for start in range(offset, end, chunk_size):
+        tasks = []
+        for i in range(start, min(start + chunk_size, end)):
+            status = rng.choices(
+                list(STATUS_WEIGHTS), weights=STATUS_WEIGHTS.values()
+            )[0]
+            priority = rng.choices(
+                list(PRIORITY_WEIGHTS), weights=PRIORITY_WEIGHTS.values()
+            )[0]
+            task_type = rng.choices(task_types, cum_weights=type_weights)[0]
+            tasks.append(
+                Task(
+                    name=f"Task {i:07d}",
+                    description=f"Synthetic task number {i}.",
+                    deadline=now + timedelta(days=rng.uniform(-60, 90)),
+                    is_completed=status == Task.Status.DONE,
+                    priority=priority,
+                    status=status,
+                    task_type=task_type,
+                )
+            )
+        insert(Task, tasks)
+        rows = []
+        for task in tasks:
+            count = rng.choices(fanout, cum_weights=fanout_weights)[0]
+            assignees = {
+                worker.pk
+                for worker in rng.choices(
+                    workers, cum_weights=worker_weights, k=count
+                )
+            }
+            rows.extend(
+                through(task_id=task.pk, worker_id=worker_id)
+                for worker_id in assignees
+            )
+        through.objects.bulk_create(rows, batch_size=chunk_size)
+
+
+@dataclass
+class BenchmarkCase:
+    url_name: str
+    args: tuple = ()
+    method: str = "get"
+    query: dict = field(default_factory=dict)
+    data: object = None
+    # Tells apart cases of one URL name that take different arguments.
+    variant: str = ""
+
+    @property
+    def url(self):
+        return reverse(f"tasks:{self.url_name}", args=self.args)
+
+
+def build_cases():
+    """Return one request per URL in ``tasks.urls``.
+
+    Detail pages use the busiest worker and the first task of the board,
+    which are the worst cases for views that list related objects.
+    """
+    task = Task.objects.first()
+    worker = (
+        Worker.objects.annotate(task_count=Count("tasks"))
+        .order_by("-task_count")
+        .first()
+    )
+    position = Position.objects.first()
+    task_type = TaskType.objects.first()
+
+    cases = [
+        BenchmarkCase("index"),
+        BenchmarkCase("task-list"),
+        BenchmarkCase("task-list", query={"name": "task"}),
+        BenchmarkCase("task-board-column", args=(Task.Status.TODO,)),
+        BenchmarkCase("task-detail", args=(task.pk,)),
+        BenchmarkCase("task-create"),
+        BenchmarkCase(
+            "task-bulk",
+            method="post",
+            data={
+                "tasks": [task.pk],
+                "operation": "status",
+                "status": Task.Status.DONE,
+            },
+        ),
+        BenchmarkCase("task-update", args=(task.pk,)),
+        BenchmarkCase("task-delete", args=(task.pk,)),
+        BenchmarkCase("worker-list"),
+        BenchmarkCase("worker-lookup", query={"q": "worker"}),
+        BenchmarkCase("worker-create"),
+        BenchmarkCase("worker-update", args=(worker.pk,)),
+        BenchmarkCase("worker-delete", args=(worker.pk,)),
+        BenchmarkCase("worker-detail", args=(worker.pk,)),
+        BenchmarkCase("toggle-task-assign", args=(task.pk,), method="post"),
+        BenchmarkCase("position-list"),
+        BenchmarkCase("position-create"),
+        BenchmarkCase("position-update", args=(position.pk,)),
+        BenchmarkCase("position-delete", args=(position.pk,)),
+        BenchmarkCase("task_types_list"),
+        BenchmarkCase("task_type_create"),
+        BenchmarkCase("task_type_update", args=(task_type.pk,)),
+        BenchmarkCase("task_type_delete", args=(task_type.pk,)),
+        BenchmarkCase("login"),
+        BenchmarkCase(
+            "set-status",
+            args=(task.pk,),
+            method="post",
+            data={"status": Task.Status.DONE},
+        ),
+        BenchmarkCase("manage-task-users", args=(task.pk,)),
+        BenchmarkCase("task-status-list", args=(Task.Status.TODO,)),
+        BenchmarkCase("task-overdue"),
+        BenchmarkCase("task-due-soon"),
+        BenchmarkCase("task-type-tasks", args=(task_type.pk,)),
+        BenchmarkCase("position-workers", args=(position.pk,)),
+        BenchmarkCase("export", args=("tasks",), variant="tasks"),
+        BenchmarkCase("export", args=("workers",), variant="workers"),
+        BenchmarkCase("import"),
+        BenchmarkCase("profiling-report"),
+    ]
+    for prefix, obj in (
+        ("tasks", task),
+        ("workers", worker),
+        ("positions", position),
+        ("task-types", task_type),
+    ):
+        cases += [
+            BenchmarkCase(f"api-{prefix}-list"),
+            BenchmarkCase(f"api-{prefix}-detail", args=(obj.pk,)),
+            BenchmarkCase(
+                f"api-{prefix}-bulk", method="patch", data=[{"id": obj.pk}]
+            ),
+        ]
+    return cases
+
+
+def uncovered_url_names(cases):
+    """Return the names in ``tasks.urls`` that no case requests."""
+    covered = {case.url_name for case in cases}
+    return sorted(
+        pattern.name
+        for pattern in urlpatterns
+        if isinstance(pattern, URLPattern) and pattern.name not in covered
+    )
+
+
+def case_label(case):
+    label = f"tasks:{case.url_name}"
+    if case.variant:
+        label += f"({case.variant})"
+    if case.query:
+        label += "?" + "&".join(f"{k}={v}" for k, v in case.query.items())
+    return label
+
+
+def send(client, case):
+    if case.method == "get":
+        return client.get(case.url, case.query)
+    # Writes are rolled back so every iteration sees the same data.
+    with transaction.atomic():
+        if isinstance(case.data, list):
+            response = getattr(client, case.method)(
+                case.url, json.dumps(case.data), content_type="application/json"
+            )
+        else:
+            response = getattr(client, case.method)(case.url, case.data)
+        transaction.set_rollback(True)
+    return response
+
+
+def run_case(client, case, iterations):
+    """Time ``iterations`` requests after one warm-up request."""
+    timings = []
+    queries = []
+    for iteration in range(iterations + 1):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = send(client, case)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            elapsed = time.perf_counter() - start
+        if iteration:
+            timings.append(elapsed * 1000)
+            queries.append(len(captured))
+    return {
+        "status": response.status_code,
+        "p50_ms": round(percentile(timings, 0.5), 2),
+        "p95_ms": round(percentile(timings, 0.95), 2),
+        "queries": max(queries),
+    }
+
+
+def run_benchmarks(user, volumes, iterations=20, cases=None):
+    client = Client()
+    client.force_login(user)
+    results = {
+        case_label(case): run_case(client, case, iterations)
+        for case in cases or build_cases()
+    }
+    return {
+        "meta": {
+            "volumes": asdict(volumes),
+            "iterations": iterations,
+            "database": connection.vendor,
+            "created": timezone.now().isoformat(),
+        },
+        "views": results,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return a message per view that got slower or runs more queries.
+
+    A view regresses when it runs more queries than the baseline or its
+    p95 exceeds the baseline p95 by more than ``tolerance`` (a ratio).
+    """
+    regressions = []
+    for label, current in results["views"].items():
+        before = baseline["views"].get(label)
+        if before is None:
+            continue
+        if current["queries"] > before["queries"]:
+            regressions.append(
+                f"{label}: {before['queries']} -> {current['queries']} queries"
+            )
+        if current["p95_ms"] > before["p95_ms"] * tolerance:
+            regressions.append(
+                f"{label}: p95 {before['p95_ms']}ms -> {current['p95_ms']}ms"
+            )
+    return regressions
+
+
+def close_connection():
+    connection.close()
+    if getattr(connection, "pool", None) is not None:
+        connection.close_pool()
+
+
+def time_round_trips(user, task, requests, fresh):
+    """Time ``requests`` calls of ``TaskDetailView`` on one task.
+
+    Requests are wrapped in ``request_started`` and ``request_finished``,
+    like the WSGI handler does, so the configured ``CONN_MAX_AGE``, health
+    checks and pool decide whether a connection is reused. With ``fresh``
+    the connection (and pool) is closed after every request instead, which
+    is what serving without persistent connections costs.
+    """
+    view = TaskDetailView.as_view()
+    request = RequestFactory().get(reverse("tasks:task-detail", args=[task.pk]))
+    request.user = user
+    opened = []
+
+    def count(sender, connection, **kwargs):
+        opened.append(connection.alias)
+
+    connection_created.connect(count)
+    try:
+        timings = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            request_started.send(sender=__name__)
+            view(request, pk=task.pk).render()
+            request_finished.send(sender=__name__)
+            if fresh:
+                close_connection()
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        connection_created.disconnect(count)
+    return {
+        "connections": len(opened),
+        "p50_ms": round(percentile(timings, 0.5), 2),
+        "p95_ms": round(percentile(timings, 0.95), 2),
+    }
+
+
+def run_connection_benchmark(user, task, requests=200):
+    close_connection()
+    return {
+        "fresh": time_round_trips(user, task, requests, fresh=True),
+        "configured": time_round_trips(user, task, requests, fresh=False),
+    }
@@ -0,0 +1,152 @@
+import asyncio
+import base64
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Count, Q
+
+from tasks.models import Task
+
+
+@dataclass
+class BoardColumn:
+    status: str
+    label: str
+    total: int = 0
+    tasks: list = field(default_factory=list)
+    next_cursor: str = None
+
+    @property
+    def has_more(self):
+        return self.next_cursor is not None
+
+
+async def alist(queryset):
+    return [obj async for obj in queryset]
+
+
+def encode_cursor(task):
+    """Return an opaque cursor pointing just after ``task``."""
+    value = f"{task.deadline.isoformat()}|{task.pk}"
+    return base64.urlsafe_b64encode(value.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return the ``(deadline, id)`` pair stored in a cursor.
+
+    Raises ``ValueError`` if the cursor is malformed.
+    """
+    try:
+        value = base64.urlsafe_b64decode(cursor.encode()).decode()
+        deadline, pk = value.split("|")
+        return datetime.fromisoformat(deadline), int(pk)
+    except (TypeError, UnicodeError, ValueError) as error:
+        raise ValueError(f"Invalid board cursor: {cursor!r}") from error
+
+
+def column_queryset(queryset, status, cursor=None):
+    """Return the tasks of one status column that follow ``cursor``."""
+    queryset = (
+        queryset.filter(status=status)
+        .select_related("task_type")
+        .order_by("deadline", "id")
+    )
+    if cursor:
+        deadline, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(deadline__gt=deadline) | Q(deadline=deadline, id__gt=pk)
+        )
+    return queryset
+
+
+def column_querysets(queryset, column_size):
+    """Return the first ``column_size`` tasks of every status column.
+
+    Each column is its own ``LIMIT``ed query, a range scan of
+    ``task_status_deadline_idx`` that stops after ``column_size`` rows
+    however long the column is.
+    """
+    return {
+        status: column_queryset(queryset, status)[:column_size]
+        for status in Task.Status.values
+    }
+
+
+def empty_columns():
+    return {
+        status: BoardColumn(status=status, label=label)
+        for status, label in Task.Status.choices
+    }
+
+
+def column_totals(columns):
+    return {
+        status: Count("pk", filter=Q(status=status)) for status in columns
+    }
+
+
+def fill_columns(columns, column_tasks, totals):
+    for status, tasks in column_tasks.items():
+        columns[status].tasks = list(tasks)
+
+    for status, total in totals.items():
+        column = columns[status]
+        column.total = total
+        # The totals come from another query, so tasks may have been added
+        # or moved in between; only offer more cards when some were shown.
+        if column.tasks and total > len(column.tasks):
+            column.next_cursor = encode_cursor(column.tasks[-1])
+    return columns
+
+
+def build_board(queryset, column_size=None):
+    """Group the queryset into one capped column per task status.
+
+    Runs one query per status, each reading at most ``column_size`` rows,
+    and one aggregate for the column totals, however many tasks there are.
+    The totals still count every matching task; that aggregate is the only
+    part of the board whose cost grows with the table.
+    """
+    if column_size is None:
+        column_size = settings.TASK_BOARD_COLUMN_SIZE
+
+    columns = empty_columns()
+    column_tasks = column_querysets(queryset, column_size)
+    totals = queryset.order_by().aggregate(**column_totals(columns))
+    return fill_columns(columns, column_tasks, totals)
+
+
+async def abuild_board(queryset, column_size=None):
+    """Async ``build_board``, running its queries together."""
+    if column_size is None:
+        column_size = settings.TASK_BOARD_COLUMN_SIZE
+
+    columns = empty_columns()
+    column_tasks = column_querysets(queryset, column_size)
+    totals, *tasks = await asyncio.gather(
+        queryset.order_by().aaggregate(**column_totals(columns)),
+        *(alist(tasks) for tasks in column_tasks.values()),
+    )
+    return fill_columns(columns, dict(zip(column_tasks, tasks)), totals)
+
+
+def build_column(queryset, status, cursor=None, column_size=None):
+    """Return the page of a single status column following ``cursor``.
+
+    Pages are keyed on ``(deadline, id)``, the model ordering, so each page
+    is an index range scan however deep into the column it is.
+    """
+    if column_size is None:
+        column_size = settings.TASK_BOARD_COLUMN_SIZE
+
+    queryset = column_queryset(queryset, status, cursor)
+    tasks = list(queryset[: column_size + 1])
+    column = BoardColumn(
+        status=status,
+        label=Task.Status(status).label,
+        tasks=tasks[:column_size],
+    )
+    if len(tasks) > column_size:
+        column.next_cursor = encode_cursor(column.tasks[-1])
+    return column
@@ -0,0 +1,83 @@
+"""Change or delete many tasks with a constant number of queries.
+
+Every function takes the ids of the tasks to change and returns how many
+were affected. Updates bump ``Task.version`` in the same statement, which
+re-keys the cached task cards; nothing else caches task fields, so they
+send no signal. Deletes send ``tasks_bulk_deleted`` in place of the
+per-task ``post_delete`` the cached counters listen to.
+"""
+
+from django.db import transaction
+from django.db.models import F
+
+from tasks.assignments import reconcile_assignees
+from tasks.models import Task
+from tasks.signals import tasks_bulk_deleted
+
+
+def update_tasks(ids, **values):
+    """Set ``values`` on the tasks with one ``UPDATE ... WHERE id IN``."""
+    return Task.objects.filter(pk__in=ids).update(
+        version=F("version") + 1, **values
+    )
+
+
+def set_status(ids, status):
+    return update_tasks(ids, status=status)
+
+
+def set_priority(ids, priority):
+    return update_tasks(ids, priority=priority)
+
+
+def reassign(ids, worker_ids):
+    """Give every task exactly ``worker_ids`` as assignees.
+
+    Returns the numbers of assignments added and removed.
+    """
+    ids = list(Task.objects.filter(pk__in=ids).values_list("pk", flat=True))
+    with transaction.atomic():
+        return reconcile_assignees(dict.fromkeys(ids, set(worker_ids)))
+
+
+def raw_delete(model, ids):
+    """Delete the ``model`` rows with primary keys in ``ids`` and the
+    many-to-many rows pointing at them, with one DELETE per table.
+
+    Unlike ``QuerySet.delete()`` nothing is loaded and no signal is sent;
+    callers send their own. This relies on ``QuerySet._raw_delete()``,
+    which skips the delete collector and so any ``on_delete`` rule. It
+    therefore refuses models that other models reference by a foreign key
+    of their own: only the auto-created through tables are cleared.
+    Database triggers still fire for every deleted row.
+    """
+    through_fields = []
+    for relation in model._meta.get_fields(include_hidden=True):
+        if not (relation.auto_created and not relation.concrete):
+            continue
+        if not relation.related_model._meta.auto_created:
+            raise TypeError(
+                f"{relation.related_model.__name__} references "
+                f"{model.__name__}; raw_delete() would skip its on_delete."
+            )
+        through_fields.append(relation)
+    with transaction.atomic():
+        for relation in through_fields:
+            relation.related_model.objects.filter(
+                **{f"{relation.field.name}__in": ids}
+            ).delete()
+        queryset = model.objects.filter(pk__in=ids)
+        return queryset._raw_delete(queryset.db)
+
+
+def delete_tasks(ids):
+    """Delete the tasks and their assignments with one DELETE each.
+
+    ``QuerySet.delete()`` would load every task to send ``post_delete``,
+    so this goes through ``raw_delete()``. The per-type counter rows are
+    kept by database triggers, which fire for raw deletes as well.
+    """
+    ids = list(ids)
+    deleted = raw_delete(Task, ids)
+    tasks_bulk_deleted.send(sender=Task, ids=ids, count=deleted)
+    return deleted
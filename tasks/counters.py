@@ -0,0 +1,220 @@
+import asyncio
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import NotSupportedError, connection, transaction
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from tasks.models import Position, Task, TaskCount, TaskType, Worker, WorkerCount
+
+COUNTED_MODELS = {
+    "num_workers": Worker,
+    "num_tasks": Task,
+    "num_task_types": TaskType,
+    "num_positions": Position,
+}
+
+# Counter table, counted model, and the columns the counter rows are keyed by.
+# The triggers that maintain them are in migration 0006.
+COUNTER_TABLES = (
+    (TaskCount, Task, ("task_type_id", "status")),
+    (WorkerCount, Worker, ("position_id",)),
+)
+
+CACHE_KEY_PREFIX = "tasks:counter:"
+
+
+def cache_key(name):
+    return f"{CACHE_KEY_PREFIX}{name}"
+
+
+def counter_name(model):
+    for name, counted_model in COUNTED_MODELS.items():
+        if counted_model is model:
+            return name
+    return None
+
+
+def get_counts():
+    """Return the dashboard totals, counting only those not in the cache."""
+    keys = {name: cache_key(name) for name in COUNTED_MODELS}
+    cached = cache.get_many(keys.values())
+
+    counts = {}
+    missing = {}
+    for name, key in keys.items():
+        if key in cached:
+            counts[name] = cached[key]
+        else:
+            counts[name] = missing[key] = COUNTED_MODELS[name].objects.count()
+
+    if missing:
+        cache.set_many(missing, settings.TASK_COUNTERS_TIMEOUT)
+    return counts
+
+
+async def aget_counts():
+    """Async ``get_counts``; the totals missing from the cache are counted
+    together."""
+    keys = {name: cache_key(name) for name in COUNTED_MODELS}
+    cached = await cache.aget_many(keys.values())
+
+    names = [name for name, key in keys.items() if key not in cached]
+    totals = await asyncio.gather(
+        *(COUNTED_MODELS[name].objects.acount() for name in names)
+    )
+    missing = {keys[name]: total for name, total in zip(names, totals)}
+
+    if missing:
+        await cache.aset_many(missing, settings.TASK_COUNTERS_TIMEOUT)
+    return {name: cached.get(key, missing.get(key)) for name, key in keys.items()}
+
+
+def adjust(model, delta):
+    """Shift the cached total for ``model`` by ``delta`` if it is cached.
+
+    A missing key is left alone; the next read recounts it.
+    """
+    name = counter_name(model)
+    if name is None or not delta:
+        return
+    try:
+        if delta > 0:
+            cache.incr(cache_key(name), delta)
+        else:
+            cache.decr(cache_key(name), -delta)
+    except ValueError:
+        pass
+
+
+def forget(model):
+    """Drop the cached total for ``model``, so the next read recounts it."""
+    name = counter_name(model)
+    if name is not None:
+        cache.delete(cache_key(name))
+
+
+def reconcile():
+    """Recount every total and store it.
+
+    Returns ``{name: (cached, actual)}`` for the counters that had drifted.
+    """
+    keys = {name: cache_key(name) for name in COUNTED_MODELS}
+    cached = cache.get_many(keys.values())
+
+    actual = {
+        keys[name]: model.objects.count()
+        for name, model in COUNTED_MODELS.items()
+    }
+    cache.set_many(actual, settings.TASK_COUNTERS_TIMEOUT)
+
+    return {
+        name: (cached[key], actual[key])
+        for name, key in keys.items()
+        if key in cached and cached[key] != actual[key]
+    }
+
+
+def tasks_per_type():
+    """Subquery for the number of tasks of the outer ``TaskType``, summed
+    from its ``TaskCount`` rows instead of counted from the tasks."""
+    return Coalesce(
+        Subquery(
+            TaskCount.objects.filter(task_type=OuterRef("pk"))
+            .order_by()
+            .values("task_type")
+            .annotate(total=Sum("count"))
+            .values("total")
+        ),
+        0,
+    )
+
+
+def workers_per_position():
+    """Subquery for the number of workers in the outer ``Position``."""
+    return Coalesce(
+        Subquery(
+            WorkerCount.objects.filter(position=OuterRef("pk")).values("count")
+        ),
+        0,
+    )
+
+
+def trigger_names():
+    """Return the names of the triggers migration 0006 installs."""
+    tables = [model._meta.db_table for _, model, _ in COUNTER_TABLES]
+    if connection.vendor == "sqlite":
+        return {
+            f"{table}_count_{suffix}"
+            for table in tables
+            for suffix in ("ai", "ad", "au")
+        }
+    if connection.vendor == "postgresql":
+        return {f"{table}_count" for table in tables}
+    raise NotSupportedError(f"No counter triggers on {connection.vendor}.")
+
+
+def missing_triggers():
+    """Return the counter triggers not in the database, sorted.
+
+    On SQLite a migration that remakes a counted table drops its triggers
+    unless it installs them again, and the counters then drift silently.
+    """
+    expected = trigger_names()
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        else:
+            cursor.execute("SELECT tgname FROM pg_trigger WHERE NOT tgisinternal")
+        existing = {name for (name,) in cursor.fetchall()}
+    return sorted(expected - existing)
+
+
+def recount():
+    """Rebuild the counter tables from the tasks and workers.
+
+    Returns ``{(table, key): (stored, actual)}`` for the rows that had
+    drifted; only those rows are written.
+    """
+    drifted = {}
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            # Hold off writes, and so the triggers, until the counts are in.
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"LOCK TABLE {Task._meta.db_table}, {Worker._meta.db_table} "
+                    f"IN SHARE MODE"
+                )
+        for counter, model, keys in COUNTER_TABLES:
+            stored = {
+                tuple(row[:-1]): row[-1]
+                for row in counter.objects.values_list(*keys, "count")
+            }
+            actual = {
+                tuple(row[:-1]): row[-1]
+                for row in model.objects.filter(
+                    **{f"{key}__isnull": False for key in keys}
+                )
+                .order_by()
+                .values(*keys)
+                .annotate(total=Count("pk"))
+                .values_list(*keys, "total")
+            }
+            changed = {
+                key: (stored.get(key, 0), actual.get(key, 0))
+                for key in stored.keys() | actual.keys()
+                if stored.get(key, 0) != actual.get(key, 0)
+            }
+            counter.objects.bulk_create(
+                [
+                    counter(**dict(zip(keys, key)), count=total)
+                    for key, (_, total) in changed.items()
+                ],
+                update_conflicts=True,
+                unique_fields=keys,
+                update_fields=["count"],
+            )
+            table = counter._meta.db_table
+            drifted.update({(table, key): totals for key, totals in changed.items()})
+    return drifted
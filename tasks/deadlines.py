@@ -0,0 +1,92 @@
+"""Open tasks bucketed by deadline, across every status.
+
+A task is open until its status is done. Overdue tasks are open tasks
+past their deadline; due-soon tasks are open tasks due within the next
+``TASK_DUE_SOON_HOURS``. Both buckets are range scans of the partial index
+``task_open_deadline_idx``, whatever the size of the done backlog.
+
+Times are truncated to the minute and the bucket sizes are cached for that
+minute, so a page and its counts agree and are computed once per minute.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from tasks.models import Task
+
+BUCKETS = {
+    "overdue": "Overdue",
+    "due_soon": "Due Soon",
+}
+
+CACHE_KEY_PREFIX = "tasks:deadlines:"
+
+
+def current_minute():
+    return timezone.now().replace(second=0, microsecond=0)
+
+
+def due_soon_until(at):
+    return at + timedelta(hours=settings.TASK_DUE_SOON_HOURS)
+
+
+def open_tasks():
+    return Task.objects.exclude(status=Task.Status.DONE)
+
+
+def overdue(at):
+    return open_tasks().filter(deadline__lt=at)
+
+
+def due_soon(at):
+    return open_tasks().filter(deadline__gte=at, deadline__lt=due_soon_until(at))
+
+
+def bucket(name, at):
+    """Return the open tasks in bucket ``name`` at the minute ``at``."""
+    if name == "overdue":
+        return overdue(at)
+    if name == "due_soon":
+        return due_soon(at)
+    raise ValueError(f"Unknown deadline bucket: {name!r}")
+
+
+def cache_key(at):
+    return f"{CACHE_KEY_PREFIX}{at:%Y%m%d%H%M}"
+
+
+def counts_queryset(at):
+    # One scan of the index up to the end of the due-soon window.
+    return open_tasks().filter(deadline__lt=due_soon_until(at)).order_by()
+
+
+def count_aggregates(at):
+    return {
+        "overdue": Count("pk", filter=Q(deadline__lt=at)),
+        "due_soon": Count("pk", filter=Q(deadline__gte=at)),
+    }
+
+
+def get_counts(at=None):
+    """Return ``{bucket: number of tasks}`` for the minute ``at``."""
+    at = at or current_minute()
+    key = cache_key(at)
+    counts = cache.get(key)
+    if counts is None:
+        counts = counts_queryset(at).aggregate(**count_aggregates(at))
+        cache.set(key, counts, 60)
+    return counts
+
+
+async def aget_counts(at=None):
+    at = at or current_minute()
+    key = cache_key(at)
+    counts = await cache.aget(key)
+    if counts is None:
+        counts = await counts_queryset(at).aaggregate(**count_aggregates(at))
+        await cache.aset(key, counts, 60)
+    return counts
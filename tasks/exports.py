@@ -0,0 +1,143 @@
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+from tasks.models import Task, Worker
+
+TASK_COLUMNS = (
+    "id",
+    "name",
+    "description",
+    "deadline",
+    "is_completed",
+    "priority",
+    "status",
+    "task_type",
+    "assignees",
+)
+
+WORKER_COLUMNS = (
+    "id",
+    "username",
+    "first_name",
+    "last_name",
+    "email",
+    "position",
+)
+
+
+def task_rows(chunk_size=None):
+    """Yield one dict per task, reading ``chunk_size`` tasks at a time.
+
+    Tasks come from a single query read through the cursor a chunk at a
+    time, and assignees are prefetched with one query per chunk, so
+    memory stays bounded by the chunk size however many tasks there are.
+    """
+    assignees = Worker.objects.only("username").order_by()
+    queryset = (
+        Task.objects.select_related("task_type")
+        .prefetch_related(Prefetch("assignees", queryset=assignees))
+        .order_by("pk")
+    )
+    for task in queryset.iterator(
+        chunk_size=chunk_size or settings.TASK_EXPORT_CHUNK_SIZE
+    ):
+        yield {
+            "id": task.pk,
+            "name": task.name,
+            "description": task.description,
+            "deadline": task.deadline,
+            "is_completed": task.is_completed,
+            "priority": task.priority,
+            "status": task.status,
+            "task_type": task.task_type.name,
+            "assignees": sorted(w.username for w in task.assignees.all()),
+        }
+
+
+def worker_rows(chunk_size=None):
+    queryset = Worker.objects.select_related("position").order_by("pk")
+    for worker in queryset.iterator(
+        chunk_size=chunk_size or settings.TASK_EXPORT_CHUNK_SIZE
+    ):
+        yield {
+            "id": worker.pk,
+            "username": worker.username,
+            "first_name": worker.first_name,
+            "last_name": worker.last_name,
+            "email": worker.email,
+            "position": worker.position.position if worker.position else None,
+        }
+
+
+EXPORTS = {
+    "tasks": (TASK_COLUMNS, task_rows),
+    "workers": (WORKER_COLUMNS, worker_rows),
+}
+
+
+class Echo:
+    """File-like object whose ``write`` returns the line instead."""
+
+    def write(self, value):
+        return value
+
+
+def csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ";".join(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def csv_lines(columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([csv_value(row[column]) for column in columns])
+
+
+def ndjson_lines(columns, rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+FORMATS = {
+    "csv": ("text/csv", csv_lines),
+    "ndjson": ("application/x-ndjson", ndjson_lines),
+}
+
+
+def export_lines(resource, export_format, chunk_size=None):
+    """Return an iterator over the lines of a ``resource`` export.
+
+    Raises ``KeyError`` for an unknown resource or format.
+    """
+    columns, rows = EXPORTS[resource]
+    _, lines = FORMATS[export_format]
+    return lines(columns, rows(chunk_size))
+
+
+async def aexport_lines(resource, export_format, chunk_size=None):
+    """Yield the lines of an export, a chunk of rows per string, for ASGI.
+
+    Django's ASGI handler reads a synchronous streaming response whole
+    before sending it. Here each chunk is read by ``export_lines()`` in
+    the thread Django keeps for synchronous code, and its connection.
+    """
+    lines = export_lines(resource, export_format, chunk_size)
+    read_chunk = sync_to_async(
+        lambda: "".join(
+            islice(lines, chunk_size or settings.TASK_EXPORT_CHUNK_SIZE)
+        )
+    )
+    while chunk := await read_chunk():
+        yield chunk
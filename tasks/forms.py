@@ -1,10 +1,107 @@
+import copy
+import io
+
 from django import forms
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
+from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
+from django.urls import reverse_lazy
 
+from tasks.assignments import reconcile_assignees
+from tasks.imports import count_passwords
 from tasks.models import Task, Worker, Position, TaskType
 
 
+class WorkerAutocompleteWidget(forms.SelectMultiple):
+    """Multi-select that renders only the selected workers.
+
+    Other workers are found through the worker lookup endpoint by
+    ``static/js/assignee_autocomplete.js``, so rendering the form never
+    loads the whole worker table.
+    """
+
+    def __init__(self, attrs=None):
+        attrs = {
+            "data-autocomplete-url": reverse_lazy("tasks:worker-lookup"),
+            **(attrs or {}),
+        }
+        super().__init__(attrs)
+
+    def optgroups(self, name, value, attrs=None):
+        if not isinstance(self.choices, ModelChoiceIterator):
+            return super().optgroups(name, value, attrs)
+
+        selected = [pk for pk in value if str(pk).isdigit()]
+        all_choices = self.choices
+        self.choices = copy.copy(all_choices)
+        self.choices.queryset = all_choices.queryset.filter(pk__in=selected)
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = all_choices
+
+
+class ModelIdsField(forms.ModelMultipleChoiceField):
+    """``ModelMultipleChoiceField`` that cleans to a set of primary keys.
+
+    The ids are checked with one query that loads no model instances.
+    """
+
+    def clean(self, value):
+        value = self.prepare_value(value)
+        if not value:
+            if self.required:
+                raise ValidationError(
+                    self.error_messages["required"], code="required"
+                )
+            return set()
+        if not isinstance(value, (list, tuple)):
+            raise ValidationError(
+                self.error_messages["invalid_list"], code="invalid_list"
+            )
+        ids = set()
+        for pk in value:
+            try:
+                ids.add(int(pk))
+            except (TypeError, ValueError):
+                raise ValidationError(
+                    self.error_messages["invalid_pk_value"],
+                    code="invalid_pk_value",
+                    params={"pk": pk},
+                )
+        found = set(
+            self.queryset.filter(pk__in=ids)
+            .order_by()
+            .values_list("pk", flat=True)
+        )
+        missing = ids - found
+        if missing:
+            raise ValidationError(
+                self.error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": min(missing)},
+            )
+        self.run_validators(ids)
+        return ids
+
+
+class IdListField(forms.Field):
+    """A list of primary keys posted as repeated fields, e.g. checkboxes."""
+
+    widget = forms.MultipleHiddenInput
+    default_error_messages = {"invalid": "Enter a list of ids."}
+
+    def to_python(self, value):
+        if not value:
+            return []
+        try:
+            return sorted({int(pk) for pk in value})
+        except (TypeError, ValueError):
+            raise ValidationError(self.error_messages["invalid"], code="invalid")
+
+
 class TaskSearchForm(forms.Form):
     name = forms.CharField(
         label="",
@@ -19,9 +116,11 @@ class TaskSearchForm(forms.Form):
 
 
 class TaskForm(forms.ModelForm):
-    assignees = forms.ModelMultipleChoiceField(
-        queryset=get_user_model().objects.all(),
-        widget=forms.CheckboxSelectMultiple(attrs={"class": "checkbox-list"}),
+    assignees = ModelIdsField(
+        queryset=get_user_model().objects.select_related("position"),
+        widget=WorkerAutocompleteWidget(
+            attrs={"class": "input white-background"}
+        ),
         label="Assignees",
         required=False,
     )
@@ -36,6 +135,10 @@ class TaskForm(forms.ModelForm):
         label="Deadline",
     )
 
+    # The version the form was loaded at, so a save can detect edits made
+    # in the meantime. Required when editing, see __init__.
+    version = forms.IntegerField(widget=forms.HiddenInput, required=False)
+
     class Meta:
         model = Task
         fields = (
@@ -81,6 +184,21 @@ class TaskForm(forms.ModelForm):
             ),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.initial.setdefault("version", self.instance.version)
+            # Without it an edit would overwrite whatever was saved since.
+            self.fields["version"].required = True
+            self.fields["version"].error_messages["required"] = (
+                "This form is missing the task version. "
+                "Reload the page and try again."
+            )
+
+    def _save_m2m(self):
+        # Assignees are the only many-to-many field.
+        reconcile_assignees({self.instance.pk: self.cleaned_data["assignees"]})
+
 
 class WorkerSearchForm(forms.Form):
     username = forms.CharField(
@@ -211,6 +329,57 @@ class TaskTypeSearchForm(forms.Form):
     )
 
 
+class ImportForm(forms.Form):
+    resource = forms.ChoiceField(
+        choices=[
+            ("tasks", "Tasks"),
+            ("workers", "Workers"),
+            ("positions", "Positions"),
+            ("task-types", "Task types"),
+        ],
+        widget=forms.Select(attrs={"class": "input white-background"}),
+    )
+    file = forms.FileField(
+        help_text="A .csv or .ndjson file in the export layout.",
+        widget=forms.ClearableFileInput(
+            attrs={"class": "input white-background",
+                   "accept": ".csv,.ndjson", }
+        ),
+    )
+
+    def clean_file(self):
+        file = self.cleaned_data["file"]
+        if file.name.rsplit(".", 1)[-1].lower() not in ("csv", "ndjson"):
+            raise forms.ValidationError("Upload a .csv or .ndjson file.")
+        return file
+
+    def clean(self):
+        cleaned_data = super().clean()
+        upload = cleaned_data.get("file")
+        if upload is None or cleaned_data.get("resource") != "workers":
+            return cleaned_data
+        # Each password takes a deliberately slow hash, and the upload is
+        # imported within the request.
+        limit = settings.TASK_IMPORT_UPLOAD_MAX_PASSWORDS
+        import_format = upload.name.rsplit(".", 1)[-1].lower()
+        file = io.TextIOWrapper(upload.file, encoding="utf-8", newline="")
+        try:
+            passwords = count_passwords(file, import_format, limit + 1)
+        except UnicodeDecodeError:
+            self.add_error("file", "The file is not UTF-8 encoded.")
+            return cleaned_data
+        finally:
+            file.detach()
+            upload.file.seek(0)
+        if passwords > limit:
+            self.add_error(
+                "file",
+                f"An upload can set at most {limit} passwords. Import larger "
+                f"files with: python manage.py import_tasks workers <file>",
+            )
+        return cleaned_data
+
+
 class CustomAuthenticationForm(AuthenticationForm):
     username = forms.CharField(
         widget=forms.TextInput(
@@ -225,9 +394,58 @@ class CustomAuthenticationForm(AuthenticationForm):
 
 
 class AssignUserForm(forms.Form):
-    users = forms.ModelMultipleChoiceField(
-        queryset=get_user_model().objects.all(),
-        widget=forms.CheckboxSelectMultiple,
+    users = ModelIdsField(
+        queryset=get_user_model().objects.select_related("position"),
+        widget=WorkerAutocompleteWidget(
+            attrs={"class": "input white-background"}
+        ),
         required=False,
         label="",
     )
+
+
+class TaskBulkActionForm(forms.Form):
+    """Apply one operation to the tasks ticked on the board or a status
+    list."""
+
+    OPERATIONS = (
+        ("status", "Change status"),
+        ("priority", "Change priority"),
+        ("reassign", "Reassign"),
+        ("delete", "Delete"),
+    )
+
+    tasks = IdListField()
+    operation = forms.ChoiceField(
+        choices=OPERATIONS,
+        widget=forms.Select(attrs={"class": "input white-background"}),
+    )
+    status = forms.ChoiceField(
+        choices=[("", "Status...")] + Task.Status.choices,
+        required=False,
+        widget=forms.Select(attrs={"class": "input white-background"}),
+    )
+    priority = forms.ChoiceField(
+        choices=[("", "Priority...")] + Task.Priority.choices,
+        required=False,
+        widget=forms.Select(attrs={"class": "input white-background"}),
+    )
+    assignees = ModelIdsField(
+        queryset=get_user_model().objects.select_related("position"),
+        widget=WorkerAutocompleteWidget(
+            attrs={"class": "input white-background"}
+        ),
+        required=False,
+    )
+    next = forms.CharField(required=False, widget=forms.HiddenInput)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        operation = cleaned_data.get("operation")
+        needs_value = operation in ("status", "priority")
+        if needs_value and not cleaned_data.get(operation):
+            self.add_error(operation, f"Choose the new {operation}.")
+        # Reassigning to nobody would strip every assignee from the tasks.
+        if operation == "reassign" and not cleaned_data.get("assignees"):
+            self.add_error("assignees", "Choose at least one worker.")
+        return cleaned_data
@@ -0,0 +1,407 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import islice
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from tasks import counters
+from tasks.models import Position, Task, TaskType, Worker
+
+TRUE_VALUES = {"1", "true", "yes", "y", "on"}
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    created: int = 0
+    errors: list = field(default_factory=list)
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def text(value):
+    """Flatten an NDJSON value to the string a CSV cell would hold."""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    return str(value)
+
+
+def read_rows(file, import_format):
+    """Yield ``(row number, row, error)`` for each record in ``file``.
+
+    ``file`` is read lazily, so the input is never held in memory whole.
+    """
+    if import_format == "csv":
+        for number, row in enumerate(csv.DictReader(file), start=1):
+            yield number, row, None
+        return
+
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            yield number, None, f"Invalid JSON: {error}"
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "Expected a JSON object."
+            continue
+        yield number, {key: text(value) for key, value in row.items()}, None
+
+
+def count_passwords(file, import_format, stop_after):
+    """Count the rows of ``file`` that set a password, up to ``stop_after``."""
+    with_password = (
+        row
+        for _, row, _ in read_rows(file, import_format)
+        if row and row.get("password")
+    )
+    return sum(1 for _ in islice(with_password, stop_after))
+
+
+def insert(model, objects):
+    """``bulk_create`` that keeps the dashboard counters in step."""
+    model.objects.bulk_create(objects, batch_size=settings.TASK_API_BATCH_SIZE)
+    transaction.on_commit(partial(counters.adjust, model, len(objects)))
+    return objects
+
+
+class LookupCache:
+    """Map names to primary keys, querying each name at most once.
+
+    With ``create=True`` names not found are accepted, and ``save()``
+    inserts them in one batch inside the chunk's transaction.
+    """
+
+    def __init__(self, model, field_name, create=False):
+        self.model = model
+        self.field_name = field_name
+        self.create = create
+        self.ids = {}
+
+    def prime(self, names):
+        missing = {name for name in names if name and name not in self.ids}
+        if not missing:
+            return
+        rows = (
+            self.model.objects.filter(**{f"{self.field_name}__in": missing})
+            .order_by()
+            .values_list(self.field_name, "pk")
+        )
+        for name, pk in rows:
+            self.ids.setdefault(name, pk)
+
+    def accepts(self, name):
+        return name in self.ids or bool(self.create and name)
+
+    def save(self, names):
+        """Insert the ``names`` not found, so ``get()`` knows every one.
+
+        Another import may insert some of the same names first, so
+        conflicts on a unique name are ignored and the ids read back.
+        """
+        missing = sorted({name for name in names if name} - set(self.ids))
+        if not missing:
+            return
+        self.model.objects.bulk_create(
+            [self.model(**{self.field_name: name}) for name in missing],
+            batch_size=settings.TASK_API_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        # How many rows were ours is unknown, so the total is recounted.
+        transaction.on_commit(partial(counters.forget, self.model))
+        self.prime(missing)
+
+    def get(self, name):
+        return self.ids.get(name)
+
+
+def as_list(value):
+    return [item for item in (value or "").split(";") if item]
+
+
+def describe(error):
+    if not hasattr(error, "error_dict"):
+        return "; ".join(error.messages)
+    return "; ".join(
+        f"{name}: {message}"
+        for name, messages in error.message_dict.items()
+        for message in messages
+    )
+
+
+def django_setup():
+    django.setup()
+
+
+class Importer:
+    """Validate rows in chunks and insert each chunk with ``bulk_create``.
+
+    Invalid rows are reported with their row number and skipped; the
+    valid rows of a chunk are written in one transaction.
+    """
+
+    model = None
+    unique_field = None
+
+    def __init__(self, chunk_size=None, progress=None):
+        self.chunk_size = chunk_size or settings.TASK_IMPORT_CHUNK_SIZE
+        self.progress = progress
+
+    def run(self, file, import_format):
+        result = ImportResult()
+        rows = read_rows(file, import_format)
+        with self:
+            while chunk := list(islice(rows, self.chunk_size)):
+                result.rows += len(chunk)
+                valid = []
+                for number, row, error in chunk:
+                    if error:
+                        result.errors.append((number, error))
+                    else:
+                        valid.append((number, row))
+                result.created += self.import_chunk(valid, result.errors)
+                if self.progress:
+                    self.progress(result)
+        return result
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def prepare(self, rows):
+        """Hook for loading whatever a chunk of rows refers to."""
+
+    def build(self, row):
+        raise NotImplementedError
+
+    def taken(self, rows):
+        if self.unique_field is None:
+            return set()
+        values = {row.get(self.unique_field) for _, row in rows}
+        return set(
+            self.model.objects.filter(**{f"{self.unique_field}__in": values})
+            .order_by()
+            .values_list(self.unique_field, flat=True)
+        )
+
+    def import_chunk(self, rows, errors):
+        self.prepare(rows)
+        taken = self.taken(rows)
+        built = []
+        for number, row in rows:
+            if self.unique_field and row.get(self.unique_field) in taken:
+                errors.append(
+                    (number, f"{row[self.unique_field]!r} already exists.")
+                )
+                continue
+            try:
+                built.append(self.build(row))
+            except ValidationError as error:
+                errors.append((number, describe(error)))
+                continue
+            if self.unique_field:
+                taken.add(row[self.unique_field])
+
+        self.finish(built)
+        with transaction.atomic():
+            self.save(built)
+        return len(built)
+
+    def finish(self, built):
+        """Hook for slow per-object work, run outside the transaction."""
+
+    def save(self, built):
+        insert(self.model, built)
+
+
+class NameImporter(Importer):
+    def build(self, row):
+        obj = self.model(**{self.unique_field: row.get(self.unique_field)})
+        obj.full_clean(validate_unique=False, validate_constraints=False)
+        return obj
+
+
+class PositionImporter(NameImporter):
+    model = Position
+    unique_field = "position"
+
+
+class TaskTypeImporter(NameImporter):
+    model = TaskType
+    unique_field = "name"
+
+
+class TaskImporter(Importer):
+    model = Task
+    unique_field = "name"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.task_types = LookupCache(TaskType, "name", create=True)
+        self.workers = LookupCache(Worker, "username")
+
+    def prepare(self, rows):
+        self.task_types.prime(row.get("task_type") for _, row in rows)
+        self.workers.prime(
+            username
+            for _, row in rows
+            for username in as_list(row.get("assignees"))
+        )
+
+    def build(self, row):
+        try:
+            deadline = parse_datetime(row.get("deadline") or "")
+        except ValueError:
+            deadline = None
+        if deadline and timezone.is_naive(deadline):
+            deadline = timezone.make_aware(deadline)
+
+        task = Task(
+            name=row.get("name"),
+            description=row.get("description") or "",
+            deadline=deadline,
+            is_completed=(row.get("is_completed") or "").lower() in TRUE_VALUES,
+            priority=row.get("priority") or Task.Priority.MEDIUM,
+            status=row.get("status") or Task.Status.TODO,
+        )
+        task.task_type_name = row.get("task_type")
+        errors = {}
+        if not self.task_types.accepts(task.task_type_name):
+            errors["task_type"] = ["A task type name is required."]
+        usernames = as_list(row.get("assignees"))
+        unknown = [name for name in usernames if not self.workers.get(name)]
+        if unknown:
+            errors["assignees"] = [f"Unknown workers: {', '.join(unknown)}."]
+        try:
+            task.full_clean(
+                exclude=["task_type", "assignees"],
+                validate_unique=False,
+                validate_constraints=False,
+            )
+        except ValidationError as error:
+            errors.update(error.message_dict)
+        if errors:
+            raise ValidationError(errors)
+
+        task.assignee_ids = {self.workers.get(name) for name in usernames}
+        return task
+
+    def save(self, built):
+        self.task_types.save(task.task_type_name for task in built)
+        for task in built:
+            task.task_type_id = self.task_types.get(task.task_type_name)
+        insert(Task, built)
+        through = Task.assignees.through
+        through.objects.bulk_create(
+            [
+                through(task_id=task.pk, worker_id=worker_id)
+                for task in built
+                for worker_id in task.assignee_ids
+            ],
+            batch_size=settings.TASK_API_BATCH_SIZE,
+        )
+
+
+class WorkerImporter(Importer):
+    """Import workers, hashing their passwords in a process pool.
+
+    Rows without a password get an unusable one.
+    """
+
+    model = Worker
+    unique_field = "username"
+
+    def __init__(self, *args, hash_workers=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.positions = LookupCache(Position, "position", create=True)
+        self.hash_workers = (
+            hash_workers
+            or settings.TASK_IMPORT_HASH_WORKERS
+            or os.cpu_count()
+        )
+        self.pool = None
+
+    def __enter__(self):
+        if self.hash_workers != 1:
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.hash_workers, initializer=django_setup
+            )
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def prepare(self, rows):
+        self.positions.prime(row.get("position") for _, row in rows)
+
+    def build(self, row):
+        worker = Worker(
+            username=row.get("username"),
+            first_name=row.get("first_name"),
+            last_name=row.get("last_name"),
+            email=row.get("email") or "",
+        )
+        worker.position_name = row.get("position")
+        worker.full_clean(
+            exclude=["position", "password"],
+            validate_unique=False,
+            validate_constraints=False,
+        )
+        worker.password = row.get("password") or None
+        return worker
+
+    def finish(self, built):
+        with_password = [worker for worker in built if worker.password]
+        passwords = [worker.password for worker in with_password]
+        if self.pool is None:
+            hashes = map(make_password, passwords)
+        else:
+            chunksize = max(1, len(passwords) // (self.hash_workers * 4))
+            hashes = self.pool.map(make_password, passwords, chunksize=chunksize)
+        for worker, password in zip(with_password, hashes):
+            worker.password = password
+        for worker in built:
+            if not worker.password:
+                worker.set_unusable_password()
+
+    def save(self, built):
+        self.positions.save(worker.position_name for worker in built)
+        for worker in built:
+            worker.position_id = self.positions.get(worker.position_name)
+        insert(Worker, built)
+
+
+IMPORTERS = {
+    "tasks": TaskImporter,
+    "workers": WorkerImporter,
+    "positions": PositionImporter,
+    "task-types": TaskTypeImporter,
+}
+
+FORMATS = ("csv", "ndjson")
@@ -0,0 +1,110 @@
+import json
+import random
+from dataclasses import fields
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from tasks.benchmarks import (
+    Volumes,
+    build_cases,
+    compare,
+    run_benchmarks,
+    seed,
+    uncovered_url_names,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database with synthetic data, request every "
+        "URL in tasks.urls and report p50/p95 latency and query counts."
+    )
+
+    def add_arguments(self, parser):
+        defaults = Volumes()
+        for volume in fields(Volumes):
+            parser.add_argument(
+                f"--{volume.name.replace('_', '-')}",
+                type=int,
+                default=getattr(defaults, volume.name),
+                help=f"Default: {getattr(defaults, volume.name)}.",
+            )
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--output", help="Write the results to this JSON file."
+        )
+        parser.add_argument(
+            "--baseline", help="Compare against results from an earlier run."
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=1.25,
+            help="Allowed p95 slowdown against the baseline, as a ratio.",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Exit with an error if any view regressed.",
+        )
+
+    def handle(self, *args, **options):
+        volumes = Volumes(
+            **{volume.name: options[volume.name] for volume in fields(Volumes)}
+        )
+        if min(volumes.positions, volumes.workers, volumes.task_types) < 1:
+            raise CommandError("Every volume must be at least 1.")
+        baseline = None
+        if options["baseline"]:
+            baseline = json.loads(Path(options["baseline"]).read_text())
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.stdout.write(f"Seeding {volumes}...")
+            seed(volumes, random.Random(options["seed"]))
+            user = get_user_model().objects.create_superuser(
+                username="benchmark", password="benchmark"
+            )
+            cases = build_cases()
+            for name in uncovered_url_names(cases):
+                self.stderr.write(f"No benchmark case for tasks:{name}")
+            results = run_benchmarks(
+                user, volumes, options["iterations"], cases
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.print_results(results)
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(results, indent=2))
+
+        if baseline is not None:
+            regressions = compare(results, baseline, options["tolerance"])
+            for message in regressions:
+                self.stdout.write(self.style.WARNING(message))
+            if regressions and options["fail_on_regression"]:
+                raise CommandError(f"{len(regressions)} regressions.")
+            if not regressions:
+                self.stdout.write(self.style.SUCCESS("No regressions."))
+
+    def print_results(self, results):
+        self.stdout.write(
+            f"{'view':<40} {'status':>6} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'queries':>7}"
+        )
+        for label, result in results["views"].items():
+            self.stdout.write(
+                f"{label:<40} {result['status']:>6} {result['p50_ms']:>8} "
+                f"{result['p95_ms']:>8} {result['queries']:>7}"
+            )
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.models import ApiToken, Worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Issue an API token for a worker and print its key. The key is "
+        "shown only once; clients send it as 'Authorization: Token <key>'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+
+    def handle(self, *args, **options):
+        try:
+            worker = Worker.objects.get(username=options["username"])
+        except Worker.DoesNotExist:
+            raise CommandError(f"No worker named {options['username']!r}.")
+        _, key = ApiToken.issue(worker)
+        self.stdout.write(key)
@@ -0,0 +1,221 @@
+import re
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.utils import timezone
+
+from tasks import deadlines
+from tasks.board import column_queryset, column_querysets
+from tasks.models import Position, Task, TaskType
+from tasks.views import (
+    TaskDeadlineListView,
+    TasksListView,
+    TaskStatusListView,
+    WorkerListView,
+)
+
+# SQLite only narrows an index to a range in SEARCH steps. A SCAN reads the
+# whole table, or the whole index with USING [COVERING] INDEX.
+SQLITE_SCAN = re.compile(r"\bSCAN (\w+)(?: USING (?:COVERING )?INDEX (\w+))?")
+
+# On PostgreSQL a sequential scan reads the whole table, and an index scan
+# without an "Index Cond" line reads the whole index.
+POSTGRES_SEQ_SCAN = re.compile(r"\bSeq Scan on (\w+)")
+POSTGRES_INDEX_SCAN = re.compile(
+    r"^(\s*)(?:->\s*)?Index (?:Only )?Scan (?:Backward )?using (\w+) on (\w+)"
+)
+
+SUPPORTED_VENDORS = ("sqlite", "postgresql")
+
+# Pages with no filter, where reading the ordering index up to the LIMIT is
+# the intended plan.
+INDEX_ORDER_CHECKS = {"tasks:worker-list"}
+
+
+def view_queryset(view_class, query=None, **kwargs):
+    """Return the queryset ``view_class`` would build for a GET request."""
+    view = view_class()
+    view.setup(RequestFactory().get("/", query or {}), **kwargs)
+    return view.get_queryset()
+
+
+def partial_indexes():
+    """Return the names of the indexes with a condition. Reading all of one
+    only reads the rows the query filters for."""
+    return {
+        index.name
+        for model in apps.get_models()
+        for index in model._meta.indexes
+        if index.condition is not None
+    }
+
+
+def full_index_scans(plan):
+    """Return ``(index, table)`` for the PostgreSQL index scans that have
+    no index condition, i.e. walk the whole index."""
+    lines = plan.splitlines()
+    tables = []
+    for number, line in enumerate(lines):
+        match = POSTGRES_INDEX_SCAN.match(line)
+        if match is None:
+            continue
+        indent = len(match.group(1))
+        details = []
+        for detail in lines[number + 1:]:
+            if len(detail) - len(detail.lstrip()) <= indent or "->" in detail:
+                break
+            details.append(detail.strip())
+        if not any(detail.startswith("Index Cond:") for detail in details):
+            tables.append((match.group(2), match.group(3)))
+    return tables
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on the querysets behind the task views and report "
+        "any full table or index scans."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fail-on-scan",
+            action="store_true",
+            help="Exit with an error if any query plan contains a full scan.",
+        )
+        parser.add_argument(
+            "--show-plans",
+            action="store_true",
+            help="Print the full query plan for every checked queryset.",
+        )
+
+    def get_checks(self):
+        """Return ``(label, queryset)`` pairs to explain.
+
+        Checks that filter by a task type or position get ``None`` instead
+        of a queryset when the database has none: the views treat a missing
+        id as "no filter", so they would explain a different query.
+        """
+        column_size = settings.TASK_BOARD_COLUMN_SIZE
+        task_type_id = TaskType.objects.values_list("pk", flat=True).first()
+        position_id = Position.objects.values_list("pk", flat=True).first()
+        board = view_queryset(TasksListView)
+        minute = deadlines.current_minute()
+        deadline_page = TaskDeadlineListView.paginate_by
+
+        checks = [
+            ("tasks:task-list", column_querysets(board, column_size)["todo"]),
+            (
+                "tasks:task-board-column",
+                column_queryset(board, Task.Status.TODO)[:column_size],
+            ),
+            (
+                "tasks:task-type-tasks",
+                task_type_id
+                and column_querysets(
+                    view_queryset(TasksListView, task_type_id=task_type_id),
+                    column_size,
+                )["todo"],
+            ),
+            (
+                "tasks:task-status-list",
+                view_queryset(
+                    TaskStatusListView, status=Task.Status.TODO
+                )[: TaskStatusListView.paginate_by],
+            ),
+            ("tasks:task-overdue", deadlines.overdue(minute)[:deadline_page]),
+            ("tasks:task-due-soon", deadlines.due_soon(minute)[:deadline_page]),
+            (
+                "tasks:worker-list",
+                view_queryset(WorkerListView)[: WorkerListView.paginate_by],
+            ),
+            (
+                "tasks:position-workers",
+                position_id
+                and view_queryset(
+                    WorkerListView, position_id=position_id
+                )[: WorkerListView.paginate_by],
+            ),
+            (
+                "admin:tasks_task_changelist?is_completed",
+                Task.objects.filter(is_completed=False)[:100],
+            ),
+            (
+                "admin:tasks_task_changelist?task_type",
+                task_type_id
+                and Task.objects.filter(task_type_id=task_type_id)[:100],
+            ),
+            (
+                "admin:tasks_task_changelist?deadline",
+                Task.objects.filter(deadline__gte=timezone.now())[:100],
+            ),
+        ]
+        return checks
+
+    def find_scans(self, plan, index_order=False):
+        """Return the tables ``plan`` reads in full.
+
+        Walking all of a partial index is allowed. With ``index_order``,
+        walking any whole index in order is, as it is for an unfiltered page
+        that stops at its LIMIT.
+        """
+        if connection.vendor == "sqlite":
+            scanned = SQLITE_SCAN.findall(plan)
+        elif connection.vendor == "postgresql":
+            scanned = [(table, "") for table in POSTGRES_SEQ_SCAN.findall(plan)]
+            scanned += [
+                (table, index) for index, table in full_index_scans(plan)
+            ]
+        else:
+            return []
+        allowed = partial_indexes()
+        tables = set(connection.introspection.table_names())
+        return sorted(
+            {
+                table
+                for table, index in scanned
+                if table in tables
+                and not (index and (index_order or index in allowed))
+            }
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in SUPPORTED_VENDORS:
+            self.stderr.write(
+                self.style.WARNING(
+                    f"Scan detection is not supported on {connection.vendor}; "
+                    "plans are printed without analysis."
+                )
+            )
+
+        flagged = []
+        for label, queryset in self.get_checks():
+            if queryset is None:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"{label}: skipped, no task type or position to "
+                        f"filter by"
+                    )
+                )
+                continue
+            plan = queryset.explain()
+            scans = self.find_scans(plan, index_order=label in INDEX_ORDER_CHECKS)
+            if scans:
+                flagged.append(label)
+                self.stdout.write(
+                    self.style.ERROR(
+                        f"{label}: full scan on {', '.join(scans)}"
+                    )
+                )
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{label}: OK"))
+            if options["show_plans"] or scans:
+                self.stdout.write(plan)
+
+        if flagged and options["fail_on_scan"]:
+            raise CommandError(
+                f"{len(flagged)} queryset(s) use a full scan: "
+                f"{', '.join(flagged)}"
+            )
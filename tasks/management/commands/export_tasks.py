@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from tasks.exports import EXPORTS, FORMATS, export_lines
+
+
+class Command(BaseCommand):
+    help = "Stream all tasks or workers as CSV or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "resource",
+            nargs="?",
+            default="tasks",
+            choices=sorted(EXPORTS),
+        )
+        parser.add_argument(
+            "--format",
+            dest="export_format",
+            default="csv",
+            choices=sorted(FORMATS),
+        )
+        parser.add_argument(
+            "--output",
+            help="File to write to. Defaults to standard output.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Rows read per query. Defaults to TASK_EXPORT_CHUNK_SIZE.",
+        )
+
+    def handle(self, *args, **options):
+        lines = export_lines(
+            options["resource"],
+            options["export_format"],
+            chunk_size=options["chunk_size"],
+        )
+        if options["output"]:
+            with open(options["output"], "w", newline="") as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
@@ -0,0 +1,70 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.imports import FORMATS, IMPORTERS
+
+
+class Command(BaseCommand):
+    help = (
+        "Import tasks, workers, positions or task types from a CSV or "
+        "NDJSON file, in the same layout export_tasks writes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("resource", choices=sorted(IMPORTERS))
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            dest="import_format",
+            choices=FORMATS,
+            help="Input format. Defaults to the file extension.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Rows per transaction. Defaults to TASK_IMPORT_CHUNK_SIZE.",
+        )
+        parser.add_argument(
+            "--hash-workers",
+            type=int,
+            help="Processes used to hash worker passwords.",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        import_format = options["import_format"] or path.suffix.lstrip(".")
+        if import_format not in FORMATS:
+            raise CommandError(
+                f"Cannot tell the format of {path}; pass --format."
+            )
+
+        kwargs = {
+            "chunk_size": options["chunk_size"],
+            "progress": self.report_progress,
+        }
+        if options["resource"] == "workers":
+            kwargs["hash_workers"] = options["hash_workers"]
+        importer = IMPORTERS[options["resource"]](**kwargs)
+
+        try:
+            with path.open(newline="", encoding="utf-8") as file:
+                result = importer.run(file, import_format)
+        except OSError as error:
+            raise CommandError(error) from error
+
+        for number, message in result.errors:
+            self.stderr.write(f"Row {number}: {message}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result.created} of {result.rows} rows in "
+                f"{result.elapsed:.1f}s, {len(result.errors)} rejected."
+            )
+        )
+
+    def report_progress(self, result):
+        self.stdout.write(
+            f"{result.rows} rows read, {result.created} created, "
+            f"{len(result.errors)} rejected "
+            f"({result.rows_per_second:.0f} rows/s)"
+        )
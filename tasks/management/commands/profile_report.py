@@ -0,0 +1,59 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from tasks.profiling import METRICS, profiler, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        "Print per-view query counts and timings collected by "
+        "ProfilingMiddleware. Needs a cache shared with the web processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sort",
+            choices=METRICS,
+            default="total_ms",
+            help="Metric whose p95 orders the report.",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Print the report as JSON."
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Discard the collected samples after printing.",
+        )
+
+    def handle(self, *args, **options):
+        sort = options["sort"]
+        rows = sorted(
+            summarize(profiler.collect()),
+            key=lambda row: row[sort]["p95"],
+            reverse=True,
+        )
+
+        if options["json"]:
+            self.stdout.write(json.dumps(rows, indent=2))
+        elif not rows:
+            self.stdout.write("No samples collected.")
+        else:
+            self.stdout.write(
+                f"{'view':<32} {'reqs':>6} {'queries p50/p95':>16} "
+                f"{'sql ms p95':>11} {'tmpl ms p95':>12} "
+                f"{'py ms p95':>10} {'total ms p95':>13}"
+            )
+            for row in rows:
+                queries = f"{row['queries']['p50']}/{row['queries']['p95']}"
+                self.stdout.write(
+                    f"{row['view']:<32} {row['requests']:>6} {queries:>16} "
+                    f"{row['sql_ms']['p95']:>11.1f} "
+                    f"{row['template_ms']['p95']:>12.1f} "
+                    f"{row['python_ms']['p95']:>10.1f} "
+                    f"{row['total_ms']['p95']:>13.1f}"
+                )
+
+        if options["clear"]:
+            profiler.clear()
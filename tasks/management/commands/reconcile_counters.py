@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from tasks import counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the cached dashboard totals and fix any drift. "
+        "Run periodically, e.g. from cron."
+    )
+
+    def handle(self, *args, **options):
+        drifted = counters.reconcile()
+        for name, (cached, actual) in drifted.items():
+            self.stdout.write(
+                self.style.WARNING(f"{name}: cached {cached}, actual {actual}")
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reconciled {len(counters.COUNTED_MODELS)} counters, "
+                f"{len(drifted)} had drifted."
+            )
+        )
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the per-type task and per-position worker counter tables "
+        "and report the rows that had drifted. Fails if the triggers that "
+        "keep them up to date are missing."
+    )
+
+    def handle(self, *args, **options):
+        missing = counters.missing_triggers()
+        if missing:
+            raise CommandError(
+                f"Counter triggers missing: {', '.join(missing)}. Install them "
+                f"again as migration 0006 does, then re-run recount."
+            )
+        drifted = counters.recount()
+        for (table, key), (stored, actual) in sorted(drifted.items()):
+            label = "/".join(str(part) for part in key)
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{table} {label}: stored {stored}, actual {actual}"
+                )
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recounted {len(counters.COUNTER_TABLES)} counter tables, "
+                f"{len(drifted)} rows had drifted."
+            )
+        )
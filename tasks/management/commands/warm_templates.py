@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.warmup import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        "Parse every template under templates/. Fails on syntax errors, "
+        "so running it from build.sh stops a broken template shipping."
+    )
+
+    def handle(self, *args, **options):
+        loaded, errors = warm_templates()
+        for name, error in errors.items():
+            self.stderr.write(f"{name}: {error}")
+        if errors:
+            raise CommandError(f"{len(errors)} templates failed to parse.")
+        self.stdout.write(self.style.SUCCESS(f"Parsed {loaded} templates."))
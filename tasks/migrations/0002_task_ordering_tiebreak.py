@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 03:21
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="task",
+            options={"ordering": ("deadline", "id")},
+        ),
+    ]
@@ -0,0 +1,117 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+SEARCH_COLUMNS = {
+    "tasks_task": ("name", "description"),
+    "tasks_worker": ("username", "first_name", "last_name"),
+    "tasks_position": ("position",),
+    "tasks_tasktype": ("name",),
+}
+
+TASK_DOCUMENT_INDEX = "task_search_document_idx"
+
+
+def create_sqlite_triggers(schema_editor, table, columns):
+    """Keep ``<table>_fts`` in step with ``table``.
+
+    SQLite drops these triggers whenever Django remakes ``table`` to alter
+    it, so later migrations that do that call this again.
+    """
+    fts = f"{table}_fts"
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    for suffix in ("ai", "ad", "au"):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+    schema_editor.execute(
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {column_list}) "
+        f"VALUES (new.id, {new_values}); END"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) "
+        f"VALUES ('delete', old.id, {old_values}); END"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {column_list} "
+        f"ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) "
+        f"VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {column_list}) "
+        f"VALUES (new.id, {new_values}); END"
+    )
+
+
+def sqlite_forwards(schema_editor):
+    for table, columns in SEARCH_COLUMNS.items():
+        fts = f"{table}_fts"
+        column_list = ", ".join(columns)
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({column_list}, "
+            f"content='{table}', content_rowid='id', tokenize='trigram')"
+        )
+        create_sqlite_triggers(schema_editor, table, columns)
+        schema_editor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def sqlite_backwards(schema_editor):
+    for table in SEARCH_COLUMNS:
+        fts = f"{table}_fts"
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+def postgres_forwards(apps, schema_editor):
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, columns in SEARCH_COLUMNS.items():
+        for column in columns:
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_{column}_trgm_idx "
+                f"ON {table} USING gin (UPPER({column}::text) gin_trgm_ops)"
+            )
+    # Built from the same SearchVector the search backend filters on, so
+    # the indexed expression matches the one in the query.
+    schema_editor.add_index(
+        apps.get_model("tasks", "Task"),
+        GinIndex(
+            SearchVector("name", "description", config="english"),
+            name=TASK_DOCUMENT_INDEX,
+        ),
+    )
+
+
+def postgres_backwards(schema_editor):
+    schema_editor.execute(f"DROP INDEX IF EXISTS {TASK_DOCUMENT_INDEX}")
+    for table, columns in SEARCH_COLUMNS.items():
+        for column in columns:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {table}_{column}_trgm_idx")
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        sqlite_forwards(schema_editor)
+    elif vendor == "postgresql":
+        postgres_forwards(apps, schema_editor)
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        sqlite_backwards(schema_editor)
+    elif vendor == "postgresql":
+        postgres_backwards(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0003_task_hot_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,194 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:05
+
+import django.db.models.deletion
+from django.db import NotSupportedError, migrations, models
+
+# Counted table: (counter table, columns the counter rows are keyed by).
+COUNTERS = {
+    "tasks_task": ("tasks_taskcount", ("task_type_id", "status")),
+    "tasks_worker": ("tasks_workercount", ("position_id",)),
+}
+
+
+def increment_sql(counter, keys, row):
+    """Add one to the counter row for ``row`` (``new`` or ``old``),
+    creating it if needed. Rows with a null key are not counted."""
+    key_list = ", ".join(keys)
+    values = ", ".join(f"{row}.{key}" for key in keys)
+    not_null = " AND ".join(f"{row}.{key} IS NOT NULL" for key in keys)
+    return (
+        f"INSERT INTO {counter} ({key_list}, count) "
+        f"SELECT {values}, 1 WHERE {not_null} "
+        f"ON CONFLICT ({key_list}) DO UPDATE SET count = {counter}.count + 1;"
+    )
+
+
+def decrement_sql(counter, keys, row):
+    # An UPDATE rather than an upsert: when a task type or position is
+    # deleted its counter rows may already be gone.
+    match = " AND ".join(f"{key} = {row}.{key}" for key in keys)
+    return f"UPDATE {counter} SET count = count - 1 WHERE {match};"
+
+
+def create_sqlite_triggers(schema_editor, table):
+    """Keep the counter rows for ``table`` in step with its rows.
+
+    Like the search triggers, these are dropped when Django remakes
+    ``table`` on SQLite, so migrations that do that call this again.
+    """
+    counter, keys = COUNTERS[table]
+    changed = " OR ".join(f"old.{key} IS NOT new.{key}" for key in keys)
+    for suffix in ("ai", "ad", "au"):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_count_{suffix}")
+    schema_editor.execute(
+        f"CREATE TRIGGER {table}_count_ai AFTER INSERT ON {table} BEGIN "
+        f"{increment_sql(counter, keys, 'new')} END"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {table}_count_ad AFTER DELETE ON {table} BEGIN "
+        f"{decrement_sql(counter, keys, 'old')} END"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {table}_count_au AFTER UPDATE OF {', '.join(keys)} "
+        f"ON {table} WHEN {changed} BEGIN "
+        f"{decrement_sql(counter, keys, 'old')} "
+        f"{increment_sql(counter, keys, 'new')} END"
+    )
+
+
+def create_postgres_trigger(schema_editor, table):
+    counter, keys = COUNTERS[table]
+    old = ", ".join(f"OLD.{key}" for key in keys)
+    new = ", ".join(f"NEW.{key}" for key in keys)
+    schema_editor.execute(
+        f"CREATE OR REPLACE FUNCTION {table}_count() RETURNS trigger "
+        f"LANGUAGE plpgsql AS $$ BEGIN "
+        f"IF TG_OP = 'UPDATE' AND ROW({old}) IS NOT DISTINCT FROM ROW({new}) "
+        f"THEN RETURN NULL; END IF; "
+        f"IF TG_OP IN ('UPDATE', 'DELETE') THEN "
+        f"{decrement_sql(counter, keys, 'OLD')} END IF; "
+        f"IF TG_OP IN ('INSERT', 'UPDATE') THEN "
+        f"{increment_sql(counter, keys, 'NEW')} END IF; "
+        f"RETURN NULL; END $$"
+    )
+    schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_count ON {table}")
+    schema_editor.execute(
+        f"CREATE TRIGGER {table}_count "
+        f"AFTER INSERT OR DELETE OR UPDATE OF {', '.join(keys)} ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION {table}_count()"
+    )
+
+
+def fill_counters(schema_editor):
+    for table, (counter, keys) in COUNTERS.items():
+        key_list = ", ".join(keys)
+        not_null = " AND ".join(f"{key} IS NOT NULL" for key in keys)
+        schema_editor.execute(f"DELETE FROM {counter}")
+        schema_editor.execute(
+            f"INSERT INTO {counter} ({key_list}, count) "
+            f"SELECT {key_list}, COUNT(*) FROM {table} "
+            f"WHERE {not_null} GROUP BY {key_list}"
+        )
+
+
+def check_vendor(vendor):
+    # Without triggers the counter tables would silently stay empty.
+    if vendor not in ("sqlite", "postgresql"):
+        raise NotSupportedError(
+            f"The task and worker counter triggers are only written for "
+            f"SQLite and PostgreSQL, not {vendor}."
+        )
+
+
+def create_counter_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    check_vendor(vendor)
+    for table in COUNTERS:
+        if vendor == "sqlite":
+            create_sqlite_triggers(schema_editor, table)
+        else:
+            create_postgres_trigger(schema_editor, table)
+    fill_counters(schema_editor)
+
+
+def drop_counter_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    check_vendor(vendor)
+    for table in COUNTERS:
+        if vendor == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                schema_editor.execute(
+                    f"DROP TRIGGER IF EXISTS {table}_count_{suffix}"
+                )
+        else:
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_count ON {table}")
+            schema_editor.execute(f"DROP FUNCTION IF EXISTS {table}_count()")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0005_task_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorkerCount",
+            fields=[
+                (
+                    "position",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="tasks.position",
+                    ),
+                ),
+                ("count", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="TaskCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("todo", "To Do"),
+                            ("in_progress", "In Progress"),
+                            ("needs_review", "Needs Review"),
+                            ("done", "Done"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "task_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="tasks.tasktype",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("task_type", "status"), name="task_count_type_status"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(create_counter_triggers, drop_counter_triggers),
+    ]
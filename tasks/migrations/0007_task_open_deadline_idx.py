@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0006_counter_tables"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("status", "done"), _negated=True),
+                fields=["deadline", "id"],
+                name="task_open_deadline_idx",
+            ),
+        ),
+    ]
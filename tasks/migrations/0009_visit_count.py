@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0008_task_incomplete_deadline_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VisitCount",
+            fields=[
+                (
+                    "worker",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:55
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+search_indexes = import_module("tasks.migrations.0004_search_indexes")
+
+
+def restore_search_triggers(apps, schema_editor):
+    # Adding or removing a column remakes tasks_tasktype on SQLite, which
+    # drops the full-text search triggers attached to it.
+    if schema_editor.connection.vendor == "sqlite":
+        search_indexes.create_sqlite_triggers(
+            schema_editor,
+            "tasks_tasktype",
+            search_indexes.SEARCH_COLUMNS["tasks_tasktype"],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0010_api_token"),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.AddField(
+            model_name="tasktype",
+            name="version",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
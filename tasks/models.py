@@ -1,3 +1,6 @@
+import hashlib
+import secrets
+
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils.translation import gettext_lazy as _
@@ -28,10 +31,35 @@ class Worker(AbstractUser):
 
 class TaskType(models.Model):
     name = models.CharField(max_length=100)
+    # Part of the cached task card keys, which show the type name. Kept
+    # apart from Task.version so a rename neither rewrites every task of
+    # the type nor fails their open edit forms as stale.
+    version = models.PositiveIntegerField(default=1, editable=False)
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "version"}
+        super().save(*args, **kwargs)
+
+
+class TaskQuerySet(models.QuerySet):
+    def update_versioned(self, pk, version=None, **values):
+        """Update one task with a single query and bump its version.
+
+        With ``version``, the row is only written if nobody has saved the
+        task since that version was read. Returns whether a row changed.
+        """
+        queryset = self.filter(pk=pk)
+        if version is not None:
+            queryset = queryset.filter(version=version)
+        return queryset.update(version=models.F("version") + 1, **values) == 1
+
 
 class Task(models.Model):
 
@@ -58,9 +86,124 @@ class Task(models.Model):
     status = models.CharField(
         max_length=20, choices=Status.choices, default=Status.TODO
     )
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    objects = TaskQuerySet.as_manager()
 
     class Meta:
-        ordering = ("deadline",)
+        ordering = ("deadline", "id")
+        indexes = [
+            models.Index(
+                fields=["status", "deadline", "id"],
+                name="task_status_deadline_idx",
+            ),
+            models.Index(
+                fields=["task_type", "status", "deadline"],
+                name="task_type_status_deadline_idx",
+            ),
+            # Filters on is_completed=False compile to "NOT is_completed",
+            # which SQLite can only match against an index condition.
+            models.Index(
+                fields=["deadline", "id"],
+                condition=models.Q(is_completed=False),
+                name="task_incomplete_deadline_idx",
+            ),
+            models.Index(fields=["deadline", "id"], name="task_deadline_idx"),
+            models.Index(fields=["priority"], name="task_priority_idx"),
+            # Overdue and due-soon tasks: deadline ranges over tasks not done.
+            models.Index(
+                fields=["deadline", "id"],
+                condition=~models.Q(status="done"),
+                name="task_open_deadline_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.status})"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "version"}
+        super().save(*args, **kwargs)
+
+
+# Denormalised totals for the list pages. Database triggers created in
+# migration 0006 keep them in step with every insert, update and delete of
+# tasks and workers, including bulk and raw ones; ``manage.py recount``
+# rebuilds them.
+class TaskCount(models.Model):
+    task_type = models.ForeignKey(
+        TaskType, on_delete=models.CASCADE, related_name="+"
+    )
+    status = models.CharField(max_length=20, choices=Task.Status.choices)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["task_type", "status"], name="task_count_type_status"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.task_type_id}/{self.status}: {self.count}"
+
+
+class WorkerCount(models.Model):
+    position = models.OneToOneField(
+        Position, on_delete=models.CASCADE, primary_key=True, related_name="+"
+    )
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.position_id}: {self.count}"
+
+
+class VisitCount(models.Model):
+    worker = models.OneToOneField(
+        Worker, on_delete=models.CASCADE, primary_key=True, related_name="+"
+    )
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.worker_id}: {self.count}"
+
+
+class ApiToken(models.Model):
+    """A key for the JSON API, sent as ``Authorization: Token <key>``.
+
+    Only a SHA-256 digest of the key is stored; ``issue`` returns the key
+    itself once.
+    """
+
+    worker = models.ForeignKey(
+        Worker, on_delete=models.CASCADE, related_name="api_tokens"
+    )
+    digest = models.CharField(max_length=64, unique=True, editable=False)
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.worker_id}: {self.digest[:8]}"
+
+    @staticmethod
+    def hash(key):
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @classmethod
+    def issue(cls, worker):
+        """Create a token for ``worker`` and return ``(token, key)``."""
+        key = secrets.token_urlsafe(32)
+        return cls.objects.create(worker=worker, digest=cls.hash(key)), key
+
+    @classmethod
+    def authenticate(cls, key):
+        """Return the active worker holding ``key``, or None."""
+        token = (
+            cls.objects.select_related("worker")
+            .filter(digest=cls.hash(key), worker__is_active=True)
+            .first()
+        )
+        return token.worker if token else None
@@ -0,0 +1,228 @@
+import contextvars
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from contextlib import ExitStack
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import Template
+
+CACHE_KEY_PREFIX = "tasks:profile:"
+
+METRICS = ("queries", "sql_ms", "template_ms", "python_ms", "total_ms")
+
+_active_profile = contextvars.ContextVar("tasks_active_profile", default=None)
+
+
+class RequestProfile:
+    """Query count and timings of one request.
+
+    Doubles as a database execute wrapper, so every query run while the
+    request is handled is counted and timed.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.sql = 0.0
+        self.template = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql += time.perf_counter() - start
+            self.queries += 1
+
+    def sample(self, total):
+        return {
+            "queries": self.queries,
+            "sql_ms": self.sql * 1000,
+            "template_ms": self.template * 1000,
+            "python_ms": max(total - self.sql - self.template, 0) * 1000,
+            "total_ms": total * 1000,
+        }
+
+
+def timed_render(render):
+    @wraps(render)
+    def wrapper(self, *args, **kwargs):
+        profile = _active_profile.get()
+        if profile is None:
+            return render(self, *args, **kwargs)
+        start = time.perf_counter()
+        sql_before = profile.sql
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            # Queries run by lazy querysets in the template count as SQL.
+            elapsed = time.perf_counter() - start
+            profile.template += elapsed - (profile.sql - sql_before)
+
+    wrapper.timed = True
+    return wrapper
+
+
+def install_template_timer():
+    if not getattr(Template.render, "timed", False):
+        Template.render = timed_render(Template.render)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = max(int(round(fraction * len(ordered))) - 1, 0)
+    return ordered[index]
+
+
+def summarize(samples):
+    """Return one row of percentiles per view, slowest p95 first."""
+    rows = []
+    for view_name, view_samples in samples.items():
+        if not view_samples:
+            continue
+        row = {"view": view_name, "requests": len(view_samples)}
+        for metric in METRICS:
+            values = [sample[metric] for sample in view_samples]
+            row[metric] = {
+                "p50": percentile(values, 0.5),
+                "p95": percentile(values, 0.95),
+                "max": max(values),
+            }
+        rows.append(row)
+    return sorted(rows, key=lambda row: row["total_ms"]["p95"], reverse=True)
+
+
+def slot_key(slot):
+    return f"{CACHE_KEY_PREFIX}{slot}"
+
+
+def slot_keys():
+    return [slot_key(slot) for slot in range(settings.TASK_PROFILING_MAX_PROCESSES)]
+
+
+class Profiler:
+    """Keep the last ``TASK_PROFILING_WINDOW`` samples of every view.
+
+    Samples live in process memory and are copied to the cache every
+    ``TASK_PROFILING_PUBLISH_INTERVAL`` seconds, so the report endpoint and
+    command can merge what every worker process has seen.
+
+    Each process claims one of ``TASK_PROFILING_MAX_PROCESSES`` slot keys
+    with ``cache.add()`` and publishes into it with a timeout of
+    ``TASK_PROFILING_SNAPSHOT_TIMEOUT``, so the slot of a process that
+    stopped publishing expires and can be claimed by another. Snapshots
+    carry a random owner token, as pids repeat across hosts.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(self._window)
+        self._last_publish = time.monotonic()
+        self._pid = None
+        self._owner = None
+        self._slot = None
+
+    def _window(self):
+        return deque(maxlen=settings.TASK_PROFILING_WINDOW)
+
+    def record(self, view_name, sample):
+        with self._lock:
+            self._samples[view_name].append(sample)
+            due = (
+                time.monotonic() - self._last_publish
+                >= settings.TASK_PROFILING_PUBLISH_INTERVAL
+            )
+        if due:
+            self.publish()
+
+    def snapshot(self):
+        with self._lock:
+            return {name: list(window) for name, window in self._samples.items()}
+
+    def _claim(self, value, timeout):
+        for slot in range(settings.TASK_PROFILING_MAX_PROCESSES):
+            if cache.add(slot_key(slot), value, timeout):
+                return slot
+        return None
+
+    def _owns(self, slot):
+        value = cache.get(slot_key(slot))
+        return value is not None and value["owner"] == self._owner
+
+    def publish(self):
+        timeout = settings.TASK_PROFILING_SNAPSHOT_TIMEOUT
+        now = time.monotonic()
+        with self._lock:
+            if self._pid != os.getpid():
+                # A forked child does not inherit its parent's slot.
+                self._pid = os.getpid()
+                self._owner = uuid.uuid4().hex
+                self._slot = None
+            # A slot refreshed within half its timeout cannot have expired;
+            # an older one may since have been claimed by another process.
+            recent = now - self._last_publish < timeout / 2
+            self._last_publish = now
+            slot = self._slot
+        snapshot = self.snapshot()
+        value = {"owner": self._owner, "samples": snapshot}
+        if slot is not None and (recent or self._owns(slot)):
+            cache.set(slot_key(slot), value, timeout)
+        elif snapshot:
+            self._slot = self._claim(value, timeout)
+
+    def collect(self):
+        """Return the samples of every process that has published lately."""
+        self.publish()
+        merged = defaultdict(list)
+        for value in cache.get_many(slot_keys()).values():
+            for view_name, samples in value["samples"].items():
+                merged[view_name].extend(samples)
+        return merged
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._slot = None
+        cache.delete_many(slot_keys())
+
+
+profiler = Profiler()
+
+
+class ProfilingMiddleware:
+    """Record query count, SQL, template and Python time per URL name.
+
+    Disabled unless ``TASK_PROFILING_ENABLED`` is set. List it first in
+    ``MIDDLEWARE`` so the queries of the other middleware are counted.
+    """
+
+    def __init__(self, get_response):
+        if not settings.TASK_PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        install_template_timer()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = _active_profile.set(profile)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            _active_profile.reset(token)
+
+        match = request.resolver_match
+        if match is not None and match.view_name:
+            profiler.record(
+                match.view_name, profile.sample(time.perf_counter() - start)
+            )
+        return response
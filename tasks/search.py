@@ -0,0 +1,146 @@
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramSimilarity,
+)
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+from django.utils.module_loading import import_string
+
+from tasks.models import Position, Task, TaskType, Worker
+
+SEARCH_FIELDS = {
+    Task: ("name", "description"),
+    Worker: ("username", "first_name", "last_name"),
+    Position: ("position",),
+    TaskType: ("name",),
+}
+
+
+class SimpleSearchBackend:
+    """Case-insensitive substring search that works on any database."""
+
+    def condition(self, model, term):
+        return reduce(
+            or_,
+            (Q(**{f"{name}__icontains": term}) for name in SEARCH_FIELDS[model]),
+        )
+
+    def filter(self, queryset, term):
+        return queryset.filter(self.condition(queryset.model, term))
+
+    def rank(self, queryset, term):
+        return queryset
+
+    def search(self, queryset, term, rank=True):
+        queryset = self.filter(queryset, term)
+        if rank:
+            queryset = self.rank(queryset, term)
+        return queryset
+
+
+class SQLiteSearchBackend(SimpleSearchBackend):
+    """Search the FTS5 trigram tables created by migration 0004.
+
+    The trigram tokenizer matches any substring of three characters or
+    more, so results are the same as ``icontains`` but come from the FTS
+    index instead of a table scan. Shorter terms fall back to ``icontains``.
+    """
+
+    MIN_TERM_LENGTH = 3
+
+    def fts_table(self, queryset):
+        return f"{queryset.model._meta.db_table}_fts"
+
+    def match_expression(self, term):
+        escaped = term.replace('"', '""')
+        return f'"{escaped}"'
+
+    def filter(self, queryset, term):
+        if len(term) < self.MIN_TERM_LENGTH:
+            return super().filter(queryset, term)
+        fts_table = self.fts_table(queryset)
+        return queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH %s",
+                (self.match_expression(term),),
+            )
+        )
+
+    def rank(self, queryset, term):
+        if len(term) < self.MIN_TERM_LENGTH:
+            return queryset
+        fts_table = self.fts_table(queryset)
+        db_table = queryset.model._meta.db_table
+        ordering = queryset.model._meta.ordering or ("pk",)
+        return queryset.annotate(
+            search_rank=RawSQL(
+                f"SELECT -bm25({fts_table}) FROM {fts_table} "
+                f"WHERE {fts_table} MATCH %s AND rowid = {db_table}.id",
+                (self.match_expression(term),),
+            )
+        ).order_by(F("search_rank").desc(nulls_last=True), *ordering)
+
+
+class PostgresSearchBackend(SimpleSearchBackend):
+    """Trigram and full-text search backed by the GIN indexes of 0004.
+
+    ``icontains`` compiles to ``UPPER(column::text) LIKE UPPER(%s)``, which
+    the ``gin_trgm_ops`` expression indexes serve directly. Task
+    descriptions are also matched as full text, and results are ranked by
+    trigram similarity plus ``ts_rank`` where a document vector exists.
+    """
+
+    SEARCH_CONFIG = "english"
+
+    def document(self, model):
+        if model is not Task:
+            return None
+        return SearchVector("name", "description", config=self.SEARCH_CONFIG)
+
+    def query(self, term):
+        return SearchQuery(
+            term, config=self.SEARCH_CONFIG, search_type="websearch"
+        )
+
+    def filter(self, queryset, term):
+        condition = self.condition(queryset.model, term)
+        document = self.document(queryset.model)
+        if document is not None:
+            queryset = queryset.alias(search_document=document)
+            condition |= Q(search_document=self.query(term))
+        return queryset.filter(condition)
+
+    def rank(self, queryset, term):
+        similarities = [
+            TrigramSimilarity(name, term)
+            for name in SEARCH_FIELDS[queryset.model]
+        ]
+        score = (
+            Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+        )
+        document = self.document(queryset.model)
+        if document is not None:
+            score = score + SearchRank(document, self.query(term))
+        ordering = queryset.model._meta.ordering or ("pk",)
+        return queryset.annotate(search_rank=score).order_by(
+            "-search_rank", *ordering
+        )
+
+
+def get_search_backend():
+    return import_string(settings.TASK_SEARCH_BACKEND)()
+
+
+def search(queryset, term, rank=True):
+    """Filter ``queryset`` to rows matching ``term``, best matches first.
+
+    Pass ``rank=False`` to keep the queryset's own ordering.
+    """
+    return get_search_backend().search(queryset, term, rank=rank)
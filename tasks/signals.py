@@ -0,0 +1,34 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from tasks import counters
+from tasks.models import Position, Task, TaskType, Worker
+
+# Sent by tasks.bulk instead of one post_delete per task, with the ``ids``
+# and the ``count`` of deleted tasks.
+tasks_bulk_deleted = Signal()
+
+
+@receiver(post_save, sender=Worker)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=TaskType)
+@receiver(post_save, sender=Position)
+def count_created(sender, created, **kwargs):
+    if created:
+        transaction.on_commit(partial(counters.adjust, sender, 1))
+
+
+@receiver(post_delete, sender=Worker)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=TaskType)
+@receiver(post_delete, sender=Position)
+def count_deleted(sender, **kwargs):
+    transaction.on_commit(partial(counters.adjust, sender, -1))
+
+
+@receiver(tasks_bulk_deleted, sender=Task)
+def count_bulk_deleted(sender, count, **kwargs):
+    transaction.on_commit(partial(counters.adjust, sender, -count))
@@ -0,0 +1,79 @@
+import json
+import os
+from pathlib import Path
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+BUDGET_FILE = Path(__file__).with_name("query_budget.json")
+UPDATE_ENV = "UPDATE_QUERY_BUDGET"
+
+
+class QueryBudgetMixin:
+    """Assert that code runs no more queries than its recorded budget.
+
+    Budgets are kept per label in ``query_budget.json``. After a change
+    that is meant to alter query counts, run the tests with
+    ``UPDATE_QUERY_BUDGET=1`` to rewrite the file and commit the diff.
+    """
+
+    budget_file = BUDGET_FILE
+
+    @classmethod
+    def setUpClass(cls):
+        cls.updating_budget = os.environ.get(UPDATE_ENV) == "1"
+        cls.budget = json.loads(cls.budget_file.read_text())
+        cls.recorded_budgets = {}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.updating_budget and cls.recorded_budgets:
+            cls.budget["queries"] = dict(
+                sorted({**cls.budget["queries"], **cls.recorded_budgets}.items())
+            )
+            cls.budget_file.write_text(json.dumps(cls.budget, indent=2) + "\n")
+        super().tearDownClass()
+
+    def count_queries(self, func, *args, **kwargs):
+        with CaptureQueriesContext(connection) as captured:
+            func(*args, **kwargs)
+        return captured
+
+    def assertQueryBudget(self, label, func, *args, **kwargs):
+        captured = self.count_queries(func, *args, **kwargs)
+        if self.updating_budget:
+            self.recorded_budgets[label] = len(captured)
+            return
+
+        budget = self.budget["queries"].get(label)
+        if budget is None:
+            self.fail(
+                f"No query budget for {label}. "
+                f"Run the tests with {UPDATE_ENV}=1 to record one."
+            )
+        if len(captured) > budget:
+            queries = "\n".join(
+                f"{number}. {query['sql']}"
+                for number, query in enumerate(captured.captured_queries, 1)
+            )
+            self.fail(
+                f"{label} ran {len(captured)} queries, budget is {budget}. "
+                f"If this is intended, run with {UPDATE_ENV}=1.\n{queries}"
+            )
+
+    def assertQueriesDoNotScale(self, calls, grow):
+        """Assert each of ``calls`` runs as many queries after ``grow()``.
+
+        ``calls`` maps labels to callables, all measured before and after
+        the data grows so one failure lists every query count that scaled.
+        """
+        before = {label: len(self.count_queries(f)) for label, f in calls.items()}
+        grow()
+        after = {label: len(self.count_queries(f)) for label, f in calls.items()}
+        scaled = {
+            label: f"{before[label]} -> {after[label]}"
+            for label in calls
+            if after[label] != before[label]
+        }
+        self.assertEqual(scaled, {}, "Query counts grew with the data.")
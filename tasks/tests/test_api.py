@@ -0,0 +1,316 @@
+import json
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import counters
+from tasks.api import CONFLICT_MESSAGE, TaskResource
+from tasks.models import ApiToken, Position, Task, TaskType, Worker
+
+
+class ApiTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="api")
+        cls.task_type = TaskType.objects.create(name="Bug")
+        cls.workers = [
+            Worker.objects.create_user(
+                username=f"worker{i}", first_name="First", last_name="Last"
+            )
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def send(self, method, url, data):
+        return getattr(self.client, method)(
+            url, json.dumps(data), content_type="application/json"
+        )
+
+    def task_payload(self, name, **extra):
+        return {
+            "name": name,
+            "deadline": "2030-01-01T12:00:00+00:00",
+            "task_type": self.task_type.pk,
+            **extra,
+        }
+
+
+class ApiAuthTest(ApiTestCase):
+    def test_anonymous_requests_get_401(self):
+        self.client.logout()
+        response = self.client.get(reverse("tasks:api-tasks-list"))
+        self.assertEqual(response.status_code, 401)
+
+    def test_token_requests_skip_the_csrf_check(self):
+        out = StringIO()
+        call_command("create_api_token", self.user.username, stdout=out)
+        client = Client(enforce_csrf_checks=True)
+        response = client.post(
+            reverse("tasks:api-tasks-list"),
+            json.dumps(self.task_payload("From a script")),
+            content_type="application/json",
+            headers={"authorization": f"Token {out.getvalue().strip()}"},
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_bad_tokens_and_missing_csrf_get_json_errors(self):
+        ApiToken.issue(self.user)
+        client = Client(enforce_csrf_checks=True)
+        response = client.get(
+            reverse("tasks:api-tasks-list"), headers={"authorization": "Token nope"}
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("detail", response.json())
+
+        client.force_login(self.user)
+        response = client.post(
+            reverse("tasks:api-tasks-list"),
+            json.dumps(self.task_payload("No CSRF")),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertIn("CSRF", response.json()["detail"])
+        self.assertEqual(
+            client.get(reverse("tasks:api-tasks-list")).status_code, 200
+        )
+
+
+class TaskApiTest(ApiTestCase):
+    LIST_URL = reverse("tasks:api-tasks-list")
+    BULK_URL = reverse("tasks:api-tasks-bulk")
+
+    def test_create_single_task(self):
+        response = self.send(
+            "post",
+            self.LIST_URL,
+            self.task_payload("One", assignees=[self.workers[0].pk]),
+        )
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        task = Task.objects.get(pk=data["id"])
+        self.assertEqual(data["assignees"], [self.workers[0].pk])
+        self.assertEqual(list(task.assignees.all()), [self.workers[0]])
+
+    def test_create_reports_field_errors(self):
+        response = self.send(
+            "post", self.LIST_URL, {"name": "No deadline", "status": "bogus"}
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertIn("deadline", errors)
+        self.assertIn("status", errors)
+        self.assertIn("task_type", errors)
+
+    def test_list_pages_by_id(self):
+        for i in range(3):
+            Task.objects.create(
+                name=f"Task {i}",
+                deadline=timezone.now(),
+                task_type=self.task_type,
+            )
+        response = self.client.get(self.LIST_URL, {"limit": 2})
+        data = response.json()
+        self.assertEqual(len(data["results"]), 2)
+        response = self.client.get(data["next"])
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    def test_bulk_create_runs_fixed_number_of_queries(self):
+        items = [
+            self.task_payload(
+                f"Bulk {i}", assignees=[w.pk for w in self.workers]
+            )
+            for i in range(50)
+        ]
+        # Session and user, two related id checks, one uniqueness check,
+        # savepoint, task insert, assignee insert, release, assignee read.
+        with self.assertNumQueries(10):
+            response = self.send("post", self.BULK_URL, items)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Task.objects.count(), 50)
+        self.assertEqual(Task.assignees.through.objects.count(), 150)
+
+    def test_bulk_create_is_all_or_nothing(self):
+        items = [
+            self.task_payload("Good"),
+            self.task_payload("Good"),
+            self.task_payload("Bad type", task_type=999),
+        ]
+        response = self.send("post", self.BULK_URL, items)
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertEqual([error["index"] for error in errors], [1, 2])
+        self.assertIn("name", errors[0]["errors"])
+        self.assertIn("task_type", errors[1]["errors"])
+        self.assertFalse(Task.objects.exists())
+
+    def test_bulk_create_adjusts_cached_counters(self):
+        counters.get_counts()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.send(
+                "post",
+                self.BULK_URL,
+                [self.task_payload(f"Counted {i}") for i in range(3)],
+            )
+        self.assertEqual(counters.get_counts()["num_tasks"], 3)
+
+    def test_bulk_update_changes_fields_and_assignees(self):
+        tasks = [
+            Task.objects.create(
+                name=f"Task {i}",
+                deadline=timezone.now(),
+                task_type=self.task_type,
+            )
+            for i in range(2)
+        ]
+        tasks[0].assignees.add(self.workers[0])
+        response = self.send(
+            "patch",
+            self.BULK_URL,
+            [
+                {"id": tasks[0].pk, "status": "done", "assignees": []},
+                {"id": tasks[1].pk, "assignees": [self.workers[1].pk]},
+            ],
+        )
+        self.assertEqual(response.status_code, 200)
+        tasks[0].refresh_from_db()
+        self.assertEqual(tasks[0].status, Task.Status.DONE)
+        self.assertFalse(tasks[0].assignees.exists())
+        self.assertEqual(list(tasks[1].assignees.all()), [self.workers[1]])
+
+    def test_conflicts_do_not_leak_database_errors(self):
+        error = IntegrityError("UNIQUE constraint failed: tasks_task.secret")
+        with mock.patch.object(TaskResource, "create", side_effect=error):
+            response = self.send("post", self.LIST_URL, self.task_payload("One"))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json(), {"detail": CONFLICT_MESSAGE})
+
+    def test_bulk_update_reports_missing_ids(self):
+        response = self.send(
+            "patch", self.BULK_URL, [{"id": 999, "status": "done"}]
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["errors"][0]["index"], 0)
+
+    def test_bulk_update_writes_only_the_fields_each_item_names(self):
+        tasks = [
+            Task.objects.create(
+                name=f"Task {i}",
+                deadline=timezone.now(),
+                task_type=self.task_type,
+            )
+            for i in range(2)
+        ]
+        Task.objects.filter(pk=tasks[0].pk).update(priority="high")
+        response = self.send(
+            "patch",
+            self.BULK_URL,
+            [
+                {"id": tasks[0].pk, "status": "done"},
+                {"id": tasks[1].pk, "priority": "low"},
+            ],
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            list(Task.objects.order_by("pk").values_list("status", "priority")),
+            [("done", "high"), ("todo", "low")],
+        )
+        self.assertEqual(
+            [task.version + 1 for task in tasks],
+            list(Task.objects.order_by("pk").values_list("version", flat=True)),
+        )
+
+    def test_booleans_are_not_ids(self):
+        task = Task.objects.create(
+            name="Task", deadline=timezone.now(), task_type=self.task_type
+        )
+        for item in (
+            {"id": True, "status": "done"},
+            {"id": task.pk, "task_type": True},
+            {"id": task.pk, "assignees": [True]},
+        ):
+            with self.subTest(item=item):
+                response = self.send("patch", self.BULK_URL, [item])
+                self.assertEqual(response.status_code, 400)
+        response = self.send("delete", self.BULK_URL, {"ids": [True]})
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_delete(self):
+        task = Task.objects.create(
+            name="Doomed", deadline=timezone.now(), task_type=self.task_type
+        )
+        response = self.send("delete", self.BULK_URL, {"ids": [task.pk]})
+        self.assertEqual(response.json(), {"deleted": 1})
+        self.assertFalse(Task.objects.exists())
+
+    @override_settings(TASK_API_MAX_BATCH=2)
+    def test_bulk_rejects_oversized_batches(self):
+        items = [self.task_payload(f"Task {i}") for i in range(3)]
+        response = self.send("post", self.BULK_URL, items)
+        self.assertEqual(response.status_code, 400)
+
+    def test_detail_update_and_delete(self):
+        task = Task.objects.create(
+            name="Detail", deadline=timezone.now(), task_type=self.task_type
+        )
+        url = reverse("tasks:api-tasks-detail", args=[task.pk])
+        response = self.send("patch", url, {"priority": "high"})
+        self.assertEqual(response.json()["priority"], "high")
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class WorkerApiTest(ApiTestCase):
+    def test_bulk_create_workers_without_usable_password(self):
+        position = Position.objects.create(position="Developer")
+        response = self.send(
+            "post",
+            reverse("tasks:api-workers-bulk"),
+            [
+                {
+                    "username": "new",
+                    "first_name": "New",
+                    "last_name": "Worker",
+                    "position": position.pk,
+                }
+            ],
+        )
+        self.assertEqual(response.status_code, 201)
+        worker = Worker.objects.get(username="new")
+        self.assertFalse(worker.has_usable_password())
+        self.assertEqual(worker.position, position)
+
+    def test_duplicate_username_is_rejected(self):
+        response = self.send(
+            "post",
+            reverse("tasks:api-workers-list"),
+            {"username": "worker0", "first_name": "A", "last_name": "B"},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("username", response.json()["errors"])
+
+
+class TaskTypeApiTest(ApiTestCase):
+    def test_renaming_a_type_bumps_its_version_not_its_tasks(self):
+        task = Task.objects.create(
+            name="Task", deadline=timezone.now(), task_type=self.task_type
+        )
+        response = self.send(
+            "patch",
+            reverse("tasks:api-task-types-bulk"),
+            [{"id": self.task_type.pk, "name": "Defect"}],
+        )
+        self.assertEqual(response.status_code, 200)
+        self.task_type.refresh_from_db()
+        task.refresh_from_db()
+        self.assertEqual(self.task_type.version, 2)
+        self.assertEqual(task.version, 1)
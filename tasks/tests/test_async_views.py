@@ -0,0 +1,109 @@
+from datetime import date
+from importlib import reload
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import clear_url_caches, reverse
+
+import task_management.urls
+import tasks.urls
+from tasks.models import Position, Task, TaskType, Worker
+from tasks.visits import visit_counter
+
+
+def reload_urls():
+    reload(tasks.urls)
+    reload(task_management.urls)
+    clear_url_caches()
+
+
+@override_settings(TASK_ASYNC_VIEWS=True)
+class AsyncViewsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Registered first so it runs last, once TASK_ASYNC_VIEWS is back
+        # to its default and the sync views are wired in again.
+        cls.addClassCleanup(reload_urls)
+        super().setUpClass()
+        reload_urls()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.position = Position.objects.create(position="Developer")
+        cls.user = get_user_model().objects.create_user(
+            username="test", position=cls.position
+        )
+        Worker.objects.create(username="other")
+        task_type = TaskType.objects.create(name="Bug")
+        for i in range(7):
+            task = Task.objects.create(
+                name=f"Task {i}",
+                description="test",
+                deadline=date.today(),
+                task_type=task_type,
+                status=Task.Status.TODO if i < 6 else Task.Status.DONE,
+            )
+            task.assignees.set([cls.user])
+        cls.task = task
+
+    def setUp(self):
+        cache.clear()
+        visit_counter.clear()
+        self.addCleanup(visit_counter.clear)
+        self.async_client.force_login(self.user)
+
+    def test_routes_use_async_views(self):
+        response = self.client.get(reverse("tasks:index"))
+        self.assertEqual(
+            response.resolver_match.func.__module__, "tasks.async_views"
+        )
+
+    async def test_index_counts(self):
+        response = await self.async_client.get(reverse("tasks:index"))
+        self.assertEqual(response.context["num_tasks"], 7)
+        self.assertEqual(response.context["num_workers"], 2)
+        self.assertEqual(response.context["num_visits"], 1)
+
+    async def test_board(self):
+        response = await self.async_client.get(reverse("tasks:task-list"))
+        self.assertTemplateUsed(response, "tasks/task_list.html")
+        self.assertEqual(response.context["board_total"], 7)
+        self.assertEqual(len(response.context["todo_tasks"]), 6)
+        self.assertContains(response, "Bug")
+
+    async def test_task_detail(self):
+        response = await self.async_client.get(
+            reverse("tasks:task-detail", args=[self.task.pk])
+        )
+        self.assertEqual(response.context["task"], self.task)
+        self.assertContains(response, "Unassign me")
+
+        response = await self.async_client.get(
+            reverse("tasks:task-detail", args=[0])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_status_list_pages(self):
+        url = reverse("tasks:task-status-list", args=[Task.Status.TODO])
+        response = await self.async_client.get(url, {"page": 2})
+        self.assertEqual(len(response.context["task_list"]), 1)
+        self.assertTrue(response.context["is_paginated"])
+
+        response = await self.async_client.get(url, {"page": "last"})
+        self.assertEqual(response.context["page_obj"].number, 2)
+
+        response = await self.async_client.get(url, {"page": 3})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_workers_of_position(self):
+        response = await self.async_client.get(
+            reverse("tasks:position-workers", args=[self.position.pk])
+        )
+        self.assertEqual(list(response.context["worker_list"]), [self.user])
+
+    async def test_redirects_anonymous_users(self):
+        await self.async_client.alogout()
+        response = await self.async_client.get(reverse("tasks:worker-list"))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("/accounts/login/", response.url)
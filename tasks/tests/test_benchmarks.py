@@ -0,0 +1,70 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from tasks.benchmarks import (
+    Volumes,
+    build_cases,
+    compare,
+    run_benchmarks,
+    run_connection_benchmark,
+    seed,
+    uncovered_url_names,
+)
+from tasks.models import Position, Task, TaskType, Worker
+
+VOLUMES = Volumes(
+    positions=3, workers=20, task_types=4, tasks=60, max_assignees=3
+)
+
+
+class SeedTest(TestCase):
+    def test_seeds_requested_volumes_in_bulk(self):
+        with CaptureQueriesContext(connection) as queries:
+            seed(VOLUMES, random.Random(1), chunk_size=40)
+        # Inserts per table and chunk, never per row.
+        self.assertLessEqual(len(queries), 9)
+        self.assertEqual(Position.objects.count(), 3)
+        self.assertEqual(Worker.objects.count(), 20)
+        self.assertEqual(TaskType.objects.count(), 4)
+        self.assertEqual(Task.objects.count(), 60)
+        fanout = Task.assignees.through.objects.count()
+        self.assertTrue(0 < fanout <= 60 * 3)
+
+
+class BenchmarkTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed(VOLUMES, random.Random(1))
+        cls.user = get_user_model().objects.create_superuser(
+            username="benchmark", password="benchmark"
+        )
+
+    def test_cases_cover_every_url(self):
+        self.assertEqual(uncovered_url_names(build_cases()), [])
+
+    def test_every_case_succeeds(self):
+        results = run_benchmarks(self.user, VOLUMES, iterations=1)
+        failed = {
+            label: result["status"]
+            for label, result in results["views"].items()
+            if result["status"] >= 400
+        }
+        self.assertEqual(failed, {})
+        self.assertEqual(results["meta"]["volumes"]["tasks"], 60)
+
+    def test_connection_benchmark_times_both_modes(self):
+        results = run_connection_benchmark(
+            self.user, Task.objects.first(), requests=3
+        )
+        self.assertEqual(set(results), {"fresh", "configured"})
+        self.assertGreater(results["fresh"]["p95_ms"], 0)
+
+    def test_compare_flags_extra_queries_and_slowdowns(self):
+        baseline = {"views": {"a": {"queries": 3, "p95_ms": 10}}}
+        results = {"views": {"a": {"queries": 4, "p95_ms": 20}}}
+        self.assertEqual(len(compare(results, baseline, tolerance=1.5)), 2)
+        self.assertEqual(compare(baseline, baseline, tolerance=1.5), [])
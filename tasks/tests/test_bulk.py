@@ -0,0 +1,175 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import bulk, counters
+from tasks.models import Task, TaskType, Worker
+
+
+class TaskBulkActionViewTest(TestCase):
+    url = reverse("tasks:task-bulk")
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="test")
+        cls.workers = Worker.objects.bulk_create(
+            Worker(username=f"worker{i}") for i in range(3)
+        )
+        task_type = TaskType.objects.create(name="Bug")
+        cls.tasks = Task.objects.bulk_create(
+            Task(
+                name=f"Task {i}",
+                deadline=timezone.now() + timedelta(days=i),
+                task_type=task_type,
+            )
+            for i in range(50)
+        )
+        cls.ids = [task.pk for task in cls.tasks]
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def post(self, **data):
+        return self.client.post(self.url, {"tasks": self.ids, **data})
+
+    def writes(self, queries):
+        return [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith(("UPDATE", "INSERT", "DELETE"))
+        ]
+
+    def test_status_change_is_one_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(operation="status", status="done", next="/")
+        self.assertRedirects(response, "/", fetch_redirect_response=False)
+        self.assertEqual(len(self.writes(queries)), 1)
+        self.assertEqual(Task.objects.filter(status="done").count(), 50)
+        self.assertFalse(Task.objects.filter(version=1).exists())
+
+    def test_priority_change(self):
+        self.post(operation="priority", priority="high")
+        self.assertEqual(Task.objects.filter(priority="high").count(), 50)
+
+    def test_reassign_writes_the_difference_once(self):
+        self.tasks[0].assignees.add(self.workers[0], self.workers[1])
+        selected = [self.workers[1].pk, self.workers[2].pk]
+        with CaptureQueriesContext(connection) as queries:
+            self.post(operation="reassign", assignees=selected)
+        self.assertEqual(len(self.writes(queries)), 2)
+        for task in self.tasks:
+            self.assertEqual(
+                set(task.assignees.values_list("pk", flat=True)), set(selected)
+            )
+
+    def test_delete_adjusts_cached_counters(self):
+        self.tasks[0].assignees.add(self.workers[0])
+        counters.get_counts()
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(
+                    self.url, {"tasks": self.ids[:10], "operation": "delete"}
+                )
+        self.assertEqual(len(self.writes(queries)), 2)
+        self.assertEqual(Task.objects.count(), 40)
+        self.assertEqual(counters.get_counts()["num_tasks"], 40)
+
+    def test_raw_delete_clears_the_assignments(self):
+        self.tasks[0].assignees.add(*self.workers[:2])
+        self.tasks[1].assignees.add(self.workers[0])
+        self.assertEqual(bulk.raw_delete(Task, [self.tasks[0].pk]), 1)
+        self.assertEqual(
+            list(Task.assignees.through.objects.values_list("task_id", flat=True)),
+            [self.tasks[1].pk],
+        )
+        self.assertTrue(Worker.objects.filter(pk=self.workers[0].pk).exists())
+
+    def test_raw_delete_refuses_models_referenced_by_foreign_keys(self):
+        # Tasks point at their type, and raw_delete() cannot honour the
+        # on_delete rule of that key.
+        with self.assertRaises(TypeError):
+            bulk.raw_delete(TaskType, [self.tasks[0].task_type_id])
+        self.assertEqual(Task.objects.count(), 50)
+
+    def test_missing_value_is_rejected(self):
+        response = self.post(operation="status")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Task.objects.filter(version=2).exists())
+
+    def test_reassigning_to_nobody_is_rejected(self):
+        self.tasks[0].assignees.add(self.workers[0])
+        response = self.post(operation="reassign")
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(self.tasks[0].assignees.exists())
+
+    def test_external_next_url_is_ignored(self):
+        response = self.post(
+            operation="priority", priority="low", next="https://evil.example"
+        )
+        self.assertEqual(response.url, reverse("tasks:task-list"))
+
+    def test_board_and_status_list_render_checkboxes(self):
+        for url in (
+            reverse("tasks:task-list"),
+            reverse("tasks:task-status-list", args=["todo"]),
+        ):
+            response = self.client.get(url)
+            self.assertContains(response, 'id="task-bulk-form"')
+            self.assertContains(
+                response, f'value="{self.ids[0]}" form="task-bulk-form"'
+            )
+
+
+class TaskAdminBulkActionTest(TestCase):
+    url = reverse("admin:tasks_task_changelist")
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(username="admin")
+        cls.worker = Worker.objects.create(username="worker")
+        task_type = TaskType.objects.create(name="Bug")
+        cls.tasks = Task.objects.bulk_create(
+            Task(name=f"Task {i}", deadline=timezone.now(), task_type=task_type)
+            for i in range(5)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def act(self, action, **data):
+        return self.client.post(
+            self.url,
+            {
+                "action": action,
+                "_selected_action": [task.pk for task in self.tasks],
+                **data,
+            },
+        )
+
+    def test_set_status(self):
+        self.act("set_status", status="needs_review")
+        self.assertEqual(Task.objects.filter(status="needs_review").count(), 5)
+
+    def test_set_priority_needs_a_value(self):
+        self.act("set_priority")
+        self.assertFalse(Task.objects.filter(version=2).exists())
+
+    def test_reassign_by_username(self):
+        self.act("reassign", assignees="worker")
+        self.assertEqual(self.worker.tasks.count(), 5)
+
+    def test_reassign_needs_usernames(self):
+        self.tasks[0].assignees.add(self.worker)
+        self.act("reassign", assignees=" , ")
+        self.assertEqual(self.worker.tasks.count(), 1)
+
+    def test_confirmed_delete(self):
+        self.act("delete_selected", post="yes")
+        self.assertFalse(Task.objects.exists())
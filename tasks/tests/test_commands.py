@@ -0,0 +1,93 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.template import engines
+from django.test import TestCase, override_settings
+
+from tasks.management.commands.explain_queries import Command as ExplainCommand
+from tasks.management.commands.explain_queries import full_index_scans
+
+
+class ExplainQueriesCommandTest(TestCase):
+    def test_reports_every_view_queryset(self):
+        out = StringIO()
+        call_command("explain_queries", stdout=out)
+        output = out.getvalue()
+        self.assertIn("tasks:task-list", output)
+        self.assertIn("tasks:task-status-list", output)
+        self.assertIn("admin:tasks_task_changelist?deadline", output)
+
+    def test_status_list_uses_composite_index(self):
+        out = StringIO()
+        call_command("explain_queries", "--show-plans", stdout=out)
+        self.assertIn("task_status_deadline_idx", out.getvalue())
+
+    def test_filtered_checks_are_skipped_without_fixtures(self):
+        out = StringIO()
+        call_command("explain_queries", stdout=out)
+        self.assertIn(
+            "tasks:task-type-tasks: skipped, no task type or position",
+            out.getvalue(),
+        )
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite plan format")
+    def test_find_scans_flags_full_index_scans(self):
+        command = ExplainCommand()
+        plan = (
+            "5 0 0 SCAN tasks_task\n"
+            "9 0 0 SCAN tasks_worker USING INDEX sqlite_autoindex_1\n"
+            "10 0 0 SEARCH tasks_position USING INDEX pos_idx (id=?)\n"
+            "12 0 0 SCAN (subquery-3)"
+        )
+        self.assertEqual(command.find_scans(plan), ["tasks_task", "tasks_worker"])
+        self.assertEqual(
+            command.find_scans(plan, index_order=True), ["tasks_task"]
+        )
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite plan format")
+    def test_find_scans_allows_partial_indexes(self):
+        plan = "5 0 0 SCAN tasks_task USING INDEX task_open_deadline_idx"
+        self.assertEqual(ExplainCommand().find_scans(plan), [])
+
+    def test_postgres_index_scans_without_a_condition(self):
+        plan = (
+            "Limit  (cost=0.28..1.05 rows=5 width=8)\n"
+            "  ->  Index Scan using task_deadline_idx on tasks_task  (cost=1)\n"
+            "  ->  Index Scan using task_status_deadline_idx on tasks_task\n"
+            "        Index Cond: ((status)::text = 'todo'::text)"
+        )
+        self.assertEqual(
+            full_index_scans(plan), [("task_deadline_idx", "tasks_task")]
+        )
+
+
+class WarmTemplatesCommandTest(TestCase):
+    @override_settings(
+        TEMPLATES=[
+            {
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+                "DIRS": [settings.BASE_DIR / "templates"],
+                "OPTIONS": {
+                    "loaders": [
+                        (
+                            "django.template.loaders.cached.Loader",
+                            ["django.template.loaders.filesystem.Loader"],
+                        )
+                    ],
+                },
+            }
+        ]
+    )
+    def test_fills_the_cached_loader(self):
+        out = StringIO()
+        call_command("warm_templates", stdout=out)
+        self.assertIn("Parsed", out.getvalue())
+
+        loader = engines["django"].engine.template_loaders[0]
+        self.assertIn("tasks/task_list.html", loader.get_template_cache)
+        self.assertIn(
+            "includes/task_card_board.html", loader.get_template_cache
+        )
@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tasks import deadlines
+from tasks.models import Task, TaskType
+
+
+class DeadlineBucketTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.at = deadlines.current_minute()
+        task_type = TaskType.objects.create(name="Bug")
+        cls.tasks = {}
+        for name, hours, status in (
+            ("late", -2, Task.Status.IN_PROGRESS),
+            ("late done", -2, Task.Status.DONE),
+            ("soon", 3, Task.Status.TODO),
+            ("soon review", 23, Task.Status.NEEDS_REVIEW),
+            ("later", 30, Task.Status.TODO),
+        ):
+            cls.tasks[name] = Task.objects.create(
+                name=name,
+                deadline=cls.at + timedelta(hours=hours),
+                status=status,
+                task_type=task_type,
+            )
+        cls.user = get_user_model().objects.create_user(username="test")
+
+    def setUp(self):
+        cache.clear()
+
+    def names(self, queryset):
+        return {task.name for task in queryset}
+
+    def test_buckets_skip_done_tasks(self):
+        self.assertEqual(self.names(deadlines.overdue(self.at)), {"late"})
+        self.assertEqual(
+            self.names(deadlines.due_soon(self.at)), {"soon", "soon review"}
+        )
+
+    def test_counts_are_cached_for_the_minute(self):
+        self.assertEqual(
+            deadlines.get_counts(self.at), {"overdue": 1, "due_soon": 2}
+        )
+        self.tasks["late"].delete()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(deadlines.get_counts(self.at)["overdue"], 1)
+        self.assertFalse(
+            [query for query in queries if "tasks_task" in query["sql"]]
+        )
+        next_minute = self.at + timedelta(minutes=1)
+        self.assertEqual(deadlines.get_counts(next_minute)["overdue"], 0)
+
+    def test_overdue_query_uses_the_open_deadline_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("EXPLAIN output is SQLite-specific")
+        plan = deadlines.overdue(self.at).explain()
+        self.assertIn("task_open_deadline_idx", plan)
+
+    def test_views_list_each_bucket(self):
+        self.client.force_login(self.user)
+        for url_name, expected in (
+            ("tasks:task-overdue", {"late"}),
+            ("tasks:task-due-soon", {"soon", "soon review"}),
+        ):
+            response = self.client.get(reverse(url_name))
+            self.assertEqual(self.names(response.context["task_list"]), expected)
+            self.assertContains(response, "Overdue (1)")
+            self.assertContains(response, "Due Soon (2)")
+
+    def test_index_shows_bucket_counts(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("tasks:index"))
+        self.assertEqual(response.context["deadlines"], {"overdue": 1, "due_soon": 2})
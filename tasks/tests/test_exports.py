@@ -0,0 +1,91 @@
+import csv
+import json
+from io import StringIO
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.exports import aexport_lines, export_lines
+from tasks.models import Position, Task, TaskType, Worker
+
+
+class ExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="exporter")
+        position = Position.objects.create(position="Developer")
+        task_type = TaskType.objects.create(name="Bug")
+        cls.workers = [
+            Worker.objects.create_user(
+                username=f"worker{i}",
+                first_name="First",
+                last_name="Last",
+                position=position,
+            )
+            for i in range(2)
+        ]
+        for i in range(5):
+            task = Task.objects.create(
+                name=f"Task {i}",
+                deadline=timezone.now(),
+                task_type=task_type,
+            )
+            task.assignees.set(cls.workers)
+
+    def test_csv_export_includes_assignees_and_type(self):
+        rows = list(csv.DictReader(export_lines("tasks", "csv")))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["task_type"], "Bug")
+        self.assertEqual(rows[0]["assignees"], "worker0;worker1")
+
+    def test_ndjson_export_has_one_object_per_line(self):
+        lines = list(export_lines("workers", "ndjson"))
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[1])["position"], "Developer")
+
+    def test_queries_grow_with_chunks_not_rows(self):
+        # One streamed query for the tasks and one assignee query per chunk.
+        with self.assertNumQueries(4):
+            list(export_lines("tasks", "csv", chunk_size=2))
+
+    def test_view_streams_attachment(self):
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse("tasks:export", args=["tasks"]), {"format": "ndjson"}
+        )
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn("tasks.ndjson", response["Content-Disposition"])
+        content = b"".join(response.streaming_content).decode()
+        self.assertEqual(len(content.splitlines()), 5)
+
+    async def test_async_export_matches_the_sync_one(self):
+        lines = [line async for line in aexport_lines("tasks", "csv", 2)]
+        self.assertEqual(len(lines), 3)
+        expected = await sync_to_async(lambda: "".join(export_lines("tasks", "csv")))()
+        self.assertEqual("".join(lines), expected)
+
+    async def test_view_streams_asynchronously_under_asgi(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            reverse("tasks:export", args=["workers"]), {"format": "ndjson"}
+        )
+        self.assertTrue(response.is_async)
+        content = "".join(
+            [chunk.decode() async for chunk in response.streaming_content]
+        )
+        self.assertEqual(len(content.splitlines()), 3)
+
+    def test_view_rejects_unknown_resource(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("tasks:export", args=["secrets"]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_command_writes_to_stdout(self):
+        out = StringIO()
+        call_command("export_tasks", "workers", stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 4)
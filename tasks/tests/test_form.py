@@ -8,9 +8,9 @@ from tasks.forms import (
     WorkerUpdateForm,
     TaskForm,
     AssignUserForm,
+    WorkerAutocompleteWidget,
 )
 from tasks.models import Position, Worker, Task, TaskType
-from django.forms.widgets import CheckboxSelectMultiple
 
 
 class WorkerCreationFormTests(TestCase):
@@ -121,12 +121,20 @@ class TaskFormTest(TestCase):
     def test_form_valid_with_valid_assignees(self):
         form = TaskForm(data=self.form_data)
         self.assertTrue(form.is_valid())
-        self.assertIn(self.worker, form.cleaned_data["assignees"])
+        self.assertEqual(form.cleaned_data["assignees"], {self.worker.pk})
 
     def test_assignees_widget(self):
         form = TaskForm()
         field = form.fields["assignees"]
-        self.assertIsInstance(field.widget, CheckboxSelectMultiple)
+        self.assertIsInstance(field.widget, WorkerAutocompleteWidget)
+
+    def test_assignees_widget_renders_only_selected_workers(self):
+        other = Worker.objects.create(username="otherworker")
+        form = TaskForm(initial={"assignees": [self.worker]})
+        html = str(form["assignees"])
+        self.assertIn(f'value="{self.worker.id}" selected', html)
+        self.assertNotIn(f'value="{other.id}"', html)
+        self.assertIn('data-autocomplete-url="/workers/lookup/"', html)
 
 
 class AssignUserFormTest(TestCase):
@@ -149,9 +157,14 @@ class AssignUserFormTest(TestCase):
     def test_form_valid_with_existing_user(self):
         form = AssignUserForm(data={"users": [self.worker.id]})
         self.assertTrue(form.is_valid())
-        self.assertIn(self.worker, form.cleaned_data["users"])
+        self.assertEqual(form.cleaned_data["users"], {self.worker.pk})
 
-    def test_users_field_has_checkbox_widget(self):
+    def test_users_field_has_autocomplete_widget(self):
         form = AssignUserForm()
         field = form.fields["users"]
-        self.assertIsInstance(field.widget, CheckboxSelectMultiple)
+        self.assertIsInstance(field.widget, WorkerAutocompleteWidget)
+
+    def test_unknown_user_id_is_rejected(self):
+        form = AssignUserForm(data={"users": [self.worker.id, 99999]})
+        self.assertFalse(form.is_valid())
+        self.assertIn("users", form.errors)
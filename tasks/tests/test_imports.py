@@ -0,0 +1,193 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tasks.exports import export_lines
+from tasks.imports import LookupCache, TaskImporter, WorkerImporter
+from tasks.models import Position, Task, TaskType, Worker
+
+TASKS_CSV = (
+    "name,description,deadline,priority,status,task_type,assignees\n"
+    "First,,2030-01-01T12:00:00,high,todo,Bug,alice;bob\n"
+    "Second,,2030-01-02T12:00:00,low,done,Feature,\n"
+    "Broken,,not a date,low,todo,Bug,\n"
+    "Orphan,,2030-01-03T12:00:00,low,todo,Bug,nobody\n"
+)
+
+
+class TaskImporterTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for username in ("alice", "bob"):
+            Worker.objects.create_user(
+                username=username, first_name="A", last_name="B"
+            )
+        TaskType.objects.create(name="Bug")
+
+    def test_imports_valid_rows_and_reports_the_rest(self):
+        result = TaskImporter().run(StringIO(TASKS_CSV), "csv")
+        self.assertEqual(result.rows, 4)
+        self.assertEqual(result.created, 2)
+        self.assertEqual([number for number, _ in result.errors], [3, 4])
+        self.assertIn("nobody", result.errors[1][1])
+
+        first = Task.objects.get(name="First")
+        self.assertEqual(
+            sorted(first.assignees.values_list("username", flat=True)),
+            ["alice", "bob"],
+        )
+        self.assertEqual(
+            Task.objects.get(name="Second").task_type.name, "Feature"
+        )
+
+    def test_query_count_does_not_grow_with_rows(self):
+        # Type and worker lookups, existing-name check, then inside a
+        # savepoint the new type's insert and read-back, and one insert
+        # each for tasks and assignees.
+        with self.assertNumQueries(9):
+            TaskImporter().run(StringIO(TASKS_CSV), "csv")
+
+    def test_new_task_types_are_only_kept_with_their_tasks(self):
+        rows = (
+            "name,deadline,task_type\n"
+            "Undated,,Orphaned type\n"
+            "Dated,2030-01-01T12:00:00,Feature\n"
+        )
+        through = Task.assignees.through.objects
+        with mock.patch.object(
+            through, "bulk_create", side_effect=IntegrityError
+        ), self.assertRaises(IntegrityError):
+            TaskImporter().run(StringIO(rows), "csv")
+        self.assertEqual(
+            list(TaskType.objects.values_list("name", flat=True)), ["Bug"]
+        )
+
+        TaskImporter().run(StringIO(rows), "csv")
+        self.assertEqual(
+            sorted(TaskType.objects.values_list("name", flat=True)),
+            ["Bug", "Feature"],
+        )
+
+    def test_existing_and_repeated_names_are_rejected(self):
+        TaskImporter().run(StringIO(TASKS_CSV), "csv")
+        result = TaskImporter().run(StringIO(TASKS_CSV), "csv")
+        self.assertEqual(result.created, 0)
+
+    def test_round_trips_an_ndjson_export(self):
+        TaskImporter().run(StringIO(TASKS_CSV), "csv")
+        exported = "".join(export_lines("tasks", "ndjson"))
+        Task.objects.all().delete()
+        result = TaskImporter().run(StringIO(exported), "ndjson")
+        self.assertEqual(result.created, 2)
+        self.assertEqual(result.errors, [])
+
+
+class WorkerImporterTest(TestCase):
+    def test_hashes_passwords_in_a_process_pool(self):
+        rows = StringIO(
+            "username,first_name,last_name,position,password\n"
+            "carol,Carol,C,Developer,s3cret-pass\n"
+            "dave,Dave,D,Developer,\n"
+        )
+        result = WorkerImporter(hash_workers=2).run(rows, "csv")
+        self.assertEqual(result.created, 2)
+        carol = Worker.objects.get(username="carol")
+        self.assertTrue(carol.check_password("s3cret-pass"))
+        self.assertEqual(carol.position, Position.objects.get())
+        dave = Worker.objects.get(username="dave")
+        self.assertFalse(dave.has_usable_password())
+
+
+class LookupCacheTest(TestCase):
+    def test_names_inserted_by_another_import_are_read_back(self):
+        positions = LookupCache(Position, "position", create=True)
+        positions.prime(["QA"])
+        # Another import adds the position after this one looked it up.
+        other = Position.objects.create(position="QA")
+        positions.save(["QA", "Ops"])
+        self.assertEqual(positions.get("QA"), other.pk)
+        self.assertEqual(
+            positions.get("Ops"), Position.objects.get(position="Ops").pk
+        )
+
+
+class ImportCommandTest(TestCase):
+    def test_reports_progress_and_errors(self):
+        TaskType.objects.create(name="Bug")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / "types.csv"
+        path.write_text("name\nBug\nFeature\n")
+
+        out, err = StringIO(), StringIO()
+        call_command("import_tasks", "task-types", path, stdout=out, stderr=err)
+        self.assertIn("rows/s", out.getvalue())
+        self.assertIn("Created 1 of 2 rows", out.getvalue())
+        self.assertIn("Row 1:", err.getvalue())
+
+
+class ImportViewTest(TestCase):
+    URL = reverse("tasks:import")
+
+    def test_requires_staff(self):
+        user = get_user_model().objects.create_user(username="plain")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(self.URL).status_code, 403)
+
+    def test_upload_imports_positions(self):
+        user = get_user_model().objects.create_user(
+            username="staff", is_staff=True
+        )
+        self.client.force_login(user)
+        upload = SimpleUploadedFile("positions.csv", b"position\nQA\nOps\n")
+        response = self.client.post(
+            self.URL, {"resource": "positions", "file": upload}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["result"].created, 2)
+        self.assertEqual(Position.objects.count(), 2)
+
+    def test_upload_hashes_passwords_without_a_process_pool(self):
+        user = get_user_model().objects.create_user(
+            username="staff", is_staff=True
+        )
+        self.client.force_login(user)
+        upload = SimpleUploadedFile(
+            "workers.csv",
+            b"username,first_name,last_name,password\ncarol,Carol,C,s3cret-pass\n",
+        )
+        with mock.patch("tasks.imports.ProcessPoolExecutor") as pool:
+            response = self.client.post(
+                self.URL, {"resource": "workers", "file": upload}
+            )
+        pool.assert_not_called()
+        self.assertEqual(response.context["result"].created, 1)
+        self.assertTrue(
+            Worker.objects.get(username="carol").check_password("s3cret-pass")
+        )
+
+    @override_settings(TASK_IMPORT_UPLOAD_MAX_PASSWORDS=1)
+    def test_upload_refuses_more_passwords_than_fit_in_a_request(self):
+        user = get_user_model().objects.create_user(
+            username="staff", is_staff=True
+        )
+        self.client.force_login(user)
+        upload = SimpleUploadedFile(
+            "workers.csv",
+            b"username,first_name,last_name,password\n"
+            b"carol,Carol,C,s3cret-pass\n"
+            b"dave,Dave,D,s3cret-pass\n",
+        )
+        response = self.client.post(
+            self.URL, {"resource": "workers", "file": upload}
+        )
+        self.assertContains(response, "at most 1 passwords")
+        self.assertFalse(Worker.objects.filter(username="carol").exists())
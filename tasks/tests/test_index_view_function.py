@@ -1,15 +1,27 @@
 from datetime import date
+from io import StringIO
+from unittest import mock
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from tasks.models import Task, TaskType, Worker
+from tasks import counters
+from tasks.models import Position, Task, TaskType, VisitCount, Worker
+from tasks.visits import visit_counter
 
 
 class TestIndex(TestCase):
     INDEX_URL = reverse("tasks:index")
 
     def setUp(self):
+        cache.clear()
+        visit_counter.clear()
+        self.addCleanup(visit_counter.clear)
         self.user = get_user_model().objects.create_user(
             username="testuser", password="testpass123"
         )
@@ -46,16 +58,134 @@ class TestIndex(TestCase):
         response = self.client.get(self.INDEX_URL)
         self.assertEqual(response.context["num_workers"], 11)
 
-    def test_index_initial_session_visit_count_is_one(self):
+    def test_index_initial_visit_count_is_one(self):
         self.client.force_login(self.user)
         response = self.client.get(self.INDEX_URL)
         self.assertEqual(response.context["num_visits"], 1)
-        self.assertEqual(self.client.session["num_visits"], 1)
 
-    def test_index_session_visit_counter_increments_on_each_visit(self):
+    def test_index_visit_counter_increments_on_each_visit(self):
         self.client.force_login(self.user)
         response = self.client.get(self.INDEX_URL)
         self.assertEqual(response.context["num_visits"], 1)
         response = self.client.get(self.INDEX_URL)
         self.assertEqual(response.context["num_visits"], 2)
-        self.assertEqual(self.client.session["num_visits"], 2)
+
+    def test_index_does_not_write_the_session(self):
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.INDEX_URL)
+        self.assertNotIn("num_visits", self.client.session)
+        self.assertNotIn("Set-Cookie", response.headers)
+        self.assertFalse(
+            [
+                query
+                for query in queries
+                if query["sql"].startswith("UPDATE")
+                and "django_session" in query["sql"]
+            ]
+        )
+
+    @override_settings(TASK_VISITS_FLUSH_INTERVAL=0)
+    def test_visits_are_flushed_to_the_database(self):
+        self.client.force_login(self.user)
+        self.client.get(self.INDEX_URL)
+        self.client.get(self.INDEX_URL)
+        visit_counter.clear()
+        cache.clear()
+        response = self.client.get(self.INDEX_URL)
+        self.assertEqual(response.context["num_visits"], 3)
+        self.assertEqual(VisitCount.objects.get(worker=self.user).count, 3)
+
+    def test_pending_visits_survive_until_flushed(self):
+        visit_counter.record(self.user.pk)
+        visit_counter.record(self.user.pk)
+        self.assertEqual(visit_counter.get(self.user.pk), 2)
+        visit_counter.flush()
+        visit_counter.record(self.user.pk)
+        self.assertEqual(VisitCount.objects.get(worker=self.user).count, 2)
+        self.assertEqual(visit_counter.get(self.user.pk), 3)
+
+    def test_flush_skips_deleted_users(self):
+        other = get_user_model().objects.create_user(username="gone")
+        visit_counter.record(other.pk)
+        visit_counter.record(self.user.pk)
+        other.delete()
+        visit_counter.flush()
+        self.assertEqual(
+            list(VisitCount.objects.values_list("worker_id", "count")),
+            [(self.user.pk, 1)],
+        )
+
+    @override_settings(TASK_VISITS_FLUSH_INTERVAL=0)
+    def test_failed_flush_keeps_the_visits_and_the_page_up(self):
+        self.client.force_login(self.user)
+        with mock.patch.object(
+            VisitCount.objects, "bulk_create", side_effect=DatabaseError
+        ), self.assertLogs("tasks.visits", "ERROR"):
+            response = self.client.get(self.INDEX_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(VisitCount.objects.exists())
+
+        self.client.get(self.INDEX_URL)
+        self.assertEqual(VisitCount.objects.get(worker=self.user).count, 2)
+
+    def test_flush_updates_users_in_id_order(self):
+        other = get_user_model().objects.create_user(username="other")
+        visit_counter.record(other.pk)
+        visit_counter.record(self.user.pk)
+        with CaptureQueriesContext(connection) as queries:
+            visit_counter.flush()
+        updated = [
+            query["sql"].rsplit("=", 1)[-1].strip()
+            for query in queries
+            if query["sql"].startswith('UPDATE "tasks_visitcount"')
+        ]
+        self.assertEqual(updated, [str(self.user.pk), str(other.pk)])
+
+    def test_warm_counters_run_no_count_queries(self):
+        self.client.force_login(self.user)
+        self.client.get(self.INDEX_URL)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.INDEX_URL)
+        self.assertFalse(
+            [query for query in queries if "COUNT(" in query["sql"]]
+        )
+
+    def test_counters_follow_creates_and_deletes(self):
+        self.client.force_login(self.user)
+        self.client.get(self.INDEX_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            Position.objects.create(position="Designer")
+            position = Position.objects.create(position="Tester")
+        with self.captureOnCommitCallbacks(execute=True):
+            position.delete()
+        response = self.client.get(self.INDEX_URL)
+        self.assertEqual(response.context["num_positions"], 1)
+
+    def test_reconcile_counters_fixes_drift(self):
+        self.client.force_login(self.user)
+        self.client.get(self.INDEX_URL)
+        TaskType.objects.create(name="Created without on_commit")
+        call_command("reconcile_counters", stdout=StringIO())
+        response = self.client.get(self.INDEX_URL)
+        self.assertEqual(response.context["num_task_types"], 1)
+
+
+class SharedCounterCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_counters_are_not_kept_per_process(self):
+        self.assertNotIsInstance(caches["default"], LocMemCache)
+
+    def test_adjustments_reach_other_processes(self):
+        counters.get_counts()
+        # A separate client for the same backend, as another worker has.
+        other_worker = caches.create_connection("default")
+        with self.captureOnCommitCallbacks(execute=True):
+            Position.objects.create(position="Designer")
+        self.assertEqual(other_worker.get(counters.cache_key("num_positions")), 1)
+
+        TaskType.objects.create(name="Created without on_commit")
+        call_command("reconcile_counters", stdout=StringIO())
+        self.assertEqual(other_worker.get(counters.cache_key("num_task_types")), 1)
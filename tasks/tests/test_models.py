@@ -171,3 +171,19 @@ class TaskModelTest(TestCase):
         self.assertFalse(self.task.is_completed)
         self.assertEqual(self.task.priority, Task.Priority.LOW)
         self.assertEqual(self.task.status, Task.Status.TODO)
+
+    def test_version_bumps_on_save(self):
+        self.assertEqual(self.task.version, 1)
+        self.task.save()
+        self.task.save(update_fields=["status"])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.version, 3)
+
+    def test_task_type_save_bumps_its_own_version_only(self):
+        self.task_type.name = "Renamed"
+        self.task_type.save()
+        self.task_type.save(update_fields=["name"])
+        self.task_type.refresh_from_db()
+        self.task.refresh_from_db()
+        self.assertEqual(self.task_type.version, 3)
+        self.assertEqual(self.task.version, 1)
@@ -0,0 +1,126 @@
+import json
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tasks.profiling import Profiler, percentile, profiler, slot_key, summarize
+
+
+@override_settings(TASK_PROFILING_ENABLED=True)
+class ProfilingMiddlewareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = get_user_model().objects.create_user(
+            username="staff", is_staff=True
+        )
+
+    def setUp(self):
+        profiler.clear()
+        self.addCleanup(profiler.clear)
+        self.client.force_login(self.staff)
+
+    def test_records_samples_per_url_name(self):
+        self.client.get(reverse("tasks:task-list"))
+        self.client.get(reverse("tasks:task-list"))
+        samples = profiler.snapshot()["tasks:task-list"]
+        self.assertEqual(len(samples), 2)
+        self.assertGreater(samples[0]["queries"], 0)
+        self.assertGreater(samples[0]["template_ms"], 0)
+        self.assertGreaterEqual(
+            samples[0]["total_ms"],
+            samples[0]["sql_ms"] + samples[0]["template_ms"],
+        )
+
+    @override_settings(TASK_PROFILING_WINDOW=3)
+    def test_window_keeps_latest_samples(self):
+        profiler.clear()
+        for _ in range(5):
+            self.client.get(reverse("tasks:position-list"))
+        self.assertEqual(len(profiler.snapshot()["tasks:position-list"]), 3)
+
+    def test_report_endpoint_is_staff_only(self):
+        self.client.get(reverse("tasks:worker-list"))
+        response = self.client.get(reverse("tasks:profiling-report"))
+        views = [row["view"] for row in response.json()["views"]]
+        self.assertIn("tasks:worker-list", views)
+
+        self.client.force_login(
+            get_user_model().objects.create_user(username="plain")
+        )
+        response = self.client.get(reverse("tasks:profiling-report"))
+        self.assertEqual(response.status_code, 403)
+
+    def test_command_prints_report(self):
+        self.client.get(reverse("tasks:task-list"))
+        out = StringIO()
+        call_command("profile_report", "--json", stdout=out)
+        rows = json.loads(out.getvalue())
+        self.assertEqual(rows[0]["view"], "tasks:task-list")
+
+
+class ProfilingDisabledTest(TestCase):
+    def test_nothing_recorded_by_default(self):
+        profiler.clear()
+        self.client.get(reverse("tasks:login"))
+        self.assertEqual(profiler.snapshot(), {})
+
+
+class ProfilerSlotTest(TestCase):
+    """Each Profiler stands in for one worker process."""
+
+    sample = dict.fromkeys(
+        ("queries", "sql_ms", "template_ms", "python_ms", "total_ms"), 1
+    )
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def process(self, *view_names):
+        process = Profiler()
+        for view_name in view_names:
+            process.record(view_name, self.sample)
+        process.publish()
+        return process
+
+    def test_report_merges_every_process(self):
+        self.process("a", "b")
+        self.process("a")
+        merged = Profiler().collect()
+        self.assertEqual(
+            {name: len(samples) for name, samples in merged.items()},
+            {"a": 2, "b": 1},
+        )
+
+    def test_expired_slot_is_not_overwritten(self):
+        idle = self.process("idle")
+        # The idle process's slot expires and another process claims it.
+        cache.delete(slot_key(0))
+        self.process("busy")
+        idle._last_publish -= settings.TASK_PROFILING_SNAPSHOT_TIMEOUT
+        idle.publish()
+        merged = Profiler().collect()
+        self.assertEqual(sorted(merged), ["busy", "idle"])
+
+
+class SummarizeTest(TestCase):
+    def test_percentiles(self):
+        self.assertEqual(percentile(list(range(1, 101)), 0.95), 95)
+        self.assertEqual(percentile([7], 0.5), 7)
+
+    def test_orders_by_slowest_p95(self):
+        sample = dict.fromkeys(
+            ("queries", "sql_ms", "template_ms", "python_ms"), 0
+        )
+        rows = summarize(
+            {
+                "fast": [{**sample, "total_ms": 1}],
+                "slow": [{**sample, "total_ms": 50}],
+            }
+        )
+        self.assertEqual([row["view"] for row in rows], ["slow", "fast"])
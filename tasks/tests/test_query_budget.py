@@ -0,0 +1,100 @@
+import random
+from datetime import timedelta
+from functools import partial
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.utils import timezone
+
+from tasks import deadlines
+from tasks.benchmarks import Volumes, build_cases, case_label, seed, send
+from tasks.models import Task, Worker
+from tasks.tests.query_budget import QueryBudgetMixin
+from tasks.visits import visit_counter
+
+
+# Flushing visits on every request measures the home page at its worst
+# instead of whenever the flush interval happens to run out.
+@override_settings(TASK_VISITS_FLUSH_INTERVAL=0)
+class ViewQueryBudgetTest(QueryBudgetMixin, TestCase):
+    """Every URL in tasks.urls at the data size in query_budget.json.
+
+    Each request is measured after a warm-up request, so cached counters
+    and lookups are in their steady state.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.volumes = Volumes(**cls.budget["volumes"])
+        seed(cls.volumes, random.Random(0))
+        cls.user = get_user_model().objects.create_superuser(
+            username="budget", password="budget"
+        )
+        cls.minute = deadlines.current_minute()
+
+    def setUp(self):
+        cache.clear()
+        visit_counter.clear()
+        self.addCleanup(visit_counter.clear)
+        # Stay in one minute, so the deadline counts cached per minute are
+        # not recounted halfway through a measurement.
+        clock = mock.patch.object(
+            deadlines, "current_minute", return_value=self.minute
+        )
+        clock.start()
+        self.addCleanup(clock.stop)
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.cases = build_cases()
+
+    def request(self, case):
+        response = send(self.client, case)
+        # Exports run their queries while the body streams.
+        if response.streaming:
+            b"".join(response.streaming_content)
+        return response
+
+    def warm(self):
+        for case in self.cases:
+            self.request(case)
+
+    def test_views_stay_within_budget(self):
+        self.warm()
+        for case in self.cases:
+            with self.subTest(case_label(case)):
+                self.assertQueryBudget(
+                    case_label(case), partial(self.request, case)
+                )
+
+    def test_queries_do_not_grow_with_rows(self):
+        self.warm()
+        self.assertQueriesDoNotScale(
+            {
+                case_label(case): partial(self.request, case)
+                for case in self.cases
+            },
+            self.grow,
+        )
+
+    def grow(self):
+        """Triple the data, adding rows related to the objects under test."""
+        seed(self.volumes, random.Random(1), offset=1000)
+        seed(self.volumes, random.Random(2), offset=2000)
+
+        cases = {case.url_name: case for case in self.cases}
+        task = Task.objects.get(pk=cases["task-detail"].args[0])
+        worker = Worker.objects.get(pk=cases["worker-detail"].args[0])
+        extra = Task.objects.bulk_create(
+            Task(
+                name=f"Extra {i}",
+                deadline=timezone.now() + timedelta(days=i),
+                task_type=task.task_type,
+            )
+            for i in range(30)
+        )
+        worker.tasks.add(*extra)
+        # Not the requesting user, so the toggle takes the same branch.
+        task.assignees.add(*Worker.objects.exclude(pk=self.user.pk)[:10])
+        self.warm()
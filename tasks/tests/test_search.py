@@ -0,0 +1,72 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tasks.models import Task, TaskType, Position
+from tasks.search import SimpleSearchBackend, get_search_backend, search
+
+
+class SearchBackendTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.task_type = TaskType.objects.create(name="Bug")
+        cls.login_task = Task.objects.create(
+            name="Fix login",
+            description="Session cookie expires too early",
+            deadline=date.today(),
+            task_type=cls.task_type,
+        )
+        cls.cookie_task = Task.objects.create(
+            name="Cookie banner",
+            description="Add a consent banner",
+            deadline=date.today(),
+            task_type=cls.task_type,
+        )
+
+    def test_search_matches_description(self):
+        results = search(Task.objects.all(), "expires")
+        self.assertEqual(list(results), [self.login_task])
+
+    def test_search_annotates_rank(self):
+        results = list(search(Task.objects.all(), "cookie"))
+        self.assertCountEqual(results, [self.login_task, self.cookie_task])
+        self.assertTrue(all(task.search_rank > 0 for task in results))
+
+    def test_unranked_search_keeps_model_ordering(self):
+        results = search(Task.objects.all(), "cookie", rank=False)
+        self.assertEqual(list(results), [self.login_task, self.cookie_task])
+
+    def test_short_terms_still_match(self):
+        results = search(Position.objects.all(), "qa")
+        self.assertEqual(list(results), [])
+        position = Position.objects.create(position="QA engineer")
+        self.assertEqual(list(search(Position.objects.all(), "qa")), [position])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.login_task.name = "Repair sign in"
+        self.login_task.save()
+        self.assertIn(self.login_task, search(Task.objects.all(), "sign in"))
+        self.assertNotIn(self.login_task, search(Task.objects.all(), "login"))
+
+        self.cookie_task.delete()
+        self.assertEqual(list(search(Task.objects.all(), "banner")), [])
+
+    @override_settings(TASK_SEARCH_BACKEND="tasks.search.SimpleSearchBackend")
+    def test_backend_is_configurable(self):
+        self.assertIsInstance(get_search_backend(), SimpleSearchBackend)
+        results = search(Task.objects.all(), "consent")
+        self.assertEqual(list(results), [self.cookie_task])
+
+    def test_task_type_list_uses_search(self):
+        user = get_user_model().objects.create_user(username="test")
+        TaskType.objects.create(name="Feature")
+        self.client.force_login(user)
+        response = self.client.get(
+            reverse("tasks:task_types_list") + "?name=feat"
+        )
+        self.assertEqual(
+            [task_type.name for task_type in response.context["task_type_list"]],
+            ["Feature"],
+        )
@@ -0,0 +1,44 @@
+import os
+import runpy
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+GUNICORN_CONFIG = str(settings.BASE_DIR / "gunicorn.conf.py")
+
+
+class GunicornConfigTest(SimpleTestCase):
+    def load(self, **env):
+        environ = {
+            name: value
+            for name, value in os.environ.items()
+            if not name.startswith(("GUNICORN_", "WEB_CONCURRENCY"))
+        }
+        environ.update(env)
+        with mock.patch.dict(os.environ, environ, clear=True):
+            with mock.patch("multiprocessing.cpu_count", return_value=2):
+                return runpy.run_path(GUNICORN_CONFIG)
+
+    def test_gthread_is_the_default(self):
+        config = self.load()
+        self.assertEqual(config["worker_class"], "gthread")
+        self.assertEqual(config["wsgi_app"], "task_management.wsgi:application")
+        self.assertEqual((config["workers"], config["threads"]), (3, 4))
+        self.assertTrue(config["preload_app"])
+
+    def test_uvicorn_serves_the_asgi_app(self):
+        config = self.load(GUNICORN_WORKER_CLASS="uvicorn")
+        self.assertEqual(config["wsgi_app"], "task_management.asgi:application")
+        self.assertEqual(config["worker_class"], "uvicorn_worker.UvicornWorker")
+        self.assertEqual(config["workers"], 2)
+
+    def test_counts_can_be_overridden(self):
+        config = self.load(
+            GUNICORN_WORKER_CLASS="sync", WEB_CONCURRENCY="7", GUNICORN_THREADS="2"
+        )
+        self.assertEqual((config["workers"], config["threads"]), (7, 2))
+
+    def test_rejects_unknown_worker_class(self):
+        with self.assertRaises(ValueError):
+            self.load(GUNICORN_WORKER_CLASS="eventlet")
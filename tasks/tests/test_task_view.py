@@ -1,10 +1,22 @@
 from datetime import date
+from unittest import mock
 
-from django.test import TestCase
+from django.core.cache import cache, caches
+from django.core.cache.utils import make_template_fragment_key
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
+from tasks.board import empty_columns, fill_columns
+from tasks.assignments import (
+    Assignment,
+    is_assigned,
+    reconcile_assignees,
+    toggle_assignee,
+)
 from tasks.models import Worker, TaskType, Task
 
 
@@ -93,6 +105,95 @@ class TasksViewTest(TestCase):
         self.assertIn("search_form", response.context)
         self.assertEqual(response.context["search_form"].initial["name"], "")
 
+    @override_settings(TASK_BOARD_COLUMN_SIZE=2)
+    def test_board_columns_are_capped_with_full_totals(self):
+        for i in range(4):
+            Task.objects.create(
+                name=f"Extra todo {i}",
+                deadline=date.today(),
+                task_type=self.task_type,
+                status="todo",
+            )
+        self.client.force_login(self.user)
+        response = self.client.get(self.TASKS_URL)
+        column = response.context["board"]["todo"]
+        self.assertEqual(len(response.context["todo_tasks"]), 2)
+        self.assertEqual(column.total, 5)
+        self.assertTrue(column.has_more)
+        self.assertEqual(response.context["board_total"], 8)
+
+    def test_board_survives_totals_ahead_of_the_cards(self):
+        # Tasks added between the column queries and the totals aggregate.
+        columns = fill_columns(empty_columns(), {"todo": []}, {"todo": 3})
+        self.assertEqual(columns["todo"].total, 3)
+        self.assertFalse(columns["todo"].has_more)
+
+    def test_board_query_count_does_not_grow_with_tasks(self):
+        self.client.force_login(self.user)
+        self.client.get(self.TASKS_URL)
+        with CaptureQueriesContext(connection) as small_board:
+            self.client.get(self.TASKS_URL)
+        for i in range(10):
+            Task.objects.create(
+                name=f"Extra {i}",
+                deadline=date.today(),
+                task_type=TaskType.objects.create(name=f"Type {i}"),
+                status="in_progress",
+            )
+        with CaptureQueriesContext(connection) as large_board:
+            self.client.get(self.TASKS_URL)
+        self.assertEqual(len(small_board), len(large_board))
+
+
+class TaskBoardColumnViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="test")
+        cls.task_type = TaskType.objects.create(name="Simple")
+        cls.tasks = [
+            Task.objects.create(
+                name=f"Task {i}",
+                deadline=date.today(),
+                task_type=cls.task_type,
+                status="todo",
+            )
+            for i in range(5)
+        ]
+
+    @override_settings(TASK_BOARD_COLUMN_SIZE=2)
+    def test_cursor_pages_walk_the_whole_column(self):
+        self.client.force_login(self.user)
+        board = self.client.get(reverse("tasks:task-list")).context["board"]
+        seen = list(board["todo"].tasks)
+        cursor = board["todo"].next_cursor
+        while cursor:
+            response = self.client.get(
+                reverse("tasks:task-board-column", args=["todo"]),
+                {"cursor": cursor},
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertTemplateUsed(
+                response, "includes/task_board_column.html"
+            )
+            seen += response.context["column"].tasks
+            cursor = response.context["column"].next_cursor
+        self.assertEqual(seen, self.tasks)
+
+    def test_invalid_cursor_returns_400(self):
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse("tasks:task-board-column", args=["todo"]),
+            {"cursor": "not-a-cursor"},
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_status_returns_404(self):
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse("tasks:task-board-column", args=["archived"])
+        )
+        self.assertEqual(response.status_code, 404)
+
 
 class TaskCreateViewTest(TestCase):
     TASKS_URL = reverse("tasks:task-create")
@@ -205,6 +306,7 @@ class TaskUpdateViewTest(TestCase):
                 "priority": "low",
                 "status": "in_progress",
                 "assignees": [self.worker.id],
+                "version": self.task.version,
             },
         )
         self.assertEqual(response.status_code, 302)
@@ -235,6 +337,110 @@ class TaskUpdateViewTest(TestCase):
         form = response.context["form"]
         self.assertEqual(form.initial["name"], "Task 1")
         self.assertEqual(list(form.initial["assignees"]), [self.worker])
+        self.assertEqual(form.initial["version"], self.task.version)
+
+    def update_data(self, **data):
+        return {
+            "name": "Task 1",
+            "description": "Task description",
+            "deadline": self.task.deadline.strftime("%Y-%m-%d %H:%M:%S"),
+            "task_type": self.task_type.id,
+            "priority": self.task.priority,
+            "status": self.task.status,
+            "assignees": [self.worker.id],
+            "version": self.task.version,
+            **data,
+        }
+
+    def test_update_writes_only_changed_columns(self):
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.updated_url, self.update_data(priority="high"))
+        updates = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "tasks_task"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"priority"', updates[0])
+        self.assertNotIn('"description"', updates[0])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.priority, "high")
+
+    def test_stale_update_is_rejected(self):
+        self.client.force_login(self.user)
+        data = self.update_data(name="Mine")
+        Task.objects.update_versioned(self.task.pk, status="done")
+
+        response = self.client.post(self.updated_url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["form"].non_field_errors())
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.name, self.task.status), ("Task 1", "done"))
+
+    def test_renaming_the_task_type_does_not_make_the_form_stale(self):
+        self.client.force_login(self.user)
+        data = self.update_data(name="Mine")
+        self.task_type.name = "Renamed"
+        self.task_type.save()
+
+        response = self.client.post(self.updated_url, data)
+        self.assertEqual(response.status_code, 302)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.name, "Mine")
+
+    def test_update_without_a_version_is_rejected(self):
+        self.client.force_login(self.user)
+        data = self.update_data(name="Mine")
+        del data["version"]
+
+        response = self.client.post(self.updated_url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "missing the task version")
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.name, "Task 1")
+
+
+class SetTaskStatusTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.task = Task.objects.create(
+            name="Task 1",
+            description="Task description",
+            deadline=date.today(),
+            task_type=TaskType.objects.create(name="Simple"),
+        )
+        cls.url = reverse("tasks:set-status", args=[cls.task.pk])
+
+    def test_single_conditional_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                self.url, {"status": "done", "version": self.task.version}
+            )
+        self.assertRedirects(
+            response,
+            reverse("tasks:task-detail", args=[self.task.pk]),
+            fetch_redirect_response=False,
+        )
+        self.assertEqual(len(queries), 1)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, "done")
+        self.assertEqual(self.task.version, 2)
+
+    def test_stale_version_conflicts(self):
+        Task.objects.update_versioned(self.task.pk, status="in_progress")
+        response = self.client.post(
+            self.url, {"status": "done", "version": self.task.version}
+        )
+        self.assertEqual(response.status_code, 409)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, "in_progress")
+
+    def test_missing_task(self):
+        response = self.client.post(
+            reverse("tasks:set-status", args=[0]), {"status": "done"}
+        )
+        self.assertEqual(response.status_code, 404)
 
 
 class TaskDeleteViewTest(TestCase):
@@ -317,3 +523,155 @@ class TaskDetailViewTest(TestCase):
         self.client.force_login(self.user)
         response = self.client.get(self.task_url)
         self.assertEqual(response.context["task"], self.task)
+
+
+class TaskCardCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="test")
+        cls.task_type = TaskType.objects.create(name="Simple")
+        cls.task = Task.objects.create(
+            name="Cached card",
+            deadline=date.today(),
+            task_type=cls.task_type,
+        )
+
+    def setUp(self):
+        caches["fragments"].clear()
+        self.client.force_login(self.user)
+
+    def test_cards_do_not_share_the_default_cache(self):
+        self.client.get(reverse("tasks:task-list"))
+        key = make_template_fragment_key(
+            "task_card_board",
+            [self.task.pk, self.task.version, self.task_type.version],
+        )
+        self.assertIsNotNone(caches["fragments"].get(key))
+        self.assertIsNone(cache.get(key))
+
+    def test_card_is_reused_until_the_version_changes(self):
+        url = reverse("tasks:task-list")
+        self.assertContains(self.client.get(url), "Simple")
+
+        # A bare update leaves the version alone, so the cached card stays.
+        TaskType.objects.filter(pk=self.task_type.pk).update(name="Changed")
+        self.assertNotContains(self.client.get(url), "Changed")
+
+        self.task_type.name = "Renamed"
+        self.task_type.save()
+        self.assertContains(self.client.get(url), "Renamed")
+
+    def test_saving_the_task_refreshes_its_card(self):
+        url = reverse("tasks:task-status-list", args=[Task.Status.TODO])
+        self.client.get(url)
+        self.task.deadline = date(2031, 5, 17)
+        self.task.save()
+        self.assertContains(self.client.get(url), "May 17, 2031")
+
+
+class ToggleAssignViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="test")
+        cls.task = Task.objects.create(
+            name="Task 1",
+            description="Task description",
+            deadline=date.today(),
+            task_type=TaskType.objects.create(name="Simple"),
+        )
+        cls.task.assignees.set(
+            Worker.objects.create(username=f"worker{i}") for i in range(20)
+        )
+        cls.url = reverse("tasks:toggle-task-assign", args=[cls.task.pk])
+        cls.detail_url = reverse("tasks:task-detail", args=[cls.task.pk])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_toggle_assigns_then_unassigns(self):
+        self.client.post(self.url)
+        self.assertTrue(is_assigned(self.task.pk, self.user.pk))
+        self.assertContains(self.client.get(self.detail_url), "Unassign me")
+
+        self.client.post(self.url)
+        self.assertFalse(is_assigned(self.task.pk, self.user.pk))
+        self.assertEqual(self.task.assignees.count(), 20)
+        self.assertContains(self.client.get(self.detail_url), "Assign me")
+
+    def test_unassign_is_a_single_delete(self):
+        self.task.assignees.add(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertFalse(toggle_assignee(self.task.pk, self.user.pk))
+        statements = [
+            query["sql"]
+            for query in queries.captured_queries
+            if "SAVEPOINT" not in query["sql"]
+        ]
+        self.assertEqual(len(statements), 1)
+        self.assertTrue(statements[0].startswith("DELETE"))
+
+    def test_reconcile_skips_pairs_assigned_meanwhile(self):
+        bulk_create = Assignment.objects.bulk_create
+
+        def assigned_first(objs, **kwargs):
+            # Another request assigns the same worker after the read.
+            bulk_create([Assignment(task=self.task, worker=self.user)])
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch.object(
+            Assignment.objects, "bulk_create", side_effect=assigned_first
+        ):
+            reconcile_assignees({self.task.pk: {self.user.pk}})
+        self.assertEqual(list(self.task.assignees.all()), [self.user])
+
+    def test_missing_task(self):
+        response = self.client.post(
+            reverse("tasks:toggle-task-assign", args=[0])
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class ManageTaskUsersViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="test")
+        cls.workers = Worker.objects.bulk_create(
+            Worker(username=f"worker{i:03d}") for i in range(500)
+        )
+        cls.task = Task.objects.create(
+            name="Task 1",
+            description="Task description",
+            deadline=date.today(),
+            task_type=TaskType.objects.create(name="Simple"),
+        )
+        cls.task.assignees.set(cls.workers[:10])
+        cls.url = reverse("tasks:manage-task-users", args=[cls.task.pk])
+
+    def test_reassigning_writes_only_the_difference(self):
+        self.client.force_login(self.user)
+        selected = [worker.pk for worker in self.workers[5:]]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {"users": selected})
+        self.assertEqual(response.status_code, 302)
+
+        writes = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith(("INSERT", "DELETE"))
+        ]
+        self.assertEqual(len(writes), 2)
+        self.assertEqual(
+            set(self.task.assignees.values_list("pk", flat=True)), set(selected)
+        )
+
+    def test_unchanged_selection_writes_nothing(self):
+        self.client.force_login(self.user)
+        selected = [worker.pk for worker in self.workers[:10]]
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, {"users": selected})
+        self.assertFalse(
+            any(
+                query["sql"].startswith(("INSERT", "DELETE"))
+                for query in queries.captured_queries
+            )
+        )
@@ -1,5 +1,7 @@
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
@@ -109,6 +111,40 @@ class WorkerListViewTest(TestCase):
         self.assertEqual(len(response.context["worker_list"]), 3)
 
 
+class WorkerLookupViewTest(TestCase):
+    LOOKUP_URL = reverse("tasks:worker-lookup")
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="test")
+        for i in range(5):
+            Worker.objects.create(
+                username=f"designer{i}",
+                first_name="Dana",
+                last_name=f"Smith{i}",
+            )
+        Worker.objects.create(
+            username="bobdy", first_name="Bob", last_name="Dylan"
+        )
+
+    def test_redirect_if_not_logged_in(self):
+        response = self.client.get(self.LOOKUP_URL)
+        self.assertEqual(response.status_code, 302)
+
+    def test_lookup_matches_username_and_name(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.LOOKUP_URL, {"q": "dylan"})
+        results = response.json()["results"]
+        self.assertEqual(len(results), 1)
+        self.assertIn("Bob Dylan", results[0]["text"])
+
+    @override_settings(TASK_WORKER_LOOKUP_LIMIT=3)
+    def test_lookup_results_are_limited(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.LOOKUP_URL, {"q": "designer"})
+        self.assertEqual(len(response.json()["results"]), 3)
+
+
 class WorkerDetailViewTest(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -170,6 +206,55 @@ class WorkerDetailViewTest(TestCase):
         self.assertIn(worker, response.context["worker"].tasks.all())
         self.assertContains(response, "Incomplete Tasks")
 
+    def test_detail_view_splits_and_paginates_tasks(self):
+        task_type = TaskType.objects.create(name="Test task type")
+        for i in range(12):
+            task = Task.objects.create(
+                name=f"Task {i}",
+                deadline=timezone.now(),
+                task_type=task_type,
+                status=Task.Status.DONE if i % 4 == 0 else Task.Status.TODO,
+            )
+            task.assignees.add(self.worker)
+
+        self.client.force_login(self.user)
+        response = self.client.get(self.worker_url)
+        incomplete = response.context["incomplete_tasks"]
+        completed = response.context["completed_tasks"]
+        self.assertEqual(incomplete.paginator.count, 9)
+        self.assertEqual(len(incomplete), 9)
+        self.assertEqual(completed.paginator.count, 3)
+        self.assertTrue(
+            all(task.status != Task.Status.DONE for task in incomplete)
+        )
+
+        response = self.client.get(
+            self.worker_url, {"incomplete_page": 2}
+        )
+        self.assertEqual(response.context["incomplete_tasks"].number, 1)
+
+    def test_detail_view_query_count_does_not_grow_with_tasks(self):
+        task_type = TaskType.objects.create(name="Test task type")
+
+        def add_tasks(count, offset):
+            for i in range(offset, offset + count):
+                task = Task.objects.create(
+                    name=f"Task {i}",
+                    deadline=timezone.now(),
+                    task_type=task_type,
+                    status=Task.Status.DONE if i % 2 else Task.Status.TODO,
+                )
+                task.assignees.add(self.worker, self.user)
+
+        self.client.force_login(self.user)
+        add_tasks(2, 0)
+        with CaptureQueriesContext(connection) as few_tasks:
+            self.client.get(self.worker_url)
+        add_tasks(8, 2)
+        with CaptureQueriesContext(connection) as many_tasks:
+            self.client.get(self.worker_url)
+        self.assertEqual(len(many_tasks), len(few_tasks))
+
     def test_view_displays_no_tasks_message_when_worker_has_no_tasks(self):
         self.client.force_login(self.user)
         response = self.client.get(self.worker_url)
@@ -281,6 +366,36 @@ class WorkerUpdateViewTest(TestCase):
         self.assertEqual(self.worker.first_name, "NewFirst")
         self.assertEqual(self.worker.last_name, "NewLast")
 
+    def test_update_saves_only_changed_fields(self):
+        self.client.force_login(self.user)
+        form_data = {
+            "username": "oldworker",
+            "first_name": "Old",
+            "last_name": "Renamed",
+            "position": self.position.id,
+        }
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.update_url, data=form_data)
+        updates = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "tasks_worker"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"last_name"', updates[0])
+        self.assertNotIn('"password"', updates[0])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(
+                self.update_url, data={**form_data, "last_name": "Renamed"}
+            )
+        self.assertFalse(
+            any(
+                query["sql"].startswith('UPDATE "tasks_worker"')
+                for query in queries.captured_queries
+            )
+        )
+
     def test_update_worker_template_used(self):
         self.client.force_login(self.user)
         response = self.client.get(self.update_url)
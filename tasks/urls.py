@@ -1,13 +1,18 @@
+from django.conf import settings
 from django.urls import path
 
+from tasks import async_views
+from tasks.api import api_urlpatterns
 from tasks.views import (
     index,
     TasksListView,
+    TaskBoardColumnView,
     TaskDetailView,
     TaskCreateView,
     TaskUpdateView,
     TaskDeleteView,
     WorkerListView,
+    WorkerLookupView,
     WorkerCreateView,
     WorkerUpdateView,
     WorkerDeleteView,
@@ -23,27 +28,66 @@ from tasks.views import (
     CustomLoginView,
     set_task_status,
     TaskStatusListView,
+    TaskDeadlineListView,
+    ExportView,
+    ImportView,
+    ProfilingReportView,
     ToggleAssignToTaskView, ManageTaskUsersView,
+    TaskBulkActionView,
 )
 
 app_name = "tasks"
 
+
+def read_view(sync_view, async_view):
+    return async_view if settings.TASK_ASYNC_VIEWS else sync_view
+
+
+index_view = read_view(index, async_views.index)
+task_list_view = read_view(TasksListView.as_view(), async_views.task_list)
+task_detail_view = read_view(TaskDetailView.as_view(), async_views.task_detail)
+task_status_list_view = read_view(
+    TaskStatusListView.as_view(), async_views.task_status_list
+)
+worker_list_view = read_view(WorkerListView.as_view(), async_views.worker_list)
+
 urlpatterns = [
-    path("", index, name="index"),
+    path("", index_view, name="index"),
     path(
         "tasks/",
-        TasksListView.as_view(),
+        task_list_view,
         name="task-list",
     ),
-    path("tasks/<int:pk>/", TaskDetailView.as_view(), name="task-detail"),
+    path(
+        "tasks/board/<str:status>/",
+        TaskBoardColumnView.as_view(),
+        name="task-board-column",
+    ),
+    path("tasks/<int:pk>/", task_detail_view, name="task-detail"),
     path("tasks/create/", TaskCreateView.as_view(), name="task-create"),
+    path("tasks/bulk/", TaskBulkActionView.as_view(), name="task-bulk"),
+    path(
+        "tasks/overdue/",
+        TaskDeadlineListView.as_view(bucket="overdue"),
+        name="task-overdue",
+    ),
+    path(
+        "tasks/due-soon/",
+        TaskDeadlineListView.as_view(bucket="due_soon"),
+        name="task-due-soon",
+    ),
     path("tasks/<int:pk>/update/",
          TaskUpdateView.as_view(),
          name="task-update"),
     path("tasks/<int:pk>/delete/",
          TaskDeleteView.as_view(),
          name="task-delete"),
-    path("workers/", WorkerListView.as_view(), name="worker-list"),
+    path("workers/", worker_list_view, name="worker-list"),
+    path(
+        "workers/lookup/",
+        WorkerLookupView.as_view(),
+        name="worker-lookup",
+    ),
     path("worker/create/", WorkerCreateView.as_view(), name="worker-create"),
     path("worker/<int:pk>/update/",
          WorkerUpdateView.as_view(),
@@ -100,17 +144,30 @@ urlpatterns = [
          name="manage-task-users"),
     path(
         "tasks/status/<str:status>/",
-        TaskStatusListView.as_view(),
+        task_status_list_view,
         name="task-status-list",
     ),
     path(
         "task_types/<int:task_type_id>/tasks/",
-        TasksListView.as_view(),
+        task_list_view,
         name="task-type-tasks",
     ),
     path(
         "positions/<int:position_id>/workers/",
-        WorkerListView.as_view(),
+        worker_list_view,
         name="position-workers",
     ),
+    path(
+        "exports/<str:resource>/",
+        ExportView.as_view(),
+        name="export",
+    ),
+    path("imports/", ImportView.as_view(), name="import"),
+    path(
+        "profiling/",
+        ProfilingReportView.as_view(),
+        name="profiling-report",
+    ),
 ]
+
+urlpatterns += api_urlpatterns
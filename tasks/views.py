@@ -1,13 +1,36 @@
+import io
+
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.auth.views import LoginView
-from django.db.models import Count
-from django.http import HttpResponseRedirect
+from django.core.handlers.asgi import ASGIRequest
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render, get_object_or_404, redirect
 from django.urls import reverse_lazy
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.utils.timezone import now
 from django.views import generic, View
 
+from tasks import bulk, counters, deadlines
+from tasks.assignments import (
+    assigned_to,
+    reconcile_assignees,
+    toggle_assignee,
+)
+from tasks.board import build_board, build_column
+from tasks.exports import EXPORTS, FORMATS, aexport_lines, export_lines
+from tasks.imports import IMPORTERS, WorkerImporter
+from tasks.profiling import profiler, summarize
 from tasks.forms import (
     TaskSearchForm,
     TaskForm,
@@ -20,33 +43,53 @@ from tasks.forms import (
     TaskTypeSearchForm,
     CustomAuthenticationForm,
     AssignUserForm,
+    ImportForm,
+    TaskBulkActionForm,
 )
 from tasks.models import Worker, Task, TaskType, Position
+from tasks.search import search
+from tasks.visits import visit_counter
 
 
 @login_required
 def index(request):
     """View function for the home page of the site."""
 
-    num_workers = Worker.objects.count()
-    num_tasks = Task.objects.count()
-    num_task_types = TaskType.objects.count()
-    num_positions = Position.objects.count()
-
-    num_visits = request.session.get("num_visits", 0)
-    request.session["num_visits"] = num_visits + 1
+    visit_counter.record(request.user.pk)
 
     context = {
-        "num_workers": num_workers,
-        "num_tasks": num_tasks,
-        "num_task_types": num_task_types,
-        "num_positions": num_positions,
-        "num_visits": num_visits + 1,
+        **counters.get_counts(),
+        "deadlines": deadlines.get_counts(),
+        "num_visits": visit_counter.get(request.user.pk),
     }
 
     return render(request, "tasks/index.html", context=context)
 
 
+STALE_TASK_MESSAGE = (
+    "This task was changed by someone else after you opened it. "
+    "Reload the page to see the changes."
+)
+
+
+class ChangedFieldsUpdateMixin:
+    """Save only the fields the form changed, and skip the UPDATE if none
+    did, so concurrent edits of other fields are not overwritten."""
+
+    def form_valid(self, form):
+        self.object = form.save(commit=False)
+        columns = {
+            field.name
+            for field in self.object._meta.concrete_fields
+            if field.editable
+        }
+        changed = [name for name in form.changed_data if name in columns]
+        if changed:
+            self.object.save(update_fields=changed)
+        form.save_m2m()
+        return HttpResponseRedirect(self.get_success_url())
+
+
 class CustomLoginView(LoginView):
     authentication_form = CustomAuthenticationForm
 
@@ -64,35 +107,66 @@ class TasksListView(LoginRequiredMixin, generic.ListView):
         if task_type_id:
             queryset = queryset.filter(task_type_id=task_type_id)
         if name:
-            return queryset.filter(name__icontains=name)
+            return search(queryset, name, rank=False)
         return queryset
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        filtered_queryset = self.get_queryset()
-
-        context["todo_tasks"] = filtered_queryset.filter(
-            status="todo"
-        )
-        context["in_progress_tasks"] = filtered_queryset.filter(
-            status="in_progress"
-        )
-        context["done_tasks"] = filtered_queryset.filter(
-            status="done"
-                                                         )
-        context["needs_review_tasks"] = filtered_queryset.filter(
-            status="needs_review"
+        board = build_board(self.object_list)
+        for status, column in board.items():
+            context[f"{status}_tasks"] = column.tasks
+        context["board"] = board
+        context["board_total"] = sum(
+            column.total for column in board.values()
         )
+        context["task_type_id"] = self.kwargs.get("task_type_id")
 
         name = self.request.GET.get("name", "")
         context["search_form"] = TaskSearchForm(initial={"name": name})
+        context["bulk_form"] = TaskBulkActionForm()
         return context
 
 
+class TaskBoardColumnView(LoginRequiredMixin, View):
+    """Render the next page of cards for one board column."""
+
+    def get(self, request, status, *args, **kwargs):
+        if status not in Task.Status.values:
+            raise Http404("Unknown task status")
+
+        name = request.GET.get("name", "")
+        task_type_id = request.GET.get("task_type", "")
+        queryset = Task.objects.all()
+        if task_type_id:
+            if not task_type_id.isdigit():
+                return HttpResponseBadRequest("Invalid task type")
+            queryset = queryset.filter(task_type_id=task_type_id)
+        if name:
+            queryset = search(queryset, name, rank=False)
+
+        try:
+            column = build_column(
+                queryset, status, cursor=request.GET.get("cursor")
+            )
+        except ValueError:
+            return HttpResponseBadRequest("Invalid cursor")
+
+        return render(
+            request,
+            "includes/task_board_column.html",
+            {"column": column, "task_type_id": task_type_id or None},
+        )
+
+
 class TaskDetailView(LoginRequiredMixin, generic.DetailView):
     model = Task
 
+    def get_queryset(self):
+        return Task.objects.select_related("task_type").annotate(
+            is_assigned=assigned_to(self.request.user.pk)
+        )
+
 
 class TaskCreateView(LoginRequiredMixin, generic.CreateView):
     model = Task
@@ -105,6 +179,29 @@ class TaskUpdateView(LoginRequiredMixin, generic.UpdateView):
     form_class = TaskForm
     success_url = reverse_lazy("tasks:task-list")
 
+    def form_valid(self, form):
+        """Write the changed columns only if the task is still at the
+        version the form was loaded at."""
+        columns = {
+            field.name for field in Task._meta.concrete_fields if field.editable
+        }
+        values = {
+            name: form.cleaned_data[name]
+            for name in form.changed_data
+            if name in columns
+        }
+        with transaction.atomic():
+            if not Task.objects.update_versioned(
+                self.object.pk, form.cleaned_data["version"], **values
+            ):
+                form.add_error(None, STALE_TASK_MESSAGE)
+                return self.form_invalid(form)
+            if "assignees" in form.changed_data:
+                reconcile_assignees(
+                    {self.object.pk: form.cleaned_data["assignees"]}
+                )
+        return HttpResponseRedirect(self.get_success_url())
+
 
 class TaskDeleteView(LoginRequiredMixin, generic.DeleteView):
     model = Task
@@ -126,25 +223,100 @@ class TaskStatusListView(LoginRequiredMixin, generic.ListView):
 
     def get_queryset(self):
         status = self.kwargs.get("status")
-        return Task.objects.filter(status=status)
+        # Cards key their cached fragment on the task type's version.
+        return Task.objects.filter(status=status).select_related("task_type")
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super().get_context_data(**kwargs)
         status = self.kwargs.get("status")
         context["now"] = now()
         context["task_status"] = self.STATUS_TITLES.get(status, "Tasks")
+        context["bulk_form"] = TaskBulkActionForm()
+        return context
+
+
+class TaskDeadlineListView(LoginRequiredMixin, generic.ListView):
+    """Open tasks in one deadline bucket, overdue or due soon, whatever
+    their status."""
+
+    model = Task
+    context_object_name = "task_list"
+    template_name = "tasks/task_deadline_list.html"
+    paginate_by = 5
+    bucket = "overdue"
+
+    def get_queryset(self):
+        self.at = deadlines.current_minute()
+        self.counts = deadlines.get_counts(self.at)
+        return deadlines.bucket(self.bucket, self.at).select_related(
+            "task_type"
+        )
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        paginator = super().get_paginator(queryset, per_page, **kwargs)
+        # Reuse this minute's cached bucket size instead of counting again.
+        paginator.count = self.counts[self.bucket]
+        return paginator
+
+    def get_context_data(self, *, object_list=None, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["now"] = self.at
+        context["bucket"] = self.bucket
+        context["bucket_title"] = deadlines.BUCKETS[self.bucket]
+        context["deadlines"] = self.counts
+        context["bulk_form"] = TaskBulkActionForm()
         return context
 
 
+class TaskBulkActionView(LoginRequiredMixin, View):
+    """Change the status, priority or assignees of the selected tasks, or
+    delete them, with a fixed number of queries however many there are."""
+
+    def post(self, request, *args, **kwargs):
+        form = TaskBulkActionForm(request.POST)
+        if not form.is_valid():
+            return HttpResponseBadRequest(form.errors.as_text())
+
+        data = form.cleaned_data
+        ids = data["tasks"]
+        operation = data["operation"]
+        if operation == "status":
+            bulk.set_status(ids, data["status"])
+        elif operation == "priority":
+            bulk.set_priority(ids, data["priority"])
+        elif operation == "reassign":
+            bulk.reassign(ids, data["assignees"])
+        else:
+            bulk.delete_tasks(ids)
+
+        next_url = data["next"]
+        if not url_has_allowed_host_and_scheme(
+            next_url,
+            allowed_hosts={request.get_host()},
+            require_https=request.is_secure(),
+        ):
+            next_url = reverse_lazy("tasks:task-list")
+        return HttpResponseRedirect(next_url)
+
+
 def set_task_status(request, pk):
-    task = get_object_or_404(Task, pk=pk)
+    """Change the status with one conditional UPDATE.
+
+    When the form sends the ``version`` it was rendered with, a task saved
+    by someone else in the meantime is left alone and 409 is returned.
+    """
     new_status = request.POST.get("status")
+    version = request.POST.get("version") or None
+    if version is not None and not version.isdigit():
+        return HttpResponseBadRequest("Invalid version")
 
     if new_status in Task.Status.values:
-        task.status = new_status
-        task.save()
+        if not Task.objects.update_versioned(pk, version, status=new_status):
+            if not Task.objects.filter(pk=pk).exists():
+                raise Http404("No Task matches the given query.")
+            return HttpResponse(STALE_TASK_MESSAGE, status=409)
 
-    return redirect("tasks:task-detail", pk=task.pk)
+    return redirect("tasks:task-detail", pk=pk)
 
 
 class WorkerListView(LoginRequiredMixin, generic.ListView):
@@ -158,7 +330,7 @@ class WorkerListView(LoginRequiredMixin, generic.ListView):
         username = self.request.GET.get("username", "")
 
         if username:
-            return queryset.filter(username__icontains=username)
+            return search(queryset, username)
 
         position_id = self.kwargs.get("position_id")
         if position_id:
@@ -175,13 +347,34 @@ class WorkerListView(LoginRequiredMixin, generic.ListView):
         return context
 
 
+class WorkerLookupView(LoginRequiredMixin, View):
+    """Return workers matching ``q`` as JSON for the assignee picker."""
+
+    def get(self, request, *args, **kwargs):
+        term = request.GET.get("q", "").strip()
+        queryset = Worker.objects.select_related("position")
+        if term:
+            queryset = search(queryset, term)
+        workers = queryset[: settings.TASK_WORKER_LOOKUP_LIMIT]
+        return JsonResponse(
+            {
+                "results": [
+                    {"id": worker.pk, "text": str(worker)}
+                    for worker in workers
+                ]
+            }
+        )
+
+
 class WorkerCreateView(LoginRequiredMixin, generic.CreateView):
     model = Worker
     form_class = WorkerCreateForm
     success_url = reverse_lazy("tasks:worker-list")
 
 
-class WorkerUpdateView(LoginRequiredMixin, generic.UpdateView):
+class WorkerUpdateView(
+    LoginRequiredMixin, ChangedFieldsUpdateMixin, generic.UpdateView
+):
     model = Worker
     form_class = WorkerUpdateForm
     success_url = reverse_lazy("tasks:worker-list")
@@ -193,24 +386,40 @@ class WorkerDeleteView(LoginRequiredMixin, generic.DeleteView):
 
 
 class WorkerDetailView(LoginRequiredMixin, generic.DetailView):
-    queryset = Worker.objects.all().prefetch_related("tasks__assignees")
+    queryset = Worker.objects.select_related("position")
+    tasks_paginate_by = 10
+
+    def paginate_tasks(self, queryset, page_kwarg):
+        paginator = Paginator(queryset, self.tasks_paginate_by)
+        return paginator.get_page(self.request.GET.get(page_kwarg))
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        tasks = self.object.tasks.select_related("task_type")
+        context["incomplete_tasks"] = self.paginate_tasks(
+            tasks.exclude(status=Task.Status.DONE), "incomplete_page"
+        )
+        context["completed_tasks"] = self.paginate_tasks(
+            tasks.filter(status=Task.Status.DONE), "completed_page"
+        )
+        return context
 
 
 class ToggleAssignToTaskView(LoginRequiredMixin, View):
     def post(self, request, pk, *args, **kwargs):
-        task = get_object_or_404(Task, id=pk)
-        user = request.user
-        if user in task.assignees.all():
-            task.assignees.remove(user)
-        else:
-            task.assignees.add(user)
+        try:
+            toggle_assignee(pk, request.user.pk)
+        except Task.DoesNotExist:
+            raise Http404("No Task matches the given query.")
         return HttpResponseRedirect(reverse_lazy("tasks:task-detail", args=[pk]))
 
 
 class ManageTaskUsersView(LoginRequiredMixin, View):
     def get(self, request, pk, *args, **kwargs):
         task = get_object_or_404(Task, pk=pk)
-        form = AssignUserForm(initial={"users": task.assignees.all()})
+        form = AssignUserForm(
+            initial={"users": task.assignees.values_list("pk", flat=True)}
+        )
         return render(
             request,
             "tasks/manage_users_for_task.html",
@@ -222,8 +431,7 @@ class ManageTaskUsersView(LoginRequiredMixin, View):
         form = AssignUserForm(request.POST)
 
         if form.is_valid():
-            selected_users = form.cleaned_data["users"]
-            task.assignees.set(selected_users)
+            reconcile_assignees({task.pk: form.cleaned_data["users"]})
             return redirect("tasks:task-detail", pk=pk)
 
         return render(
@@ -250,9 +458,11 @@ class PositionListView(LoginRequiredMixin, generic.ListView):
 
     def get_queryset(self):
         position = self.request.GET.get("position", "")
-        queryset = Position.objects.annotate(worker_count=Count("worker"))
+        queryset = Position.objects.annotate(
+            worker_count=counters.workers_per_position()
+        )
         if position:
-            queryset = queryset.filter(position__icontains=position)
+            queryset = search(queryset, position)
         return queryset
 
 
@@ -262,7 +472,9 @@ class PositionCreateView(LoginRequiredMixin, generic.CreateView):
     success_url = reverse_lazy("tasks:position-list")
 
 
-class PositionUpdateView(LoginRequiredMixin, generic.UpdateView):
+class PositionUpdateView(
+    LoginRequiredMixin, ChangedFieldsUpdateMixin, generic.UpdateView
+):
     model = Position
     form_class = PositionForm
     success_url = reverse_lazy("tasks:position-list")
@@ -288,9 +500,11 @@ class TaskTypesListView(LoginRequiredMixin, generic.ListView):
 
     def get_queryset(self):
         name = self.request.GET.get("name", "")
-        queryset = TaskType.objects.annotate(tasks_count=Count("task"))
+        queryset = TaskType.objects.annotate(
+            tasks_count=counters.tasks_per_type()
+        )
         if name:
-            queryset = queryset.filter(name__icontains=name)
+            queryset = search(queryset, name)
         return queryset
 
 
@@ -300,7 +514,9 @@ class TaskTypeCreateView(LoginRequiredMixin, generic.CreateView):
     success_url = reverse_lazy("tasks:task_types_list")
 
 
-class TaskTypeUpdateView(LoginRequiredMixin, generic.UpdateView):
+class TaskTypeUpdateView(
+    LoginRequiredMixin, ChangedFieldsUpdateMixin, generic.UpdateView
+):
     model = TaskType
     form_class = TaskTypeForm
     success_url = reverse_lazy("tasks:task_types_list")
@@ -309,3 +525,62 @@ class TaskTypeUpdateView(LoginRequiredMixin, generic.UpdateView):
 class TaskTypeDeleteView(LoginRequiredMixin, generic.DeleteView):
     model = TaskType
     success_url = reverse_lazy("tasks:task_types_list")
+
+
+class ExportView(LoginRequiredMixin, View):
+    """Stream every task or worker as CSV or NDJSON.
+
+    Served over ASGI the response gets an asynchronous iterator, which
+    Django streams; it would buffer a synchronous one whole.
+    """
+
+    def get(self, request, resource, *args, **kwargs):
+        export_format = request.GET.get("format", "csv")
+        if resource not in EXPORTS or export_format not in FORMATS:
+            raise Http404
+        content_type, _ = FORMATS[export_format]
+        if isinstance(request, ASGIRequest):
+            lines = aexport_lines(resource, export_format)
+        else:
+            lines = export_lines(resource, export_format)
+        response = StreamingHttpResponse(lines, content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="{resource}.{export_format}"'
+        )
+        return response
+
+
+class ImportView(LoginRequiredMixin, UserPassesTestMixin, generic.FormView):
+    """Let staff upload a CSV or NDJSON file for ``import_tasks``."""
+
+    form_class = ImportForm
+    template_name = "tasks/import_form.html"
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def form_valid(self, form):
+        upload = form.cleaned_data["file"]
+        import_format = upload.name.rsplit(".", 1)[-1].lower()
+        importer_class = IMPORTERS[form.cleaned_data["resource"]]
+        options = {}
+        if issubclass(importer_class, WorkerImporter):
+            # Hash in the request's own process rather than start a pool of
+            # one process per CPU for every upload.
+            options["hash_workers"] = 1
+        importer = importer_class(**options)
+        with io.TextIOWrapper(upload.file, encoding="utf-8", newline="") as file:
+            result = importer.run(file, import_format)
+        return self.render_to_response(
+            self.get_context_data(form=ImportForm(), result=result)
+        )
+
+
+class ProfilingReportView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """Return the per-view profiling percentiles as JSON for staff."""
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({"views": summarize(profiler.collect())})
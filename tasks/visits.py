@@ -0,0 +1,132 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import F
+
+from tasks.models import VisitCount, Worker
+
+logger = logging.getLogger(__name__)
+
+
+class VisitCounter:
+    """Count home page visits per user without touching the session.
+
+    Visits are aggregated in process and added to the ``VisitCount`` rows
+    in one batch every ``TASK_VISITS_FLUSH_INTERVAL`` seconds, so a page
+    view costs a dictionary update instead of a session write. Whatever is
+    pending is flushed when the process exits; a worker killed outright
+    loses at most one interval of visits. A flush that fails while
+    recording a visit is logged and retried later, never raised to the page.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._last_flush = time.monotonic()
+
+    def _add(self, user_id):
+        with self._lock:
+            self._pending[user_id] += 1
+            return (
+                time.monotonic() - self._last_flush
+                >= settings.TASK_VISITS_FLUSH_INTERVAL
+            )
+
+    def _take_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+        return pending
+
+    def _restore(self, pending):
+        with self._lock:
+            self._pending.update(pending)
+
+    def _pending_for(self, user_id):
+        with self._lock:
+            return self._pending[user_id]
+
+    def record(self, user_id):
+        if self._add(user_id):
+            self._flush_or_log()
+
+    async def arecord(self, user_id):
+        if self._add(user_id):
+            await sync_to_async(self._flush_or_log)()
+
+    def _flush_or_log(self):
+        try:
+            self.flush()
+        except DatabaseError:
+            logger.exception("Could not flush visits; keeping them for later.")
+
+    def get(self, user_id):
+        stored = (
+            VisitCount.objects.filter(worker_id=user_id)
+            .values_list("count", flat=True)
+            .first()
+        )
+        return (stored or 0) + self._pending_for(user_id)
+
+    async def aget(self, user_id):
+        stored = await (
+            VisitCount.objects.filter(worker_id=user_id)
+            .values_list("count", flat=True)
+            .afirst()
+        )
+        return (stored or 0) + self._pending_for(user_id)
+
+    def flush(self):
+        """Add the pending visits to the database: one INSERT for users
+        without a row yet and one UPDATE per user.
+
+        Rows are written in ``worker_id`` order, so concurrent flushes from
+        several processes lock them in the same order and cannot deadlock.
+        """
+        pending = self._take_pending()
+        if not pending:
+            return
+        try:
+            with transaction.atomic():
+                # Skip users deleted since their visit.
+                workers = Worker.objects.filter(pk__in=pending).order_by("pk")
+                VisitCount.objects.bulk_create(
+                    [
+                        VisitCount(worker_id=user_id)
+                        for user_id in workers.values_list("pk", flat=True)
+                    ],
+                    ignore_conflicts=True,
+                )
+                for user_id, count in sorted(pending.items()):
+                    VisitCount.objects.filter(worker_id=user_id).update(
+                        count=F("count") + count
+                    )
+        except Exception:
+            # Keep the visits for the next flush rather than drop them.
+            self._restore(pending)
+            raise
+
+    async def aflush(self):
+        await sync_to_async(self.flush)()
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+
+
+def flush_on_exit():
+    try:
+        visit_counter.flush()
+    except DatabaseError:
+        # Nothing to write to, e.g. once a test database is destroyed.
+        pass
+
+
+visit_counter = VisitCounter()
+atexit.register(flush_on_exit)
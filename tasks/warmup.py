@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+TEMPLATE_SUFFIXES = {".html", ".txt"}
+
+
+def project_templates(engine):
+    """Yield the names of every template in the engine's ``DIRS``."""
+    for directory in engine.engine.dirs:
+        directory = Path(directory)
+        for path in sorted(directory.rglob("*")):
+            if path.suffix in TEMPLATE_SUFFIXES and path.is_file():
+                yield path.relative_to(directory).as_posix()
+
+
+def warm_templates():
+    """Load every project template so the cached loader holds it parsed.
+
+    Returns ``(loaded, errors)`` where ``errors`` maps template names to
+    their syntax errors.
+    """
+    loaded = 0
+    errors = {}
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for name in project_templates(engine):
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError as error:
+                errors[name] = error
+            else:
+                loaded += 1
+    return loaded, errors